@@ -0,0 +1,63 @@
+"""
+Compares the time to refresh a bar chart of 50 countries: a new pyplot figure per refresh (the
+former create_revenue_graph), a persistent ChartSlot redrawn in full after a change of scale, and
+a ChartSlot refreshed by blitting the bars after a small edit.
+
+Usage: python benchmarks/bench_charts.py [refreshes]
+"""
+import os
+import sys
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from matplotlib import pyplot as plt  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from components.chart_renderer import CHARTS, ChartSlot  # noqa: E402
+
+
+def rebuild(series):
+    fig, ax = plt.subplots(figsize=(5.44, 2.92))
+    series.plot(kind='bar', color='blue', title='Monthly Revenue by Country', ax=ax)
+    ax.set_ylabel('Revenue (€)')
+    canvas = FigureCanvasAgg(fig)
+    canvas.draw()
+    buffer = bytes(canvas.buffer_rgba())
+    plt.close(fig)
+    return buffer
+
+
+def measure(func, refreshes):
+    start = time.perf_counter()
+    for i in range(refreshes):
+        func(i)
+    return (time.perf_counter() - start) / refreshes * 1000
+
+
+def main():
+    refreshes = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    rng = np.random.default_rng(0)
+    index = pd.Index([f"Country{i:03d}" for i in range(50)], name='country')
+    values = rng.uniform(1e5, 1e6, len(index))
+
+    def series(i, scale=1.0):
+        edited = values.copy()
+        edited[i % len(edited)] *= 1.01  # Une ligne modifiée
+        return pd.Series(edited * scale, index=index)
+
+    slot = ChartSlot(CHARTS["revenue"])
+    slot.update(series(0))
+    rebuild_ms = measure(lambda i: rebuild(series(i)), refreshes)
+    full_ms = measure(lambda i: slot.update(series(i, 10.0 ** (i % 2 + 1))), refreshes)
+    blit_ms = measure(lambda i: slot.update(series(i)), refreshes)
+    print(f"new figure per refresh:      {rebuild_ms:7.2f} ms")
+    print(f"persistent figure, redrawn:  {full_ms:7.2f} ms")
+    print(f"persistent figure, blitted:  {blit_ms:7.2f} ms ({slot.blits} blits, {slot.full_draws} full draws)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Compares the legacy groupby().apply(lambda) net income computation of KPIManager with the
+vectorized kpi_compute module.
+
+Usage: python benchmarks/bench_kpi_compute.py [rows] [countries] [dates]
+"""
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from kpi_compute import income_tables  # noqa: E402
+
+
+def make_frame(rows, countries, dates, seed=0):
+    rng = np.random.default_rng(seed)
+    country_names = np.array([f"Country{i:03d}" for i in range(countries)], dtype=object)
+    date_names = np.array([str(d) for d in pd.date_range("2020-01-31", periods=dates, freq="ME").date], dtype=object)
+    return pd.DataFrame({
+        'country': country_names[rng.integers(0, countries, rows)],
+        'date': date_names[rng.integers(0, dates, rows)],
+        'monthly_revenue': rng.uniform(1e3, 1e6, rows).round(2),
+        'monthly_costs': rng.uniform(1e2, 1e5, rows).round(2),
+        'advertising_costs': rng.uniform(0, 1e4, rows).round(2),
+    })
+
+
+def legacy_income_tables(df):
+    # Ancienne implémentation de KPIManager.prepare_data_for_pdf / update_income_tables
+    df_country_date = df.groupby(['country', 'date']).apply(
+        lambda x: x['monthly_revenue'].sum() - x['monthly_costs'].sum() - x['advertising_costs'].sum()).reset_index(
+        name='Net Income')
+    df_date_country = df.groupby(['date', 'country']).apply(
+        lambda x: x['monthly_revenue'].sum() - x['monthly_costs'].sum() - x['advertising_costs'].sum()).reset_index(
+        name='Net Income')
+    return df_country_date, df_date_country
+
+
+def best_of(func, df, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    warnings.simplefilter("ignore", DeprecationWarning)  # groupby().apply() on grouping columns (legacy code)
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    countries = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    dates = int(sys.argv[3]) if len(sys.argv) > 3 else 60
+    df = make_frame(rows, countries, dates)
+    legacy_time, legacy = best_of(legacy_income_tables, df)
+    vectorized_time, vectorized = best_of(income_tables, df)
+    for expected, actual in zip(legacy, vectorized):
+        pd.testing.assert_frame_equal(expected, actual, check_exact=False, rtol=1e-9)
+    print(f"{rows:,} rows, {countries * dates:,} (country, date) groups")
+    print(f"legacy groupby().apply x2 : {legacy_time * 1000:8.1f} ms")
+    print(f"vectorized groupby().sum(): {vectorized_time * 1000:8.1f} ms  ({legacy_time / vectorized_time:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
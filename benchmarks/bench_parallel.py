@@ -0,0 +1,48 @@
+"""
+Times the net income per (country, month) aggregated by ParallelAggregator with an increasing
+number of worker processes, on a temporary database.
+
+Usage: python benchmarks/bench_parallel.py [rows] [max_workers] [country|date]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from bench_streaming import make_entries  # noqa: E402
+from database import DatabaseManager  # noqa: E402
+from parallel_aggregate import ParallelAggregator  # noqa: E402
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    partition_by = sys.argv[3] if len(sys.argv) > 3 else "country"
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(os.path.join(tmp_dir, 'bench.db'))
+        try:
+            db.add_entries(make_entries(rows), batch_size=10_000)
+            print(f"{rows:,} rows, partitioned by {partition_by}, {os.cpu_count()} CPUs")
+            reference, reference_time = None, None
+            for workers in range(1, max_workers + 1):
+                aggregator = ParallelAggregator(db, workers, partition_by)
+                try:
+                    aggregator.aggregate(['country', 'month'])  # Starts the worker processes
+                    start = time.perf_counter()
+                    result = aggregator.aggregate(['country', 'month'])
+                    elapsed = time.perf_counter() - start
+                finally:
+                    aggregator.close()
+                if reference is None:
+                    reference, reference_time = result, elapsed
+                pd.testing.assert_frame_equal(result, reference, check_exact=False, rtol=1e-12)
+                print(f"{workers:3d} worker(s): {elapsed * 1000:8.1f} ms  ({reference_time / elapsed:.1f}x)")
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Compares the memory use and (country, date) net income aggregation time of a pandas DataFrame
+with object string columns (pd.read_sql_query) and of the columnar SalesStore.
+
+Usage: python benchmarks/bench_sales_store.py [rows] [filiales] [dates]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from kpi_compute import NET_INCOME, net_income_by_country_date  # noqa: E402
+from sales_store import SalesStore  # noqa: E402
+
+
+def make_frame(rows, filiales, dates, seed=0):
+    rng = np.random.default_rng(seed)
+    filiale_ids = rng.integers(0, filiales, rows)
+    filiale_names = np.array([f"Filiale{i:04d}" for i in range(filiales)], dtype=object)
+    country_names = np.array([f"Country{i % 50:03d}" for i in range(filiales)], dtype=object)
+    date_names = np.array([str(d) for d in pd.date_range("2020-01-31", periods=dates, freq="ME").date], dtype=object)
+    return pd.DataFrame({
+        'id': np.arange(1, rows + 1),
+        'filiale_name': filiale_names[filiale_ids],
+        'country': country_names[filiale_ids],
+        'date': date_names[rng.integers(0, dates, rows)],
+        'monthly_revenue': rng.uniform(1e3, 1e6, rows).round(2),
+        'monthly_costs': rng.uniform(1e2, 1e5, rows).round(2),
+        'sales_volume': rng.integers(0, 1000, rows),
+        'new_clients': rng.integers(0, 100, rows),
+        'satisfaction_rate': rng.integers(0, 101, rows),
+        'advertising_costs': rng.uniform(0, 1e4, rows).round(2),
+    })
+
+
+def best_of(func, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    filiales = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    dates = int(sys.argv[3]) if len(sys.argv) > 3 else 60
+    df = make_frame(rows, filiales, dates)
+    store = SalesStore.from_frame(df)
+
+    frame_time, expected = best_of(lambda: net_income_by_country_date(df))
+    store_time, actual = best_of(lambda: store.sum_by(['country', 'date'], [], net_income=True))
+    merged = expected.merge(actual, on=['country', 'date'])
+    assert len(merged) == len(expected) == len(actual)
+    np.testing.assert_allclose(merged[NET_INCOME + '_x'], merged[NET_INCOME + '_y'], rtol=1e-9)
+
+    frame_bytes = df.memory_usage(deep=True).sum()
+    print(f"{rows:,} rows, {len(expected):,} (country, date) groups")
+    print(f"object DataFrame: {frame_bytes / 2 ** 20:8.1f} MiB, net income by (country, date) {frame_time * 1000:8.1f} ms")
+    print(f"SalesStore      : {store.nbytes / 2 ** 20:8.1f} MiB, net income by (country, date) {store_time * 1000:8.1f} ms"
+          f"  ({frame_bytes / store.nbytes:.1f}x less memory, {frame_time / store_time:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
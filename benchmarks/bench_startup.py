@@ -0,0 +1,106 @@
+"""
+Measures the cold start of the application: time to first window (from process start to the first
+pass of the event loop after MainWindowController.show()), the import cost of each top-level module
+of the startup path (python -X importtime), and the cost of the modules deferred to first use
+(prewarm.DEFERRED_MODULES). Each run is a fresh interpreter on a copy of src/sales.db, with the
+offscreen Qt platform; the median of the runs is reported.
+
+Usage: python benchmarks/bench_startup.py [runs]
+"""
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+CHILD = """
+import time
+start = time.perf_counter()
+import importlib, json, sys
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QApplication
+app = QApplication([])
+from database import DatabaseManager
+DatabaseManager(sys.argv[1])
+from controller import MainWindowController
+imported = time.perf_counter()
+window = MainWindowController()
+window.show()
+result = {}
+
+def first_window():
+    result["import_ms"] = (imported - start) * 1000
+    result["first_window_ms"] = (time.perf_counter() - start) * 1000
+    result["first_window_at"] = time.time()
+    result["loaded"] = [name for name in ("pandas", "numpy", "matplotlib", "reportlab") if name in sys.modules]
+    print("first window", file=sys.stderr, flush=True)  # Les imports suivants ne font pas partie du démarrage
+    from prewarm import DEFERRED_MODULES
+    deferred = {}
+    for name in DEFERRED_MODULES:
+        module_start = time.perf_counter()
+        importlib.import_module(name)
+        deferred[name] = (time.perf_counter() - module_start) * 1000
+    result["deferred_ms"] = deferred
+    window.query_executor.shutdown()
+    app.quit()
+
+QTimer.singleShot(0, first_window)
+app.exec()
+print(json.dumps(result))
+"""
+
+
+def run_once(db_path):
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"), SALES_PREWARM="0")
+    spawned = time.time()
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", CHILD, db_path], cwd=SRC, env=env,
+                             capture_output=True, text=True, check=True)
+    result = json.loads(process.stdout.strip().splitlines()[-1])
+    result["process_ms"] = (result["first_window_at"] - spawned) * 1000
+    # Lignes "import time: self | cumulative | name" ; le nom est indenté de 2 espaces par niveau d'imbrication
+    imports = {}
+    for line in process.stderr.splitlines():
+        if line == "first window":
+            break
+        if line.startswith("import time:") and not line.endswith("imported package"):
+            _, cumulative, name = line[len("import time:"):].split("|")
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            if depth <= 1:
+                imports[("  " * depth) + name.strip()] = int(cumulative) / 1000
+    result["imports_ms"] = imports
+    return result
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'bench.db')
+        shutil.copy(os.path.join(SRC, 'sales.db'), db_path)
+        results = [run_once(db_path) for _ in range(runs)]
+
+    def median(values):
+        return statistics.median(values)
+
+    print(f"{runs} runs (median)")
+    print(f"process start to first window: {median([r['process_ms'] for r in results]):8.1f} ms "
+          f"(interpreter start included)")
+    print(f"time to first window:          {median([r['first_window_ms'] for r in results]):8.1f} ms")
+    print(f"  of which imports:            {median([r['import_ms'] for r in results]):8.1f} ms")
+    print(f"heavy modules loaded at first window: {', '.join(results[-1]['loaded']) or 'none'}")
+    print("imports at startup, two levels deep (cumulative):")
+    names = set().union(*(r["imports_ms"] for r in results))
+    costs = {name: median([r["imports_ms"].get(name, 0.0) for r in results]) for name in names}
+    for name, cost in sorted(costs.items(), key=lambda item: -item[1])[:20]:
+        print(f"  {name:40s} {cost:8.1f} ms")
+    print("deferred to first use:")
+    for name in results[-1]["deferred_ms"]:
+        print(f"  {name:40s} {median([r['deferred_ms'][name] for r in results]):8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
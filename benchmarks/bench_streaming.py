@@ -0,0 +1,62 @@
+"""
+Compares the peak memory and time of the in-memory (SalesStore) and streaming (stream_sum_by)
+aggregations of the net income per (country, month), on a temporary database. Timings include
+the overhead of tracemalloc.
+
+Usage: python benchmarks/bench_streaming.py [rows] [chunk_size]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from database import DatabaseManager  # noqa: E402
+from sales_store import SalesStore, stream_sum_by  # noqa: E402
+
+
+def make_entries(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = [str(d) for d in pd.date_range("2015-01-31", periods=120, freq="ME").date]
+    for i in range(rows):
+        yield (f"Filiale{i % 500:04d}", f"Country{i % 50:03d}", dates[rng.integers(len(dates))],
+               round(rng.uniform(1e3, 1e6), 2), round(rng.uniform(1e2, 1e5), 2), int(rng.integers(1000)),
+               int(rng.integers(100)), int(rng.integers(101)), round(rng.uniform(0, 1e4), 2))
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(os.path.join(tmp_dir, 'bench.db'))
+        try:
+            db.add_entries(make_entries(rows), batch_size=10_000)
+            by = ['country', 'month']
+            memory_time, memory_peak, expected = measure(
+                lambda: SalesStore.from_database(db, batch_size=chunk_size).sum_by(by, (), net_income=True))
+            stream_time, stream_peak, actual = measure(
+                lambda: stream_sum_by(db.iter_rows(batch_size=chunk_size), by, (), net_income=True, chunk_size=chunk_size))
+        finally:
+            db.close()
+    pd.testing.assert_frame_equal(expected, actual, check_exact=False, rtol=1e-12)
+    print(f"{rows:,} rows, {len(expected):,} (country, month) groups, chunks of {chunk_size:,} rows")
+    print(f"in memory: {memory_time * 1000:8.1f} ms, peak {memory_peak / 2 ** 20:7.1f} MiB")
+    print(f"streaming: {stream_time * 1000:8.1f} ms, peak {stream_peak / 2 ** 20:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+from collections import namedtuple
+
+from PySide6.QtCore import QEvent, QObject, Qt
+from PySide6.QtGui import QColor, QPainter
+from PySide6.QtWidgets import QGraphicsScene
+
+# A bar chart of one measure per country
+Chart = namedtuple("Chart", ["column", "color", "title", "ylabel"])
+
+CHARTS = {
+    "revenue": Chart("monthly_revenue", "blue", "Monthly Revenue by Country", "Revenue (€)"),
+    "costs": Chart("monthly_costs", "red", "Monthly Costs by Country", "Costs (€)"),
+}
+CHART_SIZE = (544, 292)  # Pixels, matching the size of the QGraphicsViews
+
+
+class MatplotlibChartBackend:
+    """
+    Draws the charts with matplotlib (see ChartRenderer) in a worker thread, then shows the
+    rendered images as pixmaps in the graphics views.
+    """
+    name = "matplotlib"
+
+    def __init__(self):
+        self.items = {}  # QGraphicsView -> QGraphicsPixmapItem du graphique affiché
+
+    def prepare(self, kpi_manager, kind):
+        """Returns the ChartImage of a chart, or None without data (runs in a worker thread)."""
+        return kpi_manager.render_chart(kind)
+
+    def show(self, view, kind, image):
+        """Shows a ChartImage in a graphics view, reusing the view's scene and pixmap item (UI thread)."""
+        pixmap = image.to_pixmap()
+        item = self.items.get(view)
+        if item is None:
+            item = self.items[view] = QGraphicsScene(view).addPixmap(pixmap)
+        else:
+            item.setPixmap(pixmap)
+        if view.scene() is not item.scene():
+            view.setScene(item.scene())
+
+
+class QtChartsBackend:
+    """
+    Draws the charts natively with QtCharts, without importing or running matplotlib.
+
+    Each graphics view holds one persistent QChart, drawn as vector graphics: a refresh only
+    replaces the bar values (and the categories if the countries change), and the chart follows
+    the size of its view without any rasterization step.
+    """
+    name = "qtcharts"
+
+    def __init__(self):
+        self.charts = {}  # QGraphicsView -> _NativeChart
+
+    def prepare(self, kpi_manager, kind):
+        """Returns the Series of a chart, or None without data (runs in a worker thread)."""
+        series = kpi_manager.sum_by_country(CHARTS[kind].column)
+        return None if series.empty else series
+
+    def show(self, view, kind, series):
+        """Shows series in the persistent QChart of a graphics view (UI thread)."""
+        chart = self.charts.get(view)
+        if chart is None or chart.kind != kind:
+            chart = self.charts[view] = _NativeChart(view, kind)
+        chart.update(series)
+        if view.scene() is not chart.scene:
+            view.setScene(chart.scene)
+            view.setRenderHint(QPainter.Antialiasing)
+        chart.fit()
+
+
+class _NativeChart(QObject):
+    """QChart of a Chart in its own scene, resized with its view."""
+    def __init__(self, view, kind):
+        super().__init__(view)
+        # Importé ici : QtCharts n'est chargé que si ce backend est utilisé
+        from PySide6.QtCharts import QBarCategoryAxis, QBarSeries, QBarSet, QChart, QValueAxis
+
+        spec = CHARTS[kind]
+        self.kind = kind
+        self.view = view
+        self.chart = QChart()
+        self.chart.setTitle(spec.title)
+        self.chart.setAnimationOptions(QChart.NoAnimation)
+        self.chart.legend().hide()
+        self.bar_set = QBarSet(spec.ylabel)
+        self.bar_set.setColor(QColor(spec.color))
+        bars = QBarSeries()
+        bars.append(self.bar_set)
+        self.chart.addSeries(bars)
+        self.axis_x = QBarCategoryAxis()
+        self.axis_x.setLabelsAngle(-90)
+        self.axis_y = QValueAxis()
+        self.axis_y.setTitleText(spec.ylabel)
+        self.chart.addAxis(self.axis_x, Qt.AlignBottom)
+        self.chart.addAxis(self.axis_y, Qt.AlignLeft)
+        bars.attachAxis(self.axis_x)
+        bars.attachAxis(self.axis_y)
+        self.labels = None
+        self.scene = QGraphicsScene(self)
+        self.scene.addItem(self.chart)
+        view.viewport().installEventFilter(self)  # Le viewport est redimensionné après la vue
+
+    def update(self, series):
+        labels, values = [str(label) for label in series.index], [float(value) for value in series.fillna(0)]
+        if labels != self.labels:
+            self.bar_set.remove(0, self.bar_set.count())
+            self.bar_set.append(values)
+            self.axis_x.setCategories(labels)
+            self.labels = labels
+        else:
+            for index, value in enumerate(values):
+                self.bar_set.replace(index, value)
+        self.axis_y.setRange(min(0.0, min(values)), max(0.0, max(values)))
+        self.axis_y.applyNiceNumbers()
+
+    def fit(self):
+        """Resizes the chart to the visible area of the view."""
+        size = self.view.viewport().size()
+        self.chart.resize(size.width(), size.height())
+        self.scene.setSceneRect(0, 0, size.width(), size.height())
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Resize and self.view.scene() is self.scene:
+            self.fit()
+        return False
+
+
+CHART_BACKENDS = {backend.name: backend for backend in (MatplotlibChartBackend, QtChartsBackend)}
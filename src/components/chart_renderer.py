@@ -0,0 +1,176 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from PySide6.QtGui import QImage, QPixmap
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from components.chart_backends import CHART_SIZE, CHARTS
+from database import filters_key
+
+CHART_DPI = 100
+
+
+class ChartSlot:
+    """
+    Persistent figure of one chart, updated in place instead of being rebuilt on every refresh.
+
+    The Figure, Axes and bars are created once. A refresh with the same countries only changes the
+    bar heights: if the y axis limits are unchanged, the saved background (axes, ticks, title) is
+    restored and only the bars are drawn again (blitting); otherwise the figure is redrawn with the
+    new limits. The bars are rebuilt only when the countries change.
+
+    Attributes:
+        chart (Chart): What the slot draws.
+        figure (Figure): The persistent figure, drawn by a FigureCanvasAgg.
+        full_draws (int): Number of complete redraws, for diagnostics.
+        blits (int): Number of refreshes that only redrew the bars.
+    """
+    def __init__(self, chart, size=CHART_SIZE):
+        self.chart = chart
+        self.figure = Figure(figsize=(size[0] / CHART_DPI, size[1] / CHART_DPI), dpi=CHART_DPI)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.ax = self.figure.subplots()
+        self.ax.set_title(chart.title)
+        self.ax.set_ylabel(chart.ylabel)
+        self.labels = None
+        self.bars = None
+        self.background = None
+        self.full_draws = 0
+        self.blits = 0
+
+    def update(self, series):
+        """Shows series (indexed by country) in the figure and returns its RGBA buffer (a memoryview)."""
+        labels, heights = [str(label) for label in series.index], np.nan_to_num(series.to_numpy(np.float64))
+        ylim, relayout = self.y_limits(heights), labels != self.labels
+        if relayout:
+            self._set_bars(labels, heights, series.index.name)
+        else:
+            for bar, height in zip(self.bars, heights):
+                bar.set_height(height)
+        if relayout or ylim != self.ax.get_ylim() or self.background is None:
+            self.ax.set_ylim(ylim)
+            self._full_draw()
+        else:
+            self.canvas.restore_region(self.background) # Seules les barres sont redessinées
+            self._draw_bars()
+            self.blits += 1
+        return self.canvas.buffer_rgba()
+
+    def y_limits(self, heights):
+        """Returns y axis limits rounded to ticks, so that small edits keep the same axis."""
+        low, high = min(0.0, heights.min()), max(0.0, heights.max())
+        ticks = self.ax.yaxis.get_major_locator().tick_values(low, high if high > low else 1.0)
+        return float(min(0.0, ticks[0])), float(max(0.0, ticks[-1]))
+
+    def _set_bars(self, labels, heights, xlabel):
+        if self.bars is not None:
+            self.bars.remove()
+        positions = np.arange(len(labels))
+        # animated : les barres sont exclues des redessins complets et dessinées par-dessus le fond sauvegardé
+        self.bars = self.ax.bar(positions, heights, width=0.5, color=self.chart.color, animated=True)
+        self.ax.set_xticks(positions, labels, rotation=90)
+        self.ax.set_xlim(-0.5, len(labels) - 0.5)
+        self.ax.set_xlabel(xlabel or "")
+        self.labels = labels
+
+    def _full_draw(self):
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_bars()
+        self.full_draws += 1
+
+    def _draw_bars(self):
+        for bar in self.bars:
+            self.ax.draw_artist(bar)
+
+
+class ChartImage:
+    """
+    Rendered chart: its RGBA pixels and a QImage reading them in place.
+
+    It can be built in any thread; only to_pixmap() must run in the UI thread.
+
+    Attributes:
+        pixels (ndarray): (height, width, 4) uint8 array of the RGBA pixels.
+        image (QImage): Format_RGBA8888 image over pixels, without copy.
+    """
+    def __init__(self, pixels):
+        self.pixels = pixels  # Gardé en vie aussi longtemps que l'image qui lit ses octets
+        height, width, _ = pixels.shape
+        self.image = QImage(pixels.data, width, height, pixels.strides[0], QImage.Format_RGBA8888)
+
+    def to_pixmap(self):
+        """Uploads the image to a QPixmap (UI thread only)."""
+        return QPixmap.fromImage(self.image)
+
+
+class ChartRenderer:
+    """
+    Renders the dashboard charts and keeps the rendered images in an LRU cache.
+
+    A chart is identified by (chart type, filters, data version, pixel size): as long as the data
+    does not change, asking for the same chart again returns the cached image without querying
+    or drawing anything. Each chart type and size is drawn by a persistent ChartSlot, updated in
+    place; its figure is a matplotlib.figure.Figure rather than a pyplot one, so it is not
+    registered in pyplot's global figure list. Memory is bounded by the slots and max_entries images.
+
+    Rendering does not touch any widget, so render() and draw() can run in a worker thread (a lock
+    keeps a figure from being drawn by two threads at once) and hand a ChartImage to the UI thread.
+
+    Attributes:
+        max_entries (int): Maximum number of cached charts.
+    """
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.slots = {}  # (chart type, pixel size) -> ChartSlot
+        self._draw_lock = threading.Lock()  # Une figure ne peut être dessinée que par un thread à la fois
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, kind, data_version, loader, filters=None, size=CHART_SIZE):
+        """
+        Returns the ChartImage of a chart, or None if there is no data to display.
+
+        Args:
+            kind (str): A key of CHARTS.
+            data_version (hashable): The DatabaseManager.data_version() the data belongs to.
+            loader (callable): Called without arguments on a cache miss, returns the Series to plot.
+            filters (dict): The filters applied to the data, part of the cache key.
+            size (tuple): (width, height) of the chart in pixels.
+        """
+        key = (kind, filters_key(filters), data_version, tuple(size))
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+        image = self.draw(kind, loader(), size)
+        with self._lock:
+            self._entries[key] = image
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)  # Le moins récemment utilisé
+        return image
+
+    def draw(self, kind, series, size=CHART_SIZE):
+        """Draws a bar chart of series (indexed by country) and returns it as a ChartImage."""
+        if series.empty:
+            print("No data to display.")
+            return None
+        with self._draw_lock:
+            slot = self.slots.get((kind, tuple(size)))
+            if slot is None:
+                slot = self.slots[(kind, tuple(size))] = ChartSlot(CHARTS[kind], size)
+            # Seule copie des pixels avant l'envoi au GPU : la figure est redessinée au prochain rendu,
+            # alors que l'image peut rester en cache. Agg produit des octets RGBA, d'où Format_RGBA8888
+            # (Format_ARGB32 lit des entiers 0xAARRGGBB, soit BGRA en mémoire : rouge et bleu inversés).
+            return ChartImage(np.array(slot.update(series)))
+
+    def clear(self):
+        """Drops every cached chart."""
+        with self._lock:
+            self._entries.clear()
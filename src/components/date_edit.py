@@ -0,0 +1,20 @@
+from PySide6.QtCore import QDate
+from PySide6.QtWidgets import QDateEdit
+
+
+def create_date_edit(check_box, value=None):
+    """
+    Returns a 'yyyy-MM-dd' QDateEdit enabled only while check_box is checked.
+
+    Args:
+        check_box (QCheckBox): The box switching the date on and off; it is checked if value is given.
+        value (str): Initial 'YYYY-MM-DD' date, or None to start unchecked on today's date.
+    """
+    # Le champ de date n'est actif que si sa case est cochée
+    date_edit = QDateEdit(QDate.fromString(value, "yyyy-MM-dd") if value else QDate.currentDate())
+    date_edit.setCalendarPopup(True)
+    date_edit.setDisplayFormat("yyyy-MM-dd")
+    date_edit.setEnabled(value is not None)
+    check_box.setChecked(value is not None)
+    check_box.toggled.connect(date_edit.setEnabled)
+    return date_edit
@@ -0,0 +1,48 @@
+from PySide6.QtWidgets import QCheckBox, QDialog, QDialogButtonBox, QFormLayout, QLineEdit
+
+from components.date_edit import create_date_edit
+
+
+class DeleteFilterDialog(QDialog):
+    """
+    Dialog collecting the filters of a "delete by filter" operation.
+
+    The user can combine a country, a filiale name and a date range; empty fields and
+    unchecked dates are ignored.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Delete by filter")
+        layout = QFormLayout(self)
+
+        self.country_le = QLineEdit()
+        self.filiale_le = QLineEdit()
+        self.date_from_cb = QCheckBox("From")
+        self.date_from_de = create_date_edit(self.date_from_cb)
+        self.date_to_cb = QCheckBox("To")
+        self.date_to_de = create_date_edit(self.date_to_cb)
+
+        layout.addRow("Country", self.country_le)
+        layout.addRow("Filiale Name", self.filiale_le)
+        layout.addRow(self.date_from_cb, self.date_from_de)
+        layout.addRow(self.date_to_cb, self.date_to_de)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+
+    def filters(self):
+        """
+        Returns the filters entered by the user, in the form accepted by DatabaseManager.delete_where.
+        """
+        filters = {}
+        if self.country_le.text().strip():
+            filters["country"] = self.country_le.text().strip()
+        if self.filiale_le.text().strip():
+            filters["filiale_name"] = self.filiale_le.text().strip()
+        if self.date_from_cb.isChecked():
+            filters["date_from"] = self.date_from_de.date().toString("yyyy-MM-dd")
+        if self.date_to_cb.isChecked():
+            filters["date_to"] = self.date_to_de.date().toString("yyyy-MM-dd")
+        return filters
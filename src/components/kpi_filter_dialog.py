@@ -0,0 +1,111 @@
+from PySide6.QtGui import QDoubleValidator
+from PySide6.QtWidgets import (QAbstractItemView, QCheckBox, QDialog, QDialogButtonBox, QFormLayout, QHBoxLayout,
+                               QLineEdit, QListWidget)
+
+from components.date_edit import create_date_edit
+from database import MEASURE_COLUMNS
+
+
+def describe_filters(filters):
+    """Returns a short human-readable description of a filters dict (e.g. for the PDF report)."""
+    parts = []
+    for column, value in (filters or {}).items():
+        if isinstance(value, (list, tuple, set, frozenset)):
+            value = ", ".join(sorted(value))
+        if column == "date_from":
+            parts.append(f"from {value}")
+        elif column == "date_to":
+            parts.append(f"to {value}")
+        elif column[:4] in ("min_", "max_"):
+            parts.append(f"{column[4:]} {'>=' if column[:4] == 'min_' else '<='} {value:g}")
+        else:
+            parts.append(f"{column}: {value}")
+    return "; ".join(parts) if parts else "All data"
+
+
+class KPIFilterDialog(QDialog):
+    """
+    Dialog editing the filters of the KPI window and PDF report.
+
+    The user can select a set of countries and of filiales, a date range and a minimum and/or
+    maximum for every measure. The result has the form accepted by DatabaseManager's filters, so
+    it is compiled to a parameterized WHERE clause.
+    """
+    def __init__(self, countries, filiales, filters=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("KPI filters")
+        filters = filters or {}
+        layout = QFormLayout(self)
+
+        self.country_lw = self.create_list(countries, filters.get("country", ()))
+        self.filiale_lw = self.create_list(filiales, filters.get("filiale_name", ()))
+        layout.addRow("Countries", self.country_lw)
+        layout.addRow("Filiales", self.filiale_lw)
+
+        self.date_from_cb = QCheckBox("From")
+        self.date_from_de = create_date_edit(self.date_from_cb, filters.get("date_from"))
+        self.date_to_cb = QCheckBox("To")
+        self.date_to_de = create_date_edit(self.date_to_cb, filters.get("date_to"))
+        layout.addRow(self.date_from_cb, self.date_from_de)
+        layout.addRow(self.date_to_cb, self.date_to_de)
+
+        self.threshold_les = {}  # (measure, 'min_' or 'max_') -> QLineEdit
+        for measure in MEASURE_COLUMNS:
+            row = QHBoxLayout()
+            for prefix, placeholder in (("min_", "Min"), ("max_", "Max")):
+                line_edit = QLineEdit()
+                line_edit.setPlaceholderText(placeholder)
+                line_edit.setValidator(QDoubleValidator())
+                if prefix + measure in filters:
+                    line_edit.setText(f"{filters[prefix + measure]:g}")
+                self.threshold_les[(measure, prefix)] = line_edit
+                row.addWidget(line_edit)
+            layout.addRow(measure, row)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel | QDialogButtonBox.Reset)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        buttons.button(QDialogButtonBox.Reset).clicked.connect(self.reset)
+        layout.addRow(buttons)
+
+    def create_list(self, values, selected):
+        list_widget = QListWidget()
+        list_widget.setSelectionMode(QAbstractItemView.MultiSelection)
+        list_widget.addItems(values)
+        selected = {selected} if isinstance(selected, str) else set(selected)
+        for row in range(list_widget.count()):
+            list_widget.item(row).setSelected(list_widget.item(row).text() in selected)
+        return list_widget
+
+    def reset(self):
+        """Clears every filter."""
+        self.country_lw.clearSelection()
+        self.filiale_lw.clearSelection()
+        self.date_from_cb.setChecked(False)
+        self.date_to_cb.setChecked(False)
+        for line_edit in self.threshold_les.values():
+            line_edit.clear()
+
+    def filters(self):
+        """
+        Returns the filters entered by the user, in the form accepted by DatabaseManager.fetch_totals.
+        """
+        filters = {}
+        countries = [item.text() for item in self.country_lw.selectedItems()]
+        filiales = [item.text() for item in self.filiale_lw.selectedItems()]
+        if countries:
+            filters["country"] = countries
+        if filiales:
+            filters["filiale_name"] = filiales
+        if self.date_from_cb.isChecked():
+            filters["date_from"] = self.date_from_de.date().toString("yyyy-MM-dd")
+        if self.date_to_cb.isChecked():
+            filters["date_to"] = self.date_to_de.date().toString("yyyy-MM-dd")
+        for (measure, prefix), line_edit in self.threshold_les.items():
+            text = line_edit.text().strip().replace(",", ".")
+            if text:
+                try:
+                    filters[prefix + measure] = float(text)
+                except ValueError:
+                    pass  # Saisie incomplète (ex. "-"), ignorée
+        return filters
@@ -1,29 +1,77 @@
 import os
-import pandas as pd
-from PySide6.QtGui import QPixmap, QImage
-from PySide6.QtWidgets import QMainWindow, QVBoxLayout, QTableWidget, QTableWidgetItem
-from matplotlib import pyplot as plt
-from matplotlib.backends.backend_agg import FigureCanvasAgg
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+import threading
+from PySide6.QtCore import QRect
+from PySide6.QtWidgets import (QMainWindow, QVBoxLayout, QTableWidget, QTableWidgetItem, QComboBox, QPushButton, QLabel,
+                               QCheckBox)
 from ui.kpi_ui import Ui_kpi_window
-
+from components.query_executor import QueryExecutor
+from components.chart_backends import CHARTS, CHART_SIZE
+from components.kpi_filter_dialog import KPIFilterDialog, describe_filters
+from database import filters_key
+from kpi_compute import NET_INCOME, income_orderings
+from kpi_catalog import KPI_CATALOG
+# pandas, NumPy, reportlab et les modules d'agrégation sont importés au premier usage (indicateurs,
+# graphiques ou PDF) : la fenêtre principale s'affiche sans les charger (voir prewarm.py)
+
+# Regroupements temporels proposés dans la fenêtre KPI : (libellé, période, fenêtre glissante en mois)
+PERIOD_CHOICES = [
+    ("Date", "date", None),
+    ("Month", "month", None),
+    ("Quarter", "quarter", None),
+    ("Year", "year", None),
+    ("Rolling 12 months", "month", 12),
+]
+DEFAULT_PERIOD_CHOICE = 1  # Par mois : une ligne par pays et par mois, quel que soit le jour de la saisie
+
+# Classements proposés dans la fenêtre KPI : (libellé, regroupement, métrique du catalogue, ordre croissant)
+TOP_N = 10
+RANKING_CHOICES = [
+    (f"Top {TOP_N} filiales by net income", ("filiale_name", "country"), "net_income", False),
+    (f"Top {TOP_N} filiales by revenue", ("filiale_name", "country"), "revenue", False),
+    (f"Bottom {TOP_N} filiales by net income", ("filiale_name", "country"), "net_income", True),
+    (f"Bottom {TOP_N} filiales by satisfaction", ("filiale_name", "country"), "weighted_satisfaction", True),
+    (f"Top {TOP_N} countries by net income", ("country",), "net_income", False),
+    (f"Top {TOP_N} countries by ROAS", ("country",), "roas", False),
+]
+# Métriques du catalogue qui sont des sommes de colonnes (colonne sommée), classables par aggregate
+STREAMED_METRICS = {"revenue": "monthly_revenue", "costs": "monthly_costs", "net_income": NET_INCOME}
+# Moteur des classements de STREAMED_METRICS : 'sql' lit les tables de cumul, 'store' somme la copie en
+# colonnes de sales_data (voir SalesStore et aggregate), 'streaming' la lit par blocs sans la garder en
+# mémoire et 'parallel' répartit ses partitions sur des processus (voir ParallelAggregator) ; modifiable
+# par set_engine
+KPI_ENGINES = ("sql", "store", "streaming", "parallel")
+DEFAULT_KPI_ENGINE = os.environ.get("SALES_KPI_ENGINE", "sql")
+# Processus du moteur 'parallel' (0 : un par CPU) et découpage de la table ('country' ou 'date')
+DEFAULT_KPI_WORKERS = int(os.environ.get("SALES_KPI_WORKERS", "0"))
+DEFAULT_KPI_PARTITION = os.environ.get("SALES_KPI_PARTITION", "country")
 
 
 class KPIManager(QMainWindow, Ui_kpi_window):
     """Gestionnaire de KPI pour afficher les indicateurs clés de performance et générer des rapports."""
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, query_executor=None):
         super().__init__() # Appelle le constructeur des classes parentes.
         self.db_manager = db_manager  # Utilisation du singleton de la base de données
+        self.engine = "sql"
+        self.chunk_size = 50000  # Lignes lues par bloc par les moteurs 'streaming' et parallèle
+        # Avec le moteur 'parallel', les agrégations sont réparties sur des processus (par pays ou par dates)
+        self.workers = DEFAULT_KPI_WORKERS or os.cpu_count() or 1
+        self.partition_by = DEFAULT_KPI_PARTITION
+        self.parallel_aggregator = None
+        self.country_sketches = None  # Sketches du mode approximatif par pays, créés au premier usage
+        self._aggregator_lock = threading.Lock()  # Les agrégations parallèles sont lancées depuis les threads de requêtes
+        self.filters = {}  # Filtres de la fenêtre KPI et du PDF (pays, filiales, dates, seuils)
+        self.ranking_in_pdf = True  # Ajoute le classement sélectionné au rapport PDF
+        self.chart_renderer = None  # Graphiques matplotlib rendus, créé au premier graphique (voir _chart_renderer)
+        # Les requêtes s'exécutent hors du thread de l'interface, les résultats reviennent par signaux Qt
+        self.query_executor = query_executor or QueryExecutor(self)
+        self.query_executor.loading_changed.connect(self.show_loading_state)
         self.setupUi(self)  # Initialisation de l'interface utilisateur depuis Ui_kpi_window
         #configure les widgets et les layouts définis dans le fichier .ui. Elle prend une instance de QMainWindow
         # (ici self) et configure l'interface utilisateur en conséquence
         self.pushButton.clicked.connect(self.generate_pdf) # Connexion du bouton pour générer un PDF
         self.init_widgets() # Initialisation des widgets
         self.setWindowTitle("Sales Data Management")    # Définition du titre de la fenêtre
+        self.set_engine(DEFAULT_KPI_ENGINE, partition_by=DEFAULT_KPI_PARTITION)
 
     def setup_widget_layout(self, widget):
         # Crée un QVBoxLayout si le widget n'en a pas déjà un
@@ -38,47 +86,298 @@ class KPIManager(QMainWindow, Ui_kpi_window):
         # Créer et ajouter les QTableWidgets
         self.country_date_income_table = QTableWidget()
         self.date_country_income_table = QTableWidget()
+        self.kpi_catalog_table = QTableWidget() # Indicateurs du catalogue par pays et période
+        self.ranking_combo = QComboBox() # Classement affiché dans top_table
+        for label, _, _, _ in RANKING_CHOICES:
+            self.ranking_combo.addItem(label)
+        self.ranking_combo.currentIndexChanged.connect(self.update_display)
+        self.top_table = QTableWidget()
         self.country_wdg.layout().addWidget(self.country_date_income_table)
+        self.country_wdg.layout().addWidget(self.ranking_combo)
+        self.country_wdg.layout().addWidget(self.top_table)
         self.date_wdg.layout().addWidget(self.date_country_income_table)
-
-    def load_data(self):
-        """ Chargement des données depuis la base de données dans un DataFrame pandas. . """
-        query = "SELECT * FROM sales_data"
-        df = pd.read_sql_query(query, self.db_manager.connection)
-        print(df.head())
-        return df
-
-    def update_kpi_labels(self, df):
-        """ egroupe et agrège les données pour les revenus nets par pays et date,
-        et par date et pays, puis configure les tables pour afficher ces données. """
-        total_revenue = df['monthly_revenue'].sum()
-        total_costs = df['monthly_costs'].sum()
-        net_income = total_revenue - total_costs - df['advertising_costs'].sum()
-
-        self.revenue_label.setText(f"Total Revenue: {total_revenue:,.2f} €")
-        self.costs_label.setText(f"Total Costs: {total_costs:,.2f} €")
-        self.label_3.setText(f"Net Income: {net_income:,.2f} €")
+        self.date_wdg.layout().addWidget(self.kpi_catalog_table)
+        # Mode approximatif : estimations par sketches avec leur marge d'erreur, à la place du catalogue
+        self.approximate_label = QLabel()
+        self.approximate_label.setWordWrap(True)
+        self.distinct_table = QTableWidget() # Nombre estimé de filiales distinctes par pays
+        self.percentile_table = QTableWidget() # Percentiles approchés du revenu et de la satisfaction
+        for widget in (self.approximate_label, self.distinct_table, self.percentile_table):
+            widget.hide()
+            self.date_wdg.layout().addWidget(widget)
+
+        # Choix du regroupement temporel des tables et du rapport PDF
+        self.period_combo = QComboBox(self.centralwidget)
+        self.period_combo.setGeometry(QRect(110, 30, 160, 24))
+        for label, _, _ in PERIOD_CHOICES:
+            self.period_combo.addItem(label)
+        self.period_combo.setCurrentIndex(DEFAULT_PERIOD_CHOICE)
+        self.period_combo.currentIndexChanged.connect(self.update_display)
+
+        # Filtres appliqués aux indicateurs : ils sont traduits en clause WHERE paramétrée
+        self.filter_button = QPushButton("Filters...", self.centralwidget)
+        self.filter_button.setGeometry(QRect(280, 30, 90, 24))
+        self.filter_button.clicked.connect(self.edit_filters)
+        self.filter_label = QLabel(describe_filters(self.filters), self.centralwidget)
+        self.filter_label.setGeometry(QRect(380, 30, 440, 24))
+
+        self.approximate_check = QCheckBox("Approximate KPIs", self.centralwidget)
+        self.approximate_check.setGeometry(QRect(20, 140, 200, 24))
+        self.approximate_check.toggled.connect(self.update_display)
+
+    def edit_filters(self):
+        """ Ouvre la boîte de dialogue des filtres et recharge les indicateurs s'ils changent. """
+        countries = [country for country, _ in self.db_manager.fetch_sum_by_country('monthly_revenue')]
+        filiales = sorted({filiale for filiale, _, _ in self.db_manager.fetch_sum_by_filiale('monthly_revenue')})
+        dialog = KPIFilterDialog(countries, filiales, self.filters, self)
+        if dialog.exec():
+            self.set_filters(dialog.filters())
+
+    def set_filters(self, filters):
+        """ Applique de nouveaux filtres à la fenêtre KPI et au rapport PDF. """
+        self.filters = dict(filters)
+        self.filter_label.setText(describe_filters(self.filters))
+        self.update_display()
+
+    def set_engine(self, engine, workers=None, partition_by=None):
+        """
+        Sélectionne le moteur des classements par somme (voir KPI_ENGINES) et recharge les indicateurs affichés.
+        Le nombre de processus et le découpage ('country' ou 'date') s'appliquent au moteur 'parallel'.
+        """
+        if engine not in KPI_ENGINES:
+            raise ValueError(f"Unknown KPI engine: '{engine}'")
+        if partition_by not in (None, "country", "date"):
+            raise ValueError(f"Unknown partition key: '{partition_by}'")
+        self.engine = engine
+        self.workers = workers or self.workers
+        self.partition_by = partition_by or self.partition_by
+        if self.isVisible():
+            self.update_display()
+
+    def selected_period(self):
+        """ Returns the (label, period, rolling_months) choice selected in the period combo box. """
+        return PERIOD_CHOICES[self.period_combo.currentIndex()]
+
+    def selected_ranking(self):
+        """ Returns the (label, group_by, metric, ascending) choice selected in the ranking combo box. """
+        return RANKING_CHOICES[self.ranking_combo.currentIndex()]
+
+    def load_store(self, filters=None):
+        """Returns the columnar copy of the rows selected by filters (see SalesStore), shared until the data changes."""
+        from sales_store import SalesStore
+        return self.db_manager.snapshots.get(("sales_store", filters_key(filters)),
+                                             lambda: SalesStore.from_database(self.db_manager, filters=filters))
+
+    def aggregate(self, by, measures=(), net_income=True, filters=None):
+        """
+        Sums measures per group of dimensions (and time buckets) over the rows selected by filters.
+
+        With the 'parallel' engine, partitions of the table are aggregated by worker processes (see
+        ParallelAggregator) and the groups come back sorted. With the 'streaming' engine the table is
+        read chunk_size rows at a time and only the partial sums are kept, so memory stays bounded
+        for any history size; otherwise the cached SalesStore is used. All modes return the same groups.
+        """
+        if self.engine == "parallel":
+            return self._parallel_aggregator().aggregate(by, measures, net_income, filters)
+        if self.engine == "streaming":
+            from sales_store import stream_sum_by
+            rows = self.db_manager.iter_rows(batch_size=self.chunk_size, filters=filters)
+            return stream_sum_by(rows, by, measures, net_income, self.chunk_size)
+        return self.load_store(filters).sum_by(by, measures, net_income)
+
+    def approximate_kpis(self, filters=None):
+        """
+        Returns a KPISketch of the rows selected by filters for the approximate KPI mode: distinct
+        filiales per country and revenue and satisfaction percentiles, each with its error bound.
+
+        Sketches are kept per country (see CountrySketches): when the data changes only the countries
+        whose rollups changed are scanned again (by the worker processes with the 'parallel' engine),
+        and the merged sketch is shared until the next change.
+        """
+        return self.db_manager.snapshots.get(("kpi_sketch", filters_key(filters)), lambda: self._build_sketch(filters))
+
+    def _build_sketch(self, filters):
+        with self._aggregator_lock:
+            if self.country_sketches is None:
+                from sketches import CountrySketches
+                self.country_sketches = CountrySketches(self.db_manager, self.chunk_size)
+        if self.engine == "parallel":
+            return self.country_sketches.sketch(filters, self._parallel_aggregator().sketch_partitions)
+        return self.country_sketches.sketch(filters)
+
+    def approximate_tables(self, filters=None):
+        """
+        Returns the row count of the sketch, the estimated distinct filiales per country and the
+        percentiles of every QUANTILE_MEASURES column (see KPISketch), each with its error column.
+        """
+        import pandas as pd
+        from sketches import QUANTILE_MEASURES
+        sketch = self.approximate_kpis(filters)
+        percentiles = pd.concat([sketch.percentiles(measure).assign(measure=measure) for measure in QUANTILE_MEASURES],
+                                ignore_index=True)
+        return sketch.row_count, sketch.distinct_filiales(), percentiles[["measure", "quantile", "value", "rank_error"]]
+
+    def _parallel_aggregator(self):
+        with self._aggregator_lock:
+            aggregator = self.parallel_aggregator
+            if aggregator is None or (aggregator.workers, aggregator.partition_by) != (self.workers, self.partition_by):
+                if aggregator is not None:
+                    aggregator.close()
+                from parallel_aggregate import ParallelAggregator
+                aggregator = self.parallel_aggregator = ParallelAggregator(self.db_manager, self.workers,
+                                                                           self.partition_by, self.chunk_size)
+            return aggregator
+
+    def shutdown_workers(self):
+        """Stops the worker processes of the parallel aggregations, if any."""
+        with self._aggregator_lock:
+            if self.parallel_aggregator is not None:
+                self.parallel_aggregator.close()
+                self.parallel_aggregator = None
+
+    def fetch_totals(self, filters=None):
+        """Returns the KPI totals of the rows selected by filters, shared with every view until the data changes."""
+        return self.db_manager.snapshots.get(("totals", filters_key(filters)),
+                                             lambda: self.db_manager.fetch_totals(filters))
+
+    def update_kpi_labels(self, totals):
+        """ Affiche les totaux (revenus, coûts, revenu net) calculés par la base de données. """
+        self.revenue_label.setText(f"Total Revenue: {totals['monthly_revenue']:,.2f} €")
+        self.costs_label.setText(f"Total Costs: {totals['monthly_costs']:,.2f} €")
+        self.label_3.setText(f"Net Income: {totals['net_income']:,.2f} €")
 
     def update_display(self):
-        """ Mise à jour de l'affichage en fonction des données chargées. """
-        df = self.load_data()
-        if not df.empty:
-            self.update_kpi_labels(df)
-            self.update_income_tables(df)
+        """ Lance le chargement des agrégats en arrière-plan; l'affichage est mis à jour à leur arrivée. """
+        _, period, rolling_months = self.selected_period()
+        self.query_executor.submit("kpi_display", self.load_display_data, period, rolling_months, dict(self.filters),
+                                   self.selected_ranking(), self.approximate_check.isChecked(),
+                                   on_result=self.show_display_data)
+
+    def load_display_data(self, period="month", rolling_months=None, filters=None, ranking=RANKING_CHOICES[0],
+                          approximate=False):
+        """Loads the totals and income tables (runs in a worker thread, must not touch widgets)."""
+        totals = self.fetch_totals(filters)
+        if not totals:
+            return None
+        _, group_by, metric, ascending = ranking
+        top = self.top_kpis(metric, TOP_N, group_by, ascending, filters)
+        if approximate:  # Les estimations remplacent le catalogue, qui n'est alors pas calculé
+            catalog, approximate_tables = None, self.approximate_tables(filters)
+        else:
+            catalog, approximate_tables = self.kpi_table(("country",), None if rolling_months else period,
+                                                         filters=filters), None
+        return totals, self.income_by_country_and_date(period, rolling_months, filters), catalog, top, approximate_tables
+
+    def show_display_data(self, data):
+        """ Affiche les données chargées par load_display_data (thread de l'interface). """
+        if data:
+            totals, income_tables, catalog, top, approximate_tables = data
+            self.update_kpi_labels(totals)
+            self.update_income_tables(*income_tables)
+            if catalog is not None:
+                self.setup_table(self.kpi_catalog_table, self.format_kpis(catalog))
+            self.setup_table(self.top_table, self.format_kpis(top))
+            self.show_approximate_tables(approximate_tables)
         else:
             self.clear_tables()
 
-
-    def update_income_tables(self, df):
-        # Group and aggregate data for income by country and date
-        income_by_country_date = df.groupby(['country', 'date']).apply(
-            lambda x: x['monthly_revenue'].sum() - x['monthly_costs'].sum() - x['advertising_costs'].sum()).reset_index(name='Net Income')
-        income_by_date_country = df.groupby(['date', 'country']).apply(
-            lambda x: x['monthly_revenue'].sum() - x['monthly_costs'].sum() - x['advertising_costs'].sum()).reset_index(name='Net Income')
-
+    def show_approximate_tables(self, approximate_tables):
+        """ Affiche les indicateurs approchés à la place du catalogue, ou le catalogue s'ils sont désactivés. """
+        self.kpi_catalog_table.setVisible(approximate_tables is None)
+        for widget in (self.approximate_label, self.distinct_table, self.percentile_table):
+            widget.setVisible(approximate_tables is not None)
+        if approximate_tables is not None:
+            row_count, distinct, percentiles = approximate_tables
+            self.approximate_label.setText(
+                f"Approximate KPIs over {row_count:,} rows: 'error' is the half-width of a 95% interval, "
+                f"'rank_error' the 99% bound on the rank of each percentile (fraction of the rows).")
+            self.setup_table(self.distinct_table, self.format_kpis(distinct))
+            self.setup_table(self.percentile_table, self.format_kpis(percentiles))
+
+    def show_loading_state(self, key, loading):
+        """ Affiche un état de chargement dans la fenêtre KPI au lieu de la figer. """
+        if key == "kpi_display" and loading:
+            for label in (self.revenue_label, self.costs_label, self.label_3):
+                label.setText("Loading...")
+        elif key == "kpi_pdf":
+            self.pushButton.setEnabled(not loading)
+
+    def update_income_tables(self, income_by_country_date, income_by_date_country):
+        """ Affiche le revenu net par pays et date, et par date et pays. """
         self.setup_table(self.country_date_income_table, income_by_country_date)
         self.setup_table(self.date_country_income_table, income_by_date_country)
 
+    def income_by_country_and_date(self, period="date", rolling_months=None, filters=None):
+        """
+        Returns the net income grouped by (country, period) and by (period, country) as two DataFrames.
+
+        The period is 'date', 'month', 'quarter' or 'year' (see DatabaseManager.fetch_net_income_by_period).
+        """
+        return self.db_manager.snapshots.get(("income_tables", period, rolling_months, filters_key(filters)),
+                                             lambda: self._read_income_tables(period, rolling_months, filters))
+
+    def _read_income_tables(self, period, rolling_months, filters):
+        import pandas as pd
+        income = pd.DataFrame(self.db_manager.fetch_net_income_by_period(period, "country", rolling_months, filters),
+                              columns=['country', period, NET_INCOME])
+        return income_orderings(income, period) # Une seule requête, deux tris du même résultat
+
+    def kpi_table(self, group_by=("country",), period=None, metrics=None, filters=None):
+        """
+        Returns the metrics of the KPI catalog per group (country and/or filiale_name, and period)
+        as a DataFrame, computed by a single SQL statement and shared until the data changes.
+        """
+        metrics = list(KPI_CATALOG) if metrics is None else list(metrics)
+        return self.db_manager.snapshots.get(
+            ("kpi_table", tuple(group_by), period, tuple(metrics), filters_key(filters)),
+            lambda: self._read_kpi_table(group_by, period, metrics, filters))
+
+    def _read_kpi_table(self, group_by, period, metrics, filters):
+        import pandas as pd
+        columns = list(group_by) + ([period] if period else []) + [KPI_CATALOG[metric].title for metric in metrics]
+        return pd.DataFrame(self.db_manager.fetch_kpis(group_by, period, metrics, filters), columns=columns)
+
+    def top_kpis(self, metric="net_income", n=TOP_N, group_by=("filiale_name", "country"), ascending=False,
+                 filters=None):
+        """
+        Returns the n groups with the largest (or smallest) value of a KPI catalog metric as a
+        DataFrame, best first, shared until the data changes.
+
+        The database ranks them with ORDER BY ... LIMIT (see DatabaseManager.fetch_top_kpis). With
+        another engine than 'sql', metrics that are sums of columns (STREAMED_METRICS) are summed per
+        group by aggregate and ranked with a heap of n groups instead.
+        """
+        return self.db_manager.snapshots.get(
+            ("top_kpis", metric, n, tuple(group_by), ascending, filters_key(filters), self.engine),
+            lambda: self._read_top_kpis(metric, n, group_by, ascending, filters))
+
+    def _read_top_kpis(self, metric, n, group_by, ascending, filters):
+        import pandas as pd
+        columns = list(group_by) + [KPI_CATALOG[metric].title]
+        if self.engine != "sql" and metric in STREAMED_METRICS:
+            from sales_store import top_groups
+            column = STREAMED_METRICS[metric]
+            net_income = column == NET_INCOME
+            sums = self.aggregate(group_by, () if net_income else (column,), net_income, filters)
+            return top_groups(sums, column, n, ascending, group_by).set_axis(columns, axis=1)
+        return pd.DataFrame(self.db_manager.fetch_top_kpis(metric, n, group_by, ascending, filters), columns=columns)
+
+    @staticmethod
+    def format_kpis(df):
+        """ Arrondit les indicateurs pour l'affichage; les ratios sans dénominateur restent vides. """
+        return df.round(2).astype(object).where(df.notna(), "")
+
+    def sum_by_country(self, column, filters=None):
+        """Returns a Series with the sum of a column per country, aggregated by the database."""
+        return self.db_manager.snapshots.get(("sum_by_country", column, filters_key(filters)),
+                                             lambda: self._read_sum_by_country(column, filters))
+
+    def _read_sum_by_country(self, column, filters):
+        import pandas as pd
+        rows = self.db_manager.fetch_sum_by_country(column, filters)
+        return pd.Series([value for _, value in rows], index=pd.Index([country for country, _ in rows], name='country'),
+                         name=column)
+
     def setup_table(self, table_widget, data_df):
         """ Configure un QTableWidget avec des données DataFrame. """
         table_widget.setRowCount(data_df.shape[0]) # Nombre de lignes
@@ -96,11 +395,31 @@ class KPIManager(QMainWindow, Ui_kpi_window):
         self.label_3.setText("No Data")     # Affiche "No Data" dans les labels
         self.country_date_income_table.clear() # Efface les tables
         self.date_country_income_table.clear() # Efface les tables
+        self.kpi_catalog_table.clear()
+        self.top_table.clear()
+        self.distinct_table.clear()
+        self.percentile_table.clear()
 
     def generate_pdf(self): # Génère un rapport PDF avec les KPI
         """Generates a PDF report detailing KPIs including revenue, costs, and net income by country and date."""
         # Set the path to save the PDF
         download_path = os.path.join(os.path.expanduser('~'), 'Downloads', 'KPI_Report.pdf') # Chemin de téléchargement
+        summaries = [ # Les textes des labels sont lus dans le thread de l'interface
+            f'Total Revenue: {self.revenue_label.text()}',
+            f'Total Costs: {self.costs_label.text()}',
+            f'Net Income: {self.label_3.text()}',
+        ]
+        # La requête et la construction du PDF s'exécutent en arrière-plan
+        self.query_executor.submit("kpi_pdf", self.build_pdf, download_path, summaries, self.selected_period(),
+                                   dict(self.filters), self.selected_ranking() if self.ranking_in_pdf else None)
+
+    def build_pdf(self, download_path, summaries, period_choice=PERIOD_CHOICES[0], filters=None, ranking=None):
+        """Builds the PDF report (runs in a worker thread, must not touch widgets)."""
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 
         # Create a PDF document template with specified pagesize
         doc = SimpleDocTemplate(download_path, pagesize=A4) # Crée un document PDF avec une taille de page A4
@@ -113,17 +432,19 @@ class KPIManager(QMainWindow, Ui_kpi_window):
 
         # Add a title and the KPI summaries to the document
         story.append(Paragraph('KPI Report', header_style)) # Ajoute un titre
-        story.append(Paragraph(f'Total Revenue: {self.revenue_label.text()}', body_style))  # Ajoute le total des revenus
-        story.append(Paragraph(f'Total Costs: {self.costs_label.text()}', body_style))  # Ajoute le total des coûts
-        story.append(Paragraph(f'Net Income: {self.label_3.text()}', body_style))   # Ajoute le revenu net
+        story.append(Paragraph(f'Filters: {describe_filters(filters)}', body_style))
+        for summary in summaries: # Ajoute le total des revenus, des coûts et le revenu net
+            story.append(Paragraph(summary, body_style))
         story.append(Spacer(1, 0.2 * inch)) # Ajoute un espace
 
         # Prepare the data for inclusion in the report
-        df_country_date, df_date_country = self.prepare_data_for_pdf() # Prépare les données pour le rapport PDF
+        period_title, period, rolling_months = period_choice
+        df_country_date, df_date_country = self.prepare_data_for_pdf(period, rolling_months, filters) # Prépare les données pour le rapport PDF
+        catalog = self.format_kpis(self.kpi_table(("country",), None if rolling_months else period, filters=filters))
 
         # Convert DataFrame data into a format suitable for ReportLab's Table object
-        data_country_date = [['Country', 'Date', 'Net Income']] + df_country_date.values.tolist()   # Données par pays et date
-        data_date_country = [['Date', 'Country', 'Net Income']] + df_date_country.values.tolist()   # Données par date et pays
+        data_country_date = [['Country', period_title, 'Net Income']] + df_country_date.values.tolist()   # Données par pays et période
+        data_date_country = [[period_title, 'Country', 'Net Income']] + df_date_country.values.tolist()   # Données par période et pays
 
         # Create tables for the PDF
         table_country_date = Table(data_country_date, [200, 200, 100]) # Tableau pour les données par pays et date
@@ -142,66 +463,73 @@ class KPIManager(QMainWindow, Ui_kpi_window):
 
         # Add tables to the story
         story.append(Spacer(1, 0.5 * inch)) # Ajoute un espace
-        story.append(Paragraph('Income by Country and Date', header_style))
+        story.append(Paragraph(f'Income by Country and {period_title}', header_style))
         story.append(table_country_date)
         story.append(Spacer(1, 0.5 * inch))
-        story.append(Paragraph('Income by Date and Country', header_style))
+        story.append(Paragraph(f'Income by {period_title} and Country', header_style))
         story.append(table_date_country)
 
+        # Indicateurs du catalogue (marge, ROAS, coût d'acquisition, satisfaction pondérée)
+        table_catalog = Table([catalog.columns.tolist()] + catalog.values.tolist(), repeatRows=1)
+        table_catalog.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('FONTSIZE', (0, 0), (-1, -1), 6),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+        ]))
+        story.append(Spacer(1, 0.5 * inch))
+        story.append(Paragraph(f'KPIs by Country{"" if rolling_months else f" and {period_title}"}', header_style))
+        story.append(table_catalog)
+
+        # Classement optionnel (top/bottom N)
+        if ranking is not None:
+            ranking_title, group_by, metric, ascending = ranking
+            top = self.format_kpis(self.top_kpis(metric, TOP_N, group_by, ascending, filters))
+            table_top = Table([top.columns.tolist()] + top.values.tolist(), repeatRows=1)
+            table_top.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+            ]))
+            story.append(Spacer(1, 0.5 * inch))
+            story.append(Paragraph(ranking_title, header_style))
+            story.append(table_top)
+
         # Build the PDF document
         doc.build(story)
         print(f"PDF created and saved as '{download_path}'.")
 
-    def prepare_data_for_pdf(self):
-        """Prepares data for PDF report by querying the database and grouping it by country/date and date/country."""
-        df = self.load_data()  # Load data from the database
-
-        # Group and aggregate data for income by country and date
-        df_country_date = df.groupby(['country', 'date']).apply(
-            lambda x: x['monthly_revenue'].sum() - x['monthly_costs'].sum() - x['advertising_costs'].sum()).reset_index(
-            name='Net Income')
-
-        # Group and aggregate data for income by date and country
-        df_date_country = df.groupby(['date', 'country']).apply(
-            lambda x: x['monthly_revenue'].sum() - x['monthly_costs'].sum() - x['advertising_costs'].sum()).reset_index(
-            name='Net Income')
-
-        return df_country_date, df_date_country
-
-    def create_costs_graph(self):
+    def prepare_data_for_pdf(self, period="date", rolling_months=None, filters=None):
+        """Prepares data for PDF report by querying the net income grouped by country/period and period/country."""
+        return self.income_by_country_and_date(period, rolling_months, filters)
+
+    def render_chart(self, kind, series=None, filters=None, size=CHART_SIZE):
+        """
+        Returns the ChartImage of a chart of CHARTS (None without data), from the chart cache while
+        the data and filters are unchanged. A series given explicitly is drawn without being cached.
+        Safe to run in a worker thread.
+        """
+        if series is not None:
+            return self._chart_renderer().draw(kind, series, size)
+        return self._chart_renderer().render(kind, self.db_manager.data_version(),
+                                             lambda: self.sum_by_country(CHARTS[kind].column, filters), filters, size)
+
+    def _chart_renderer(self):
+        if self.chart_renderer is None:
+            # Importé au premier graphique : matplotlib n'est pas chargé avec le backend QtCharts
+            from components.chart_renderer import ChartRenderer
+            self.chart_renderer = ChartRenderer()
+        return self.chart_renderer
+
+    def create_costs_graph(self, monthly_costs_by_country=None):
         """Creates a bar graph for monthly costs by country and returns a QPixmap."""
-        df = self.load_data()
-        if not df.empty:
-            monthly_costs_by_country = df.groupby('country')['monthly_costs'].sum()
-            fig, ax = plt.subplots(figsize=(5.44, 2.92))  # Size in inches to match QGraphicView size
-            monthly_costs_by_country.plot(kind='bar', color='red', title='Monthly Costs by Country', ax=ax)
-            ax.set_ylabel('Costs (€)')
-            return self.fig_to_pixmap(fig)
-        else:
-            print("No data to display.")
-            return None
+        image = self.render_chart("costs", monthly_costs_by_country)
+        return image.to_pixmap() if image else None
 
-    def create_revenue_graph(self):
+    def create_revenue_graph(self, monthly_revenue_by_country=None):
         """Creates a bar graph for monthly revenue by country and returns a QPixmap."""
-        df = self.load_data()
-        if not df.empty:
-            fig, ax = plt.subplots(figsize=(5.44, 2.92))  # Size in inches to match QGraphicView size
-            monthly_revenue_by_country = df.groupby('country')['monthly_revenue'].sum()
-            monthly_revenue_by_country.plot(kind='bar', color='blue', title='Monthly Revenue by Country', ax=ax)
-            ax.set_ylabel('Revenue (€)')
-            return self.fig_to_pixmap(fig)
-        else:
-            print("No data to display.")
-            return None
-
-    def fig_to_pixmap(self, fig):
-        """Converts a matplotlib figure to a QPixmap."""
-        canvas = FigureCanvasAgg(fig) # Convertit la figure en un canevas
-        canvas.draw() # Dessine le canevas
-        buf = canvas.buffer_rgba() # Convertit le canevas en un tampon RGBA
-        qimage = QImage(buf, int(fig.get_size_inches()[0] * fig.dpi), int(fig.get_size_inches()[1] * fig.dpi), QImage.Format_ARGB32)
-        pixmap = QPixmap.fromImage(qimage)
-        return pixmap
+        image = self.render_chart("revenue", monthly_revenue_by_country)
+        return image.to_pixmap() if image else None
 
 
     # def first_graph(self):
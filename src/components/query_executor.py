@@ -0,0 +1,116 @@
+import logging
+import threading
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class _TaskSignals(QObject):
+    """Signals emitted by a worker task. The object lives in the GUI thread, so emissions are queued to it."""
+    done = Signal(str, int, object, object)  # key, generation, result, error
+
+
+class _QueryTask(QRunnable):
+    """Runs one query function in a QThreadPool worker thread."""
+    def __init__(self, key, generation, func, args, kwargs, signals, is_current):
+        super().__init__()
+        self.key = key
+        self.generation = generation
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = signals
+        self.is_current = is_current
+
+    def run(self):
+        if not self.is_current(self.key, self.generation):
+            return  # Cancelled or superseded before it started: skip the query entirely
+        try:
+            result, error = self.func(*self.args, **self.kwargs), None
+        except Exception as e:
+            result, error = None, e
+        self.signals.done.emit(self.key, self.generation, result, error)
+
+
+class QueryExecutor(QObject):
+    """
+    Runs database queries in background threads and delivers their results to the GUI thread.
+
+    Each request is identified by a key (usually the name of the view it feeds). Submitting a new
+    request for a key supersedes the previous one: a stale request is skipped if it has not started
+    yet, and its result is dropped if it has. Results are delivered through Qt signals, so the
+    callbacks always run in the GUI thread and can update widgets.
+
+    Signals:
+        finished(str, object): Emitted with the key and the result of a current request.
+        failed(str, str): Emitted with the key and the error message of a current request.
+        loading_changed(str, bool): Emitted when a key starts or stops loading.
+    """
+    finished = Signal(str, object)
+    failed = Signal(str, str)
+    loading_changed = Signal(str, bool)
+
+    def __init__(self, parent=None, max_threads=2):
+        super().__init__(parent)
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(max_threads)
+        self._signals = _TaskSignals(self)
+        self._signals.done.connect(self._on_task_done)
+        self._generations = {}  # key -> generation of the current request
+        self._callbacks = {}  # key -> (on_result, on_error) of the current request
+        self._lock = threading.Lock()
+
+    def submit(self, key, func, *args, on_result=None, on_error=None, **kwargs):
+        """
+        Runs ``func(*args, **kwargs)`` in a worker thread.
+
+        Args:
+            key (str): Identifies the request; a new request for the same key cancels the previous one.
+            func (callable): The query to run. It must not touch widgets.
+            on_result (callable): Called in the GUI thread with the result.
+            on_error (callable): Called in the GUI thread with the exception raised by ``func``.
+
+        Returns:
+            int: The generation number of the request.
+        """
+        with self._lock:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+        self._callbacks[key] = (on_result, on_error)
+        self.loading_changed.emit(key, True)
+        self.thread_pool.start(_QueryTask(key, generation, func, args, kwargs, self._signals, self.is_current))
+        return generation
+
+    def is_current(self, key, generation):
+        """Returns True if the request is still the latest one submitted for its key."""
+        with self._lock:
+            return self._generations.get(key) == generation
+
+    def cancel(self, key):
+        """Cancels the pending request for a key; its result, if any, will be ignored."""
+        with self._lock:
+            if key in self._generations:
+                self._generations[key] += 1
+        if self._callbacks.pop(key, None) is not None:
+            self.loading_changed.emit(key, False)
+
+    def shutdown(self, msecs=5000):
+        """Cancels every pending request and waits for running workers to finish."""
+        for key in list(self._callbacks):
+            self.cancel(key)
+        self.thread_pool.clear()
+        self.thread_pool.waitForDone(msecs)
+
+    def _on_task_done(self, key, generation, result, error):
+        if not self.is_current(key, generation):
+            return  # Stale result of a superseded or cancelled request
+        on_result, on_error = self._callbacks.pop(key, (None, None))
+        self.loading_changed.emit(key, False)
+        if error is not None:
+            logging.error(f"Background query '{key}' failed: {error}")
+            self.failed.emit(key, str(error))
+            if on_error:
+                on_error(error)
+        else:
+            self.finished.emit(key, result)
+            if on_result:
+                on_result(result)
@@ -0,0 +1,206 @@
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+
+class SalesTableModel(QAbstractTableModel):
+    """
+    Lazy table model showing the sales_data rows of the database.
+
+    Rows are loaded page by page as the view scrolls (canFetchMore/fetchMore), and only the ids of
+    loaded rows are kept for every row, in a compact integer array. The row values themselves are
+    kept in a bounded LRU cache of pages and re-read from SQLite by id when an evicted page is
+    displayed again, so memory and startup time do not grow with the size of the table.
+
+    Edited cells are kept in an overlay until they are saved, so they survive page eviction.
+
+    Attributes:
+        db_manager (DatabaseManager): The database the rows are read from.
+        headers (list): Column titles, in the order of the sales_data columns.
+        page_size (int): Number of rows fetched by each query.
+        max_cached_pages (int): Number of pages of row values kept in memory.
+    """
+    MAX_INCREMENTAL_RANGES = 64  # Above this number of removed row ranges, the view is reset once
+
+    def __init__(self, db_manager, headers, page_size=500, max_cached_pages=20, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.headers = list(headers)
+        self.page_size = page_size
+        self.max_cached_pages = max_cached_pages
+        self._ids = array('q')  # Id of every loaded row, in display (id) order
+        self._pages = OrderedDict()  # Page index -> {id: row tuple}, least recently used first
+        self._edits = {}  # Row id -> {column index: edited text}
+        self._exhausted = False
+
+    # -- QAbstractTableModel interface -------------------------------------------------
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and section < len(self.headers):
+            return self.headers[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        return self.cell_text(index.row(), index.column())
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and index.column() > 0:  # The id column is read-only
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole or index.column() == 0:
+            return False
+        row_id = self._ids[index.row()]
+        edits = self._edits.setdefault(row_id, {})
+        edits[index.column()] = str(value)
+        if edits[index.column()] == self.original_text(index.row(), index.column()):
+            del edits[index.column()]  # Edited back to the stored value
+            if not edits:
+                del self._edits[row_id]
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+        after_id = self._ids[-1] if self._ids else None
+        rows = self.db_manager.fetch_page(after_id=after_id, limit=self.page_size)
+        if len(rows) < self.page_size:
+            self._exhausted = True
+        if not rows:
+            return
+        first = len(self._ids)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._ids.extend(row[0] for row in rows)
+        self._cache_rows(rows)
+        self.endInsertRows()
+
+    # -- Row access ----------------------------------------------------------------------
+
+    def row_id(self, row):
+        """Returns the database id of a row."""
+        return self._ids[row]
+
+    def cell_text(self, row, column):
+        """Returns the displayed text of a cell, including unsaved edits."""
+        edits = self._edits.get(self._ids[row])
+        if edits and column in edits:
+            return edits[column]
+        return self.original_text(row, column)
+
+    def original_text(self, row, column):
+        """Returns the text of a cell as stored in the database."""
+        values = self._row_values(row)
+        return "" if values is None else str(values[column])
+
+    def edited_rows(self):
+        """Returns the sorted indexes of the rows holding unsaved edits."""
+        return sorted(self.row_of(row_id) for row_id in self._edits)
+
+    def row_of(self, row_id):
+        """Returns the row index of a loaded id (ids are kept sorted), or -1 if it is not loaded."""
+        row = bisect_left(self._ids, row_id)
+        return row if row < len(self._ids) and self._ids[row] == row_id else -1
+
+    def refresh_row(self, row):
+        """Forgets the unsaved edits and cached values of a row, which is then re-read from the database."""
+        self._edits.pop(self._ids[row], None)
+        self._pages.pop(row // self.page_size, None)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+
+    def reload(self):
+        """Drops every loaded row and unsaved edit; the view fetches the first page again."""
+        self.beginResetModel()
+        self._ids = array('q')
+        self._pages.clear()
+        self._edits.clear()
+        self._exhausted = False
+        self.endResetModel()
+
+    def remove_row(self, row):
+        """Removes a row from the model (after it has been deleted from the database)."""
+        self.remove_ids([self._ids[row]])
+
+    def remove_ids(self, ids):
+        """
+        Removes the rows of deleted ids from the model without reloading it.
+
+        Contiguous rows are removed as ranges; when the deleted rows are scattered over many
+        ranges, the remaining ids are kept and the view is reset once instead.
+        """
+        rows = sorted(row for row in (self.row_of(row_id) for row_id in set(ids)) if row >= 0)
+        if not rows:
+            return
+        ranges = []  # [first, last] ranges of contiguous rows
+        for row in rows:
+            if ranges and ranges[-1][1] == row - 1:
+                ranges[-1][1] = row
+            else:
+                ranges.append([row, row])
+        for row in rows:
+            self._edits.pop(self._ids[row], None)
+        # Pages are indexed by row position: the pages from the first removed row on have shifted
+        first_page = rows[0] // self.page_size
+        for page in [page for page in self._pages if page >= first_page]:
+            del self._pages[page]
+
+        if len(ranges) <= self.MAX_INCREMENTAL_RANGES:
+            for first, last in reversed(ranges):
+                self.beginRemoveRows(QModelIndex(), first, last)
+                del self._ids[first:last + 1]
+                self.endRemoveRows()
+        else:
+            removed = set(rows)
+            self.beginResetModel()
+            self._ids = array('q', (row_id for row, row_id in enumerate(self._ids) if row not in removed))
+            self.endResetModel()
+
+    def _row_values(self, row):
+        page = row // self.page_size
+        rows = self._pages.get(page)
+        if rows is None:
+            rows = self._load_page(page)
+        else:
+            self._pages.move_to_end(page)
+        return rows.get(self._ids[row])
+
+    def _load_page(self, page):
+        start = page * self.page_size
+        end = min(start + self.page_size, len(self._ids))
+        # Ids are sorted, so the page holds the first rows whose id is at least its first id
+        rows = self.db_manager.fetch_page(after_id=self._ids[start] - 1, limit=end - start)
+        return self._store_page(page, rows)
+
+    def _cache_rows(self, rows):
+        """Caches rows just appended by fetchMore, grouped by the page they belong to."""
+        first = len(self._ids) - len(rows)
+        pages = {}
+        for offset, row in enumerate(rows):
+            pages.setdefault((first + offset) // self.page_size, []).append(row)
+        for page, page_rows in pages.items():
+            if page in self._pages:
+                self._pages[page].update((row[0], row) for row in page_rows)
+            elif page * self.page_size >= first:  # The new rows cover the whole page
+                self._store_page(page, page_rows)
+
+    def _store_page(self, page, rows):
+        self._pages[page] = {row[0]: row for row in rows}
+        self._pages.move_to_end(page)
+        while len(self._pages) > self.max_cached_pages:
+            self._pages.popitem(last=False)
+        return self._pages[page]
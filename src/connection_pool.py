@@ -0,0 +1,138 @@
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+
+
+class _Lease:
+    """Thread-local token of a reader connection; the connection is released when it is collected."""
+    def __init__(self, connection):
+        self.connection = connection
+
+
+class ConnectionPool:
+    """
+    Hands out SQLite connections for a database file opened in WAL journal mode.
+
+    Every thread reading from the database gets its own read-only connection, so readers never
+    share a cursor and, thanks to WAL, never wait for a writer. All writes go through a single
+    writer connection protected by a lock, which serializes them without "database is locked" errors.
+
+    A reader connection is released when the thread-local state of its thread is cleared: when a
+    Python thread ends, and after every task of a QThreadPool worker. Released connections are kept
+    (up to max_idle) for the next thread instead of opening a new one, so short-lived worker threads
+    do not accumulate file handles.
+
+    Attributes:
+        db_filename (str): The path to the SQLite database file.
+        writer (sqlite3.Connection): The connection used for every write.
+    """
+    def __init__(self, db_filename, busy_timeout=5000, max_idle=4):
+        self.db_filename = db_filename
+        self.busy_timeout = busy_timeout
+        self.max_idle = max_idle
+        self.writer = self._connect()
+        self.writer.execute("PRAGMA journal_mode = WAL")
+        self.writer.execute("PRAGMA synchronous = NORMAL")  # Durable enough in WAL mode, one fsync per checkpoint
+        self._write_lock = threading.RLock()
+        # PRAGMA data_version est propre à chaque connexion : une seule connexion le lit pour tous les threads
+        self._monitor = self._connect()
+        self._monitor.execute("PRAGMA query_only = ON")
+        self._monitor_lock = threading.Lock()
+        self._local = threading.local()
+        self._readers = set()  # Every open reader connection, leased or idle
+        self._idle = []  # Released reader connections, reused before opening new ones
+        self._readers_lock = threading.Lock()
+        self._closed = False
+        self.write_count = 0  # Number of committed write transactions
+
+    def _connect(self):
+        # check_same_thread=False: the writer is shared behind a lock, and released readers are reused by other threads
+        connection = sqlite3.connect(self.db_filename, check_same_thread=False, timeout=self.busy_timeout / 1000)
+        connection.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)}")
+        return connection
+
+    def reader(self):
+        """Returns the read-only connection of the calling thread, opening it on first use."""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed connection pool.")
+        lease = getattr(self._local, "lease", None)
+        if lease is None:
+            with self._readers_lock:
+                connection = self._idle.pop() if self._idle else None
+            if connection is None:
+                connection = self._connect()
+                connection.execute("PRAGMA query_only = ON")
+                with self._readers_lock:
+                    self._readers.add(connection)
+            lease = self._local.lease = _Lease(connection)
+            weakref.finalize(lease, self._release, connection)
+        return lease.connection
+
+    def _release(self, connection):
+        # Appelé quand l'état local du thread est effacé : le thread ne lit plus sur cette connexion
+        with self._readers_lock:
+            if not self._closed and len(self._idle) < self.max_idle:
+                self._idle.append(connection)
+                return
+            self._readers.discard(connection)
+        connection.close()
+
+    def reader_count(self):
+        """Returns the number of open reader connections, leased or idle."""
+        with self._readers_lock:
+            return len(self._readers)
+
+    @contextmanager
+    def write_lock(self):
+        """Gives exclusive access to the writer connection for the duration of the block."""
+        with self._write_lock:
+            yield self.writer
+
+    @contextmanager
+    def transaction(self):
+        """
+        Runs the block in a write transaction and yields a cursor of the writer connection.
+
+        The transaction is committed when the block ends and rolled back if it raises.
+        """
+        with self._write_lock:
+            cursor = self.writer.cursor()
+            self.writer.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+            except BaseException:
+                self.writer.rollback()
+                raise
+            else:
+                self.writer.commit()
+                self.write_count += 1
+            finally:
+                cursor.close()
+
+    def data_version(self):
+        """
+        Returns a value that changes whenever the database content may have changed.
+
+        It combines the number of transactions committed through this pool with SQLite's
+        PRAGMA data_version, read on a dedicated monitor connection, where it changes after every
+        commit of another connection (the writer or another process). The pragma is counted per
+        connection, so every thread reads the same one and gets the same value for unchanged data.
+        Neither read takes the write lock, so it never waits for a write transaction in progress.
+        """
+        write_count = self.write_count
+        with self._monitor_lock:
+            return write_count, self._monitor.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self):
+        """Closes the writer and every reader connection."""
+        self._closed = True
+        with self._readers_lock:
+            for connection in self._readers:
+                connection.close()
+            self._readers.clear()
+            self._idle.clear()
+        with self._monitor_lock:
+            self._monitor.close()
+        with self._write_lock:
+            self.writer.close()
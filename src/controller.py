@@ -1,19 +1,27 @@
 import locale
 import logging
+import os
 
-from PySide6.QtWidgets import QMainWindow, QMessageBox, QGraphicsScene
-from matplotlib import pyplot as plt
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QMainWindow, QMessageBox, QDialog
 
 from ui.ui_main import Ui_MainWindow
 from components.form_manager import FormManager
 from components.table_manager import TableManager
 from database import DatabaseManager
 from components.kpi_window import KPIManager
-import pandas as pd
-from PySide6.QtGui import QImage, QIcon
-from matplotlib.backends.backend_agg import FigureCanvasAgg
+from components.query_executor import QueryExecutor
+from components.delete_filter_dialog import DeleteFilterDialog
+from components.chart_backends import CHART_BACKENDS
+from PySide6.QtGui import QIcon, QAction, QKeySequence
+from prewarm import DEFERRED_MODULES, prewarm
 
 
+# Graphique affiché dans chaque QGraphicsView : (type de graphique, nom de la vue)
+CHART_VIEWS = (("revenue", "graphicsView"), ("costs", "graphicsView_2"))
+# Backend de graphiques au démarrage ('matplotlib' ou 'qtcharts'), modifiable par le menu contextuel des graphiques
+DEFAULT_CHART_BACKEND = os.environ.get("SALES_CHART_BACKEND", "matplotlib")
+
 # Set the locale to support thousands' separator
 locale.setlocale(locale.LC_ALL, '')
 
@@ -32,9 +40,15 @@ class MainWindowController(QMainWindow):
 
         # Initialize database and managers
         self.db_manager = DatabaseManager()
+        self.query_executor = QueryExecutor(self)  # Runs database queries off the GUI thread
+        self.query_executor.loading_changed.connect(self.show_loading_state)
         self.form_manager = FormManager(self.ui)
         self.table_manager = TableManager(self.ui.data_tb_wgt, self.db_manager)
-        self.kpi_manager = KPIManager(self.db_manager)  # Assuming db_manager is initialized
+        self.kpi_manager = KPIManager(self.db_manager, self.query_executor)  # Assuming db_manager is initialized
+        self.chart_backends = {}  # Nom -> backend de graphiques déjà utilisé (garde ses graphiques persistants)
+        self.chart_backend = None
+        self.charts_shown = False
+        self.set_chart_backend(DEFAULT_CHART_BACKEND)
 
         # Setup table with headers
         headers = ['ID', 'Filiale Name', 'Country', 'Date', 'Revenue €', 'Costs €', 'Volume', 'Clients',
@@ -46,11 +60,50 @@ class MainWindowController(QMainWindow):
         self.ui.add_btn.clicked.connect(self.add_data)
         self.ui.save_btn.clicked.connect(self.table_manager.update_all_rows)
         self.ui.delete_btn.clicked.connect(self.delete_selected_data)
+        self.setup_table_actions()
+        self.setup_chart_actions()
         self.ui.gen_repport_btn.clicked.connect(self.update_display)
         self.ui.kpi_btn.clicked.connect(self.kpi_manager.show)
         self.ui.image_upload_btn.clicked.connect(self.update_graphics_views)
+        self.ui.save_btn.clicked.connect(self.refresh_charts)  # Après update_all_rows, connecté avant
         # Initialize display with data
         self.update_display()
+    def setup_table_actions(self):
+        """
+        Adds the delete actions to the context menu of the data table.
+        """
+        delete_selected_action = QAction("Delete selected rows", self.ui.data_tb_wgt)
+        delete_selected_action.setShortcut(QKeySequence.Delete)
+        delete_selected_action.setShortcutContext(Qt.WidgetShortcut)  # Only while the table has focus
+        delete_selected_action.triggered.connect(self.delete_selected_data)
+        delete_filtered_action = QAction("Delete by filter...", self.ui.data_tb_wgt)
+        delete_filtered_action.triggered.connect(self.delete_filtered_data)
+        self.ui.data_tb_wgt.addActions([delete_selected_action, delete_filtered_action])
+        self.ui.data_tb_wgt.setContextMenuPolicy(Qt.ActionsContextMenu)
+
+    def setup_chart_actions(self):
+        """
+        Adds the choice of the chart backend to the context menu of the graphics views.
+        """
+        self.native_charts_action = QAction("Native charts (QtCharts)", self)
+        self.native_charts_action.setCheckable(True)
+        self.native_charts_action.setChecked(self.chart_backend.name == "qtcharts")
+        self.native_charts_action.toggled.connect(
+            lambda native: self.set_chart_backend("qtcharts" if native else "matplotlib"))
+        for _, view_name in CHART_VIEWS:
+            view = getattr(self.ui, view_name)
+            view.addAction(self.native_charts_action)
+            view.setContextMenuPolicy(Qt.ActionsContextMenu)
+
+    def prewarm_imports(self):
+        """
+        Imports in the background the modules deferred until the first KPI, chart or PDF (see prewarm.py).
+        """
+        modules = DEFERRED_MODULES
+        if self.chart_backend.name != "matplotlib":
+            modules = tuple(name for name in modules if name != "components.chart_renderer")
+        return prewarm(modules)
+
     def show_kpi(self):
         """
         Displays the KPI Manager widget.
@@ -59,13 +112,19 @@ class MainWindowController(QMainWindow):
 
     def update_display(self):
         """
-        Fetches current data and updates the UI display with formatted numbers.
+        Fetches current totals in the background (from the snapshot cache shared with the KPI window);
+        show_totals updates the UI when they arrive.
         """
-        df = pd.read_sql_query("SELECT * FROM sales_data", self.db_manager.connection)
-        if not df.empty:
-            total_revenue = df['monthly_revenue'].sum()
-            total_costs = df['monthly_costs'].sum()
-            net_income = total_revenue - total_costs - df['advertising_costs'].sum()
+        self.query_executor.submit("totals", self.kpi_manager.fetch_totals, on_result=self.show_totals)
+
+    def show_totals(self, totals):
+        """
+        Updates the UI display with formatted numbers.
+        """
+        if totals:
+            total_revenue = totals['monthly_revenue']
+            total_costs = totals['monthly_costs']
+            net_income = totals['net_income']
 
             # Format the values with thousands separator and two decimal points
             self.ui.revenue_lb_2.setText(locale.format_string("%0.2f €", total_revenue, grouping=True))
@@ -86,6 +145,7 @@ class MainWindowController(QMainWindow):
                 self.db_manager.add_entry(**data)
                 self.table_manager.load_data()
                 self.form_manager.reset_inputs()
+                self.refresh_charts()
                 logging.info(f"Added data: {data}")
             except Exception as e:
                 logging.error(f"Failed to add data: {data}, error: {e}")
@@ -95,36 +155,97 @@ class MainWindowController(QMainWindow):
 
     def delete_selected_data(self):
         """
-        Asks for confirmation before deleting the selected row in the table.
+        Asks for confirmation before deleting the selected rows in the table.
         """
-        row_index = self.ui.data_tb_wgt.currentRow()
-        if row_index != -1:
-            reply = QMessageBox.question(self, 'Confirm Delete', 'Are you sure you want to delete this row?', QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        rows = self.table_manager.selected_rows()
+        if rows:
+            reply = QMessageBox.question(self, 'Confirm Delete', f'Are you sure you want to delete {len(rows)} row(s)?', QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
             if reply == QMessageBox.Yes:
-                self.table_manager.delete_row(row_index)
-                QMessageBox.information(self, "Deletion", "The row has been successfully deleted.")
+                deleted = self.table_manager.delete_rows(rows)
+                self.refresh_charts()
+                self.statusBar().showMessage(f"{deleted} row(s) have been successfully deleted.", 5000)
             else:
-                QMessageBox.information(self, "Cancellation", "Deletion cancelled.")
+                self.statusBar().showMessage("Deletion cancelled.", 5000)
+
+    def delete_filtered_data(self):
+        """
+        Asks for filters (country, filiale, date range) and deletes every matching row after confirmation.
+        """
+        dialog = DeleteFilterDialog(self)
+        if dialog.exec() != QDialog.Accepted:
+            return
+        filters = dialog.filters()
+        if not filters:
+            QMessageBox.warning(self, "Delete by filter", "Please enter at least one filter.")
+            return
+        description = ", ".join(f"{key} = {value}" for key, value in filters.items())
+        reply = QMessageBox.question(self, 'Confirm Delete', f'Delete every row matching {description}?', QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if reply == QMessageBox.Yes:
+            deleted = self.table_manager.delete_by_filter(filters)
+            self.refresh_charts()
+            self.statusBar().showMessage(f"{deleted} row(s) have been successfully deleted.", 5000)
+
+    def show_loading_state(self, key, loading):
+        """
+        Shows a per-view loading state while a background query is running.
+        """
+        if key == "totals":
+            self.ui.gen_repport_btn.setEnabled(not loading)
+            if loading:
+                for label in (self.ui.revenue_lb_2, self.ui.costs_lb_2, self.ui.income_lb):
+                    label.setText("Loading...")
+        elif key == "charts":
+            self.ui.image_upload_btn.setEnabled(not loading)
 
     def update_graphics_views(self):
-        revenue_pixmap = self.kpi_manager.create_revenue_graph()
-        if revenue_pixmap:
-            scene = QGraphicsScene()
-            scene.addPixmap(revenue_pixmap)
-            self.ui.graphicsView.setScene(scene)
-
-        costs_pixmap = self.kpi_manager.create_costs_graph()
-        if costs_pixmap:
-            scene2 = QGraphicsScene()
-            scene2.addPixmap(costs_pixmap)
-            self.ui.graphicsView_2.setScene(scene2)
-        else:
-            print("Failed to create costs graph.")
+        """
+        Prepares the charts in the background with the selected chart backend; show_graphics displays them.
+        """
+        self.query_executor.submit("charts", self.prepare_charts, self.chart_backend, on_result=self.show_graphics)
 
+    def prepare_charts(self, backend):
+        """
+        Prepares the chart of every graphics view (runs in a worker thread, must not touch widgets).
+        """
+        return backend, [backend.prepare(self.kpi_manager, kind) for kind, _ in CHART_VIEWS]
+
+    def show_graphics(self, prepared):
+        """
+        Shows the revenue and costs charts prepared by prepare_charts in the graphics views.
+        """
+        backend, charts = prepared
+        if backend is not self.chart_backend:
+            return  # Backend changé pendant la préparation : un nouveau rendu est déjà demandé
+        for (kind, view_name), chart in zip(CHART_VIEWS, charts):
+            if chart is None:
+                print(f"Failed to create {kind} graph.")
+            else:
+                backend.show(getattr(self.ui, view_name), kind, chart)
+        self.charts_shown = True
+
+    def set_chart_backend(self, name):
+        """
+        Selects the chart backend ('matplotlib' or 'qtcharts', see CHART_BACKENDS) and redraws the charts.
+        """
+        if name not in CHART_BACKENDS:
+            raise ValueError(f"Unknown chart backend: '{name}'")
+        if name not in self.chart_backends:
+            self.chart_backends[name] = CHART_BACKENDS[name]()
+        self.chart_backend = self.chart_backends[name]
+        self.refresh_charts()
+
+    def refresh_charts(self):
+        """
+        Redraws the charts after a data edit, once they have been displayed.
+        """
+        if self.charts_shown:
+            self.update_graphics_views()
 
     def closeEvent(self, event):
         """
-        Ensures database connections are closed when the application is closed.
+        Ensures background queries are stopped and database connections are closed when the application is closed.
         """
+        self.query_executor.shutdown()
+        self.kpi_manager.shutdown_workers()
         self.db_manager.close()
         super().closeEvent(event)
@@ -1,18 +1,72 @@
+import json
 import os
 import sqlite3
+from itertools import islice
+
+from migrations import migrate, normalize_date
+from rollups import rebuild_rollups
+from connection_pool import ConnectionPool
+from snapshot_cache import SnapshotCache
+from kpi_catalog import KPI_CATALOG, KPI_DIMENSIONS, metric_sql, rollup_compatible
+
+# Insertable columns of sales_data, in the order expected by add_entry/add_entries
+SALES_COLUMNS = (
+    "filiale_name", "country", "date", "monthly_revenue", "monthly_costs",
+    "sales_volume", "new_clients", "satisfaction_rate", "advertising_costs",
+)
+DATE_INDEX = SALES_COLUMNS.index("date")
+
+# Numeric columns that can be summed by the aggregation queries
+MEASURE_COLUMNS = (
+    "monthly_revenue", "monthly_costs", "sales_volume", "new_clients", "satisfaction_rate", "advertising_costs",
+)
+
+# Time buckets of the 'YYYY-MM-DD' dates, as SQL expressions of a date column: 'YYYY-MM', 'YYYY-Qn' and 'YYYY'
+PERIOD_SQL = {
+    "date": "{date}",
+    "month": "substr({date}, 1, 7)",
+    "quarter": "CASE WHEN {date} = '' THEN '' "
+               "ELSE substr({date}, 1, 4) || '-Q' || ((CAST(substr({date}, 6, 2) AS INTEGER) + 2) / 3) END",
+    "year": "substr({date}, 1, 4)",
+}
+
+# Filter keys that the kpi_country_date rollup can answer, as it keeps the sums per (country, date)
+ROLLUP_FILTER_KEYS = frozenset(("country", "date", "date_from", "date_to"))
+
+# Rollup tables that can rank groups, with the group and filter keys each of them can answer
+RANKING_ROLLUPS = (
+    ("kpi_country", frozenset(("country",))),
+    ("kpi_filiale", frozenset(("filiale_name", "country"))),
+    ("kpi_country_date", ROLLUP_FILTER_KEYS),
+)
+
+# Default of fetch_page's after_value: distinguishes "not given" from a NULL key (None)
+_NO_VALUE = object()
+
+
+def filters_key(filters):
+    """Returns a hashable key of a filters dict that does not depend on the order of its keys or values."""
+    return tuple(sorted(
+        (column, tuple(sorted(value)) if isinstance(value, (list, tuple, set, frozenset)) else value)
+        for column, value in (filters or {}).items()))
+
 
 class DatabaseManager:
     """
     A singleton class to manage database operations for a sales application.
 
-    This class ensures that only one instance of the database connection is created,
+    This class ensures that only one instance of the database manager is created,
     using the Singleton design pattern. It provides methods to interact with the
     database, such as adding, fetching, updating, and deleting records.
 
+    Reads use a per-thread connection and writes are serialized through a single writer
+    connection (see ConnectionPool), so the methods can be called from background threads.
+
     Attributes:
         db_filename (str): The path to the SQLite database file.
-        connection (sqlite3.Connection): The SQLite connection object.
-        cursor (sqlite3.Cursor): The cursor object used to execute SQL commands.
+        pool (ConnectionPool): The WAL-mode pool providing reader and writer connections.
+        connection (sqlite3.Connection): The writer connection of the pool.
+        snapshots (SnapshotCache): Data loaded for the KPI views, shared until the data changes.
     """
 
     _instance = None  # Singleton instance
@@ -21,30 +75,24 @@ class DatabaseManager:
         if not cls._instance:
             cls._instance = super(DatabaseManager, cls).__new__(cls)
             cls._instance.db_filename = os.path.join(os.path.abspath(os.path.dirname(__file__)), db_path)
-            cls._instance.connection = sqlite3.connect(cls._instance.db_filename, check_same_thread=False)
-            cls._instance.cursor = cls._instance.connection.cursor()
+            cls._instance.pool = ConnectionPool(cls._instance.db_filename)
+            cls._instance.connection = cls._instance.pool.writer
+            cls._instance.snapshots = SnapshotCache(cls._instance)
             cls._instance.initialize_database()
         return cls._instance
 
     def initialize_database(self):
         """
-        Creates the sales_data table in the database if it does not exist.
-        """
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS sales_data (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                filiale_name TEXT,
-                country TEXT,
-                date TEXT,
-                monthly_revenue REAL,
-                monthly_costs REAL,
-                sales_volume INTEGER,
-                new_clients INTEGER,
-                satisfaction_rate INTEGER,
-                advertising_costs REAL
-            );
-        """)
-        self.connection.commit()
+        Creates the sales_data table if it does not exist and applies pending schema migrations.
+        """
+        with self.pool.write_lock() as connection:
+            migrate(connection)
+
+    def data_version(self):
+        """
+        Returns a value that changes after every write to the database (see ConnectionPool.data_version).
+        """
+        return self.pool.data_version()
 
     def add_entry(self, filiale_name, country, date, monthly_revenue, monthly_costs, sales_volume, new_clients,
                   satisfaction_rate, advertising_costs):
@@ -52,48 +100,488 @@ class DatabaseManager:
         Adds a new entry to the sales_data table.
         """
         try:
-            self.connection.execute("BEGIN")
-            self.cursor.execute("""
-                INSERT INTO sales_data (filiale_name, country, date, monthly_revenue, monthly_costs, sales_volume, new_clients, satisfaction_rate, advertising_costs)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (filiale_name, country, date, monthly_revenue, monthly_costs, sales_volume, new_clients, satisfaction_rate, advertising_costs))
-            self.connection.commit()
+            with self.pool.transaction() as cursor:
+                cursor.execute("""
+                    INSERT INTO sales_data (filiale_name, country, date, monthly_revenue, monthly_costs, sales_volume, new_clients, satisfaction_rate, advertising_costs)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (filiale_name, country, normalize_date(date), monthly_revenue, monthly_costs, sales_volume, new_clients, satisfaction_rate, advertising_costs))
         except sqlite3.Error as e:
             print(f"An error occurred: {e}")
-            self.connection.rollback()
+
+    def add_entries(self, entries, batch_size=1000):
+        """
+        Adds many entries to the sales_data table using batched executemany calls.
+
+        Each batch of ``batch_size`` rows is written inside its own transaction, so a large
+        import costs one commit per batch instead of one commit per row. If a batch fails,
+        that batch is rolled back and the error is raised; batches already committed are kept.
+
+        Args:
+            entries (iterable): Rows to insert, either dicts keyed by column name or
+                sequences ordered like SALES_COLUMNS.
+            batch_size (int): Number of rows written per transaction.
+
+        Returns:
+            int: The number of rows inserted.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        query = (f"INSERT INTO sales_data ({', '.join(SALES_COLUMNS)}) "
+                 f"VALUES ({', '.join('?' * len(SALES_COLUMNS))})")
+        rows = (self._entry_values(entry) for entry in entries)
+        inserted = 0
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            try:
+                with self.pool.transaction() as cursor:
+                    cursor.executemany(query, batch)
+            except sqlite3.Error as e:
+                print(f"Bulk insert error: {e}")
+                raise
+            inserted += len(batch)
+        return inserted
+
+    @staticmethod
+    def _entry_values(entry):
+        """Returns the values of an entry as a tuple ordered like SALES_COLUMNS."""
+        if isinstance(entry, dict):
+            values = [entry[column] for column in SALES_COLUMNS]
+        else:
+            values = list(entry)
+            if len(values) != len(SALES_COLUMNS):
+                raise ValueError(f"Expected {len(SALES_COLUMNS)} values per entry, got {len(values)}")
+        values[DATE_INDEX] = normalize_date(values[DATE_INDEX])
+        return tuple(values)
 
     def fetch_all(self):
         """
         Fetches all entries from the sales_data table.
         """
-        self.cursor.execute("SELECT * FROM sales_data")
-        return self.cursor.fetchall()
+        return self.pool.reader().execute("SELECT * FROM sales_data").fetchall()
+
+    def fetch_page(self, after_id=None, limit=500, order_by="id", filters=None, after_value=_NO_VALUE):
+        """
+        Fetches one page of sales_data rows using keyset pagination.
+
+        Instead of OFFSET, the next page starts after the last row of the previous one, so every
+        page costs the same whatever its position and the ordering stays stable while rows are
+        added or deleted.
+
+        Args:
+            after_id (int): Id of the last row of the previous page, or None for the first page.
+            limit (int): Maximum number of rows returned.
+            order_by (str): 'id' or a column of SALES_COLUMNS. Rows are sorted by that column then by id.
+            filters (dict): Optional {column: value} equality filters; a list, tuple or set value
+                matches any of its elements. 'date_from' and 'date_to' select an inclusive date range.
+            after_value (object): Value of ``order_by`` in the last row of the previous page
+                (required when ``order_by`` is not 'id' and ``after_id`` is given, ValueError
+                otherwise). NULL values sort first, so None continues through the remaining NULL
+                rows then every non-NULL one.
+
+        Returns:
+            list: Up to ``limit`` row tuples, in the same column order as fetch_all.
+        """
+        if order_by != "id" and order_by not in SALES_COLUMNS:
+            raise ValueError(f"Unknown ordering column: '{order_by}'")
+        if order_by != "id" and after_id is not None and after_value is _NO_VALUE:
+            raise ValueError(f"after_value is required to page after a row ordered by '{order_by}'")
+        conditions, params = self._filter_conditions(filters)
+        if after_id is not None:
+            if order_by == "id":
+                conditions.append("id > ?")
+                params.append(after_id)
+            elif after_value is None:
+                # Les NULL sont triés en premier et toute comparaison avec NULL est NULL : après une
+                # ligne à NULL viennent les autres NULL d'id supérieur, puis toutes les valeurs non NULL
+                conditions.append(f"({order_by} IS NOT NULL OR id > ?)")
+                params.append(after_id)
+            else:
+                conditions.append(f"({order_by}, id) > (?, ?)")
+                params.extend([after_value, after_id])
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        order = "id" if order_by == "id" else f"{order_by}, id"
+        return self.pool.reader().execute(
+            f"SELECT * FROM sales_data{where} ORDER BY {order} LIMIT ?", (*params, int(limit))).fetchall()
+
+    def iter_rows(self, batch_size=1000, order_by="id", filters=None):
+        """
+        Yields every matching sales_data row, fetching them page by page with fetch_page.
+
+        Only one batch is held in memory at a time, whatever the size of the table.
+        """
+        key_index = 0 if order_by == "id" else SALES_COLUMNS.index(order_by) + 1
+        after_id = after_value = None
+        while True:
+            page = self.fetch_page(after_id, batch_size, order_by, filters, after_value)
+            yield from page
+            if len(page) < batch_size:
+                break
+            after_id, after_value = page[-1][0], page[-1][key_index]
+
+    @staticmethod
+    def _filter_conditions(filters):
+        """
+        Returns the SQL conditions and parameters of {column: value} equality filters.
+
+        A list of values selects any of them. The 'date_from' and 'date_to' keys select an inclusive
+        date range, and the 'min_<measure>' and 'max_<measure>' keys an inclusive range of a
+        MEASURE_COLUMNS column. Every value is passed as a parameter.
+        """
+        conditions, params = [], []
+        for column, value in (filters or {}).items():
+            if column in ("date_from", "date_to"):
+                conditions.append("date >= ?" if column == "date_from" else "date <= ?")
+                params.append(normalize_date(value))
+                continue
+            if column[:4] in ("min_", "max_") and column[4:] in MEASURE_COLUMNS:
+                conditions.append(f"{column[4:]} {'>=' if column[:4] == 'min_' else '<='} ?")
+                params.append(float(value))
+                continue
+            if column != "id" and column not in SALES_COLUMNS:
+                raise ValueError(f"Unknown filter column: '{column}'")
+            if isinstance(value, (list, tuple, set, frozenset)):
+                values = list(value)
+                conditions.append(f"{column} IN ({', '.join('?' * len(values))})" if values else "0")
+                params.extend(values)
+            else:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        return conditions, params
+
+    def _kpi_source(self, filters):
+        """
+        Returns the table holding the rows selected by filters for country/date aggregates, the
+        expression counting them, and the WHERE clause and parameters selecting them.
+
+        Filters on countries and dates are answered by the kpi_country_date rollup; other filters
+        (filiales, measure thresholds) are pushed down to an index-backed query of sales_data.
+        """
+        if set(filters or ()) <= ROLLUP_FILTER_KEYS:
+            conditions, params = self._rollup_conditions(filters)
+            where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+            return "kpi_country_date", "CAST(TOTAL(row_count) AS INTEGER)", where, params
+        conditions, params = self._filter_conditions(filters)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return "sales_data", "COUNT(*)", where, params
+
+    def _rollup_conditions(self, filters):
+        """
+        Returns the conditions of filters on a rollup table. The rollups store missing dates as '',
+        which a date range must exclude like the NULL dates of sales_data.
+        """
+        conditions, params = self._filter_conditions(filters)
+        if {"date_from", "date_to"} & set(filters or ()):
+            conditions.append("date != ''")
+        return conditions, params
+
+    def fetch_totals(self, filters=None):
+        """
+        Reads the revenue, costs, advertising costs and net income of the rows selected by filters,
+        from the kpi_totals rollup when there is no filter.
+
+        Returns:
+            dict or None: The totals keyed by column name plus 'net_income' and 'row_count',
+            or None if no row is selected.
+        """
+        if not filters:
+            row = self.pool.reader().execute("""
+                SELECT row_count, monthly_revenue, monthly_costs, advertising_costs,
+                       monthly_revenue - monthly_costs - advertising_costs
+                FROM kpi_totals
+            """).fetchone()
+        else:
+            source, count, where, params = self._kpi_source(filters)
+            row = self.pool.reader().execute(f"""
+                SELECT {count}, TOTAL(monthly_revenue), TOTAL(monthly_costs), TOTAL(advertising_costs),
+                       TOTAL(monthly_revenue) - TOTAL(monthly_costs) - TOTAL(advertising_costs)
+                FROM {source}{where}
+            """, params).fetchone()
+        if row is None or not row[0]:
+            return None
+        row_count, revenue, costs, advertising_costs, net_income = row
+        return {
+            "row_count": row_count,
+            "monthly_revenue": revenue,
+            "monthly_costs": costs,
+            "advertising_costs": advertising_costs,
+            "net_income": net_income,
+        }
+
+    def fetch_sum_by_country(self, column, filters=None):
+        """
+        Sums a numeric column per country, read from the kpi_country rollup when there is no filter.
+
+        Args:
+            column (str): One of MEASURE_COLUMNS.
+            filters (dict): Row filters, as accepted by fetch_page.
+
+        Returns:
+            list: (country, sum) tuples ordered by country.
+        """
+        if not filters:
+            return self._fetch_rollup_sum("kpi_country", "country", column)
+        if column not in MEASURE_COLUMNS:
+            raise ValueError(f"Unknown measure column: '{column}'")
+        source, _, where, params = self._kpi_source(filters)
+        return self.pool.reader().execute(
+            f"SELECT IFNULL(country, ''), TOTAL({column}) FROM {source}{where} GROUP BY 1 ORDER BY 1", params).fetchall()
+
+    def fetch_sum_by_filiale(self, column):
+        """
+        Sums a numeric column per filiale, read from the kpi_filiale rollup.
+
+        Args:
+            column (str): One of MEASURE_COLUMNS.
+
+        Returns:
+            list: (filiale_name, country, sum) tuples ordered by filiale then country.
+        """
+        return self._fetch_rollup_sum("kpi_filiale", "filiale_name, country", column)
+
+    def _fetch_rollup_sum(self, table, keys, column):
+        if column not in MEASURE_COLUMNS:
+            raise ValueError(f"Unknown measure column: '{column}'")
+        return self.pool.reader().execute(f"SELECT {keys}, {column} FROM {table} ORDER BY {keys}").fetchall()
+
+    def fetch_net_income_by_country_date(self, order_by="country"):
+        """
+        Reads the net income per (country, date) group from the kpi_country_date rollup.
+
+        Args:
+            order_by (str): 'country' to return (country, date, net_income) rows sorted by country
+                then date, or 'date' to return (date, country, net_income) rows sorted by date then country.
+
+        Returns:
+            list: One tuple per group.
+        """
+        return self.fetch_net_income_by_period("date", order_by)
+
+    def fetch_net_income_by_period(self, period="month", order_by="country", rolling_months=None, filters=None):
+        """
+        Aggregates the net income per country and time bucket from the kpi_country_date rollup.
+
+        Args:
+            period (str): 'date' (one bucket per date), 'month' ('YYYY-MM'), 'quarter' ('YYYY-Qn')
+                or 'year' ('YYYY').
+            order_by (str): 'country' to return (country, period, net_income) rows sorted by country
+                then period, or 'date' to return (period, country, net_income) rows sorted by period then country.
+            rolling_months (int): If set, the net income of each month is summed with the previous
+                months of the same country over a window of rolling_months calendar months.
+                Only valid with the 'month' period.
+            filters (dict): Row filters, as accepted by fetch_page.
+
+        Returns:
+            list: One tuple per group.
+        """
+        if period not in PERIOD_SQL:
+            raise ValueError(f"Unknown period: '{period}'")
+        if order_by == "country":
+            dimensions = "country, period"
+        elif order_by == "date":
+            dimensions = "period, country"
+        else:
+            raise ValueError(f"Unknown ordering: '{order_by}'")
+        net_income = "net_income"
+        if rolling_months is not None:
+            if period != "month" or int(rolling_months) < 1:
+                raise ValueError("A rolling window needs the 'month' period and at least one month")
+            # Months are numbered so that the window covers calendar months, even when some have no data
+            net_income = (f"SUM(net_income) OVER (PARTITION BY country "
+                          f"ORDER BY CAST(substr(period, 1, 4) AS INTEGER) * 12 + CAST(substr(period, 6, 2) AS INTEGER) "
+                          f"RANGE BETWEEN {int(rolling_months) - 1} PRECEDING AND CURRENT ROW)")
+        source, _, where, params = self._kpi_source(filters)
+        return self.pool.reader().execute(f"""
+            WITH buckets AS (
+                SELECT IFNULL(country, '') AS country, {PERIOD_SQL[period].format(date="IFNULL(date, '')")} AS period,
+                       TOTAL(IFNULL(monthly_revenue, 0) - IFNULL(monthly_costs, 0) - IFNULL(advertising_costs, 0))
+                           AS net_income
+                FROM {source}{where}
+                GROUP BY 1, 2
+            )
+            SELECT {dimensions}, {net_income}
+            FROM buckets
+            ORDER BY {dimensions}
+        """, params).fetchall()
+
+    def fetch_kpis(self, group_by=("country",), period=None, metrics=None, filters=None):
+        """
+        Computes the metrics of the KPI catalog per group with a single SQL statement (one scan).
+
+        Args:
+            group_by (sequence): Dimensions among KPI_DIMENSIONS ('country', 'filiale_name').
+            period (str): If set, the rows are also grouped by a PERIOD_SQL time bucket.
+            metrics (sequence): Names of KPI_CATALOG metrics (all of them by default).
+            filters (dict): Row filters, as accepted by fetch_page.
+
+        Returns:
+            list: (group values..., [period,] metric values...) tuples sorted by group. Missing
+            dimension values are grouped as '', and a ratio whose denominator sums to 0 is None.
+        """
+        metrics = list(KPI_CATALOG) if metrics is None else list(metrics)
+        for metric in metrics:
+            if metric not in KPI_CATALOG:
+                raise ValueError(f"Unknown metric: '{metric}'")
+        groups = self._kpi_groups(group_by)
+        if period is not None:
+            if period not in PERIOD_SQL:
+                raise ValueError(f"Unknown period: '{period}'")
+            groups.append(PERIOD_SQL[period].format(date="IFNULL(date, '')"))
+        conditions, params = self._filter_conditions(filters)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        group = f" GROUP BY {', '.join(groups)} ORDER BY {', '.join(groups)}" if groups else ""
+        columns = ", ".join(groups + [metric_sql(metric) for metric in metrics])
+        return self.pool.reader().execute(f"SELECT {columns} FROM sales_data{where}{group}", params).fetchall()
+
+    def fetch_top_kpis(self, metric, n=10, group_by=("filiale_name", "country"), ascending=False, filters=None):
+        """
+        Ranks the groups by a KPI_CATALOG metric and returns the first n, e.g. the 20 filiales with
+        the largest net income of a quarter (with a date range filter) or the 10 lowest satisfactions.
+
+        SQLite evaluates ORDER BY ... LIMIT with a sorter holding only n rows. Metrics that can be
+        read from the rollups (see kpi_catalog.rollup_compatible) are ranked over the smallest rollup
+        table answering the groups and filters, so the cost follows the number of groups rather than
+        of rows; the others aggregate sales_data through its indexes.
+
+        Args:
+            metric (str): Name of a KPI_CATALOG metric.
+            n (int): Number of groups returned.
+            group_by (sequence): Dimensions among KPI_DIMENSIONS.
+            ascending (bool): Return the smallest values first instead of the largest.
+            filters (dict): Row filters, as accepted by fetch_page.
+
+        Returns:
+            list: (group values..., value) tuples, best first; ties are ordered by group. Groups
+            whose value is NULL (a ratio with a zero denominator) are not ranked.
+        """
+        if metric not in KPI_CATALOG:
+            raise ValueError(f"Unknown metric: '{metric}'")
+        groups = self._kpi_groups(group_by)
+        source = "sales_data"
+        if rollup_compatible(metric):
+            needed = set(group_by) | set(filters or ())
+            source = next((table for table, keys in RANKING_ROLLUPS if needed <= keys), source)
+        if source == "sales_data":
+            conditions, params = self._filter_conditions(filters)
+        else:
+            conditions, params = self._rollup_conditions(filters)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        group = f" GROUP BY {', '.join(groups)}" if groups else ""
+        order = ", ".join([f"value {'ASC' if ascending else 'DESC'}"] + groups)
+        return self.pool.reader().execute(f"""
+            SELECT {', '.join(groups + [metric_sql(metric) + ' AS value'])}
+            FROM {source}{where}{group}
+            HAVING value IS NOT NULL
+            ORDER BY {order}
+            LIMIT ?
+        """, params + [int(n)]).fetchall()
+
+    @staticmethod
+    def _kpi_groups(group_by):
+        """Returns the SQL expressions of the KPI_DIMENSIONS to group by (missing values grouped as '')."""
+        groups = []
+        for dimension in group_by:
+            if dimension not in KPI_DIMENSIONS:
+                raise ValueError(f"Unknown dimension: '{dimension}'")
+            groups.append(f"IFNULL({dimension}, '')")
+        return groups
+
+    def rebuild_rollups(self):
+        """
+        Recomputes the KPI rollup tables from sales_data in a single transaction.
+        """
+        try:
+            with self.pool.transaction() as cursor:
+                rebuild_rollups(cursor)
+        except sqlite3.Error as e:
+            print(f"Rollup rebuild error: {e}")
+            raise
 
     def update_entry(self, id, filiale_name, country, date, monthly_revenue, monthly_costs, sales_volume, new_clients, satisfaction_rate, advertising_costs):
         """
         Updates an entry in the sales_data table based on the given id.
         """
         try:
-            self.connection.execute("BEGIN")
-            self.cursor.execute("""
-                UPDATE sales_data SET
-                filiale_name = ?, country = ?, date = ?, monthly_revenue = ?, monthly_costs = ?, sales_volume = ?, new_clients = ?, satisfaction_rate = ?, advertising_costs = ?
-                WHERE id = ?
-            """, (filiale_name, country, date, monthly_revenue, monthly_costs, sales_volume, new_clients, satisfaction_rate, advertising_costs, id))
-            self.connection.commit()
+            with self.pool.transaction() as cursor:
+                cursor.execute("""
+                    UPDATE sales_data SET
+                    filiale_name = ?, country = ?, date = ?, monthly_revenue = ?, monthly_costs = ?, sales_volume = ?, new_clients = ?, satisfaction_rate = ?, advertising_costs = ?
+                    WHERE id = ?
+                """, (filiale_name, country, normalize_date(date), monthly_revenue, monthly_costs, sales_volume, new_clients, satisfaction_rate, advertising_costs, id))
+        except sqlite3.Error as e:
+            print(f"Update error: {e}")
+
+    def update_entries(self, entries):
+        """
+        Updates several entries of the sales_data table in a single transaction.
+
+        The update is atomic: if any row fails, the transaction is rolled back, no row is
+        modified and the error is raised.
+
+        Args:
+            entries (iterable): Dicts holding the 'id' of the row and its SALES_COLUMNS values.
+
+        Returns:
+            int: The number of updated rows.
+        """
+        assignments = ", ".join(f"{column} = ?" for column in SALES_COLUMNS)
+        rows = [self._entry_values(entry) + (entry["id"],) for entry in entries]
+        try:
+            with self.pool.transaction() as cursor:
+                cursor.executemany(f"UPDATE sales_data SET {assignments} WHERE id = ?", rows)
         except sqlite3.Error as e:
             print(f"Update error: {e}")
-            self.connection.rollback()
+            raise
+        return len(rows)
+
     def delete_entry(self, id):
         """
         Deletes an entry from the sales_data table based on the given id.
         """
-        self.cursor.execute("DELETE FROM sales_data WHERE id = ?", (id,))
-        self.connection.commit()
+        with self.pool.transaction() as cursor:
+            cursor.execute("DELETE FROM sales_data WHERE id = ?", (id,))
+
+    def delete_entries(self, ids):
+        """
+        Deletes several entries with a single DELETE statement in one transaction.
+
+        Args:
+            ids (iterable): Ids of the rows to delete.
+
+        Returns:
+            int: The number of deleted rows.
+        """
+        ids = [int(id) for id in ids]
+        if not ids:
+            return 0
+        # The ids are passed as one JSON array parameter, so any number of rows fits in one statement
+        with self.pool.transaction() as cursor:
+            cursor.execute("DELETE FROM sales_data WHERE id IN (SELECT value FROM json_each(?))", (json.dumps(ids),))
+            return cursor.rowcount
+
+    def delete_where(self, filters):
+        """
+        Deletes every entry matching the filters in one transaction.
+
+        Args:
+            filters (dict): Filters as accepted by fetch_page, e.g.
+                {'country': 'France', 'date_from': '2024-01-01', 'date_to': '2024-03-31'}.
+                At least one filter is required.
+
+        Returns:
+            list: The ids of the deleted rows.
+        """
+        conditions, params = self._filter_conditions(filters)
+        if not conditions:
+            raise ValueError("At least one filter is required to delete by filter")
+        with self.pool.transaction() as cursor:
+            cursor.execute(f"DELETE FROM sales_data WHERE {' AND '.join(conditions)} RETURNING id", params)
+            return [row[0] for row in cursor.fetchall()]
 
     def close(self):
         """
-        Closes the database connection.
+        Closes the database connections.
         """
-        self.connection.close()
+        self.pool.close()
 
@@ -0,0 +1,109 @@
+import csv
+import logging
+import os
+import sys
+import time
+from itertools import islice
+
+from database import DatabaseManager, SALES_COLUMNS
+
+# Converters applied to each column of an imported row
+COLUMN_TYPES = {
+    "filiale_name": str,
+    "country": str,
+    "date": str,
+    "monthly_revenue": float,
+    "monthly_costs": float,
+    "sales_volume": int,
+    "new_clients": int,
+    "satisfaction_rate": int,
+    "advertising_costs": float,
+}
+
+
+class SalesImporter:
+    """
+    Streams CSV or Parquet files into the sales_data table.
+
+    Files are read chunk by chunk and each chunk is written with DatabaseManager.add_entries,
+    so memory use depends on the chunk size and not on the size of the file.
+
+    Attributes:
+        db_manager (DatabaseManager): The database receiving the imported rows.
+        chunk_size (int): Number of rows read from the file and committed at once.
+    """
+    def __init__(self, db_manager, chunk_size=5000):
+        self.db_manager = db_manager
+        self.chunk_size = chunk_size
+
+    def import_file(self, path):
+        """
+        Imports a CSV or Parquet file into the database.
+
+        Args:
+            path (str): Path of a .csv or .parquet file containing the sales_data columns.
+
+        Returns:
+            dict: The number of imported rows, the elapsed seconds and the rows per second.
+        """
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".csv":
+            chunks = self.iter_csv_chunks(path)
+        elif extension in (".parquet", ".pq"):
+            chunks = self.iter_parquet_chunks(path)
+        else:
+            raise ValueError(f"Unsupported file type: '{extension}'")
+
+        start = time.perf_counter()
+        rows = 0
+        for chunk in chunks:
+            rows += self.db_manager.add_entries(chunk, batch_size=self.chunk_size)
+        elapsed = time.perf_counter() - start
+        rows_per_sec = rows / elapsed if elapsed > 0 else float(rows)
+        logging.info(f"Imported {rows} rows from {path} in {elapsed:.2f}s ({rows_per_sec:,.0f} rows/sec)")
+        return {"rows": rows, "seconds": elapsed, "rows_per_sec": rows_per_sec}
+
+    def iter_csv_chunks(self, path):
+        """Yields lists of converted rows read from a CSV file with a header line."""
+        with open(path, newline='', encoding='utf-8') as file:
+            reader = csv.DictReader(file)
+            missing = set(SALES_COLUMNS) - set(reader.fieldnames or ())
+            if missing:
+                raise ValueError(f"Missing columns in {path}: {', '.join(sorted(missing))}")
+            while True:
+                chunk = [self.convert_row(row, reader.line_num) for row in islice(reader, self.chunk_size)]
+                if not chunk:
+                    break
+                yield chunk
+
+    def iter_parquet_chunks(self, path):
+        """Yields lists of converted rows read from a Parquet file, one record batch at a time."""
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Importing Parquet files requires the 'pyarrow' package.") from e
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=self.chunk_size, columns=list(SALES_COLUMNS)):
+            yield [self.convert_row(row) for row in batch.to_pylist()]
+
+    def convert_row(self, row, line=None):
+        """Converts a row read from a file to a tuple of values ordered like SALES_COLUMNS."""
+        try:
+            return tuple(COLUMN_TYPES[column](row[column]) for column in SALES_COLUMNS)
+        except (TypeError, ValueError) as e:
+            location = f" at line {line}" if line is not None else ""
+            raise ValueError(f"Invalid value{location}: {e}") from e
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    if len(sys.argv) < 2:
+        print("Usage: python importer.py <file.csv|file.parquet> [...]")
+        sys.exit(1)
+    importer = SalesImporter(DatabaseManager())
+    for path in sys.argv[1:]:
+        importer.import_file(path)
+
+
+if __name__ == "__main__":
+    main()
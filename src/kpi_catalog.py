@@ -0,0 +1,53 @@
+import re
+from collections import namedtuple
+
+from rollups import ROLLUP_MEASURES
+
+# A metric is the ratio of two sums of per-row SQL expressions over sales_data (no denominator: a plain sum).
+# Rows where an expression is NULL are left out of its sum.
+KPI = namedtuple("KPI", ["title", "numerator", "denominator", "scale"], defaults=[None, 1])
+
+# Registered metrics, in display order. All of them are computed by a single SQL statement
+# (see DatabaseManager.fetch_kpis), whatever their number.
+KPI_CATALOG = {
+    "revenue": KPI("Revenue", "monthly_revenue"),
+    "costs": KPI("Costs", "monthly_costs"),
+    "net_income": KPI("Net Income",
+                      "IFNULL(monthly_revenue, 0) - IFNULL(monthly_costs, 0) - IFNULL(advertising_costs, 0)"),
+    "gross_margin_pct": KPI("Gross Margin %", "monthly_revenue - IFNULL(monthly_costs, 0)", "monthly_revenue", 100),
+    "roas": KPI("ROAS", "monthly_revenue", "advertising_costs"),
+    "cost_per_new_client": KPI("Cost per New Client", "advertising_costs", "new_clients"),
+    "weighted_satisfaction": KPI("Satisfaction (volume-weighted)", "satisfaction_rate * sales_volume",
+                                 "IIF(satisfaction_rate IS NULL, NULL, sales_volume)"),
+}
+
+# Dimensions the metrics can be grouped by, in addition to a time period
+KPI_DIMENSIONS = ("country", "filiale_name")
+
+_IFNULL_TERM = r"IFNULL\((\w+), 0\)"
+
+
+def metric_sql(metric):
+    """Returns the SQL aggregate expression computing a registered metric."""
+    kpi = KPI_CATALOG[metric]
+    value = f"TOTAL({kpi.numerator})"
+    if kpi.denominator is not None:
+        value = f"{value} / NULLIF(TOTAL({kpi.denominator}), 0)"  # NULL when the denominator sums to 0
+    return f"{kpi.scale} * {value}" if kpi.scale != 1 else value
+
+
+def rollup_compatible(metric):
+    """
+    Returns True if a registered metric can be computed from the rollup tables, which keep the sums
+    of the measures per group with missing values counted as 0: each of its expressions must be a
+    single measure column or a sum/difference of IFNULL(measure, 0) terms.
+    """
+    kpi = KPI_CATALOG[metric]
+    for expression in (kpi.numerator, kpi.denominator):
+        if expression is None or expression in ROLLUP_MEASURES:
+            continue
+        if not re.fullmatch(rf"{_IFNULL_TERM}( [-+] {_IFNULL_TERM})*", expression):
+            return False
+        if not set(re.findall(_IFNULL_TERM, expression)) <= set(ROLLUP_MEASURES):
+            return False
+    return True
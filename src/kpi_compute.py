@@ -0,0 +1,53 @@
+NET_INCOME = 'Net Income'
+
+
+def add_net_income(df):
+    """Returns the DataFrame with a 'Net Income' column (revenue - costs - advertising costs)."""
+    net_income = (df['monthly_revenue'].fillna(0) - df['monthly_costs'].fillna(0)
+                  - df['advertising_costs'].fillna(0))
+    return df.assign(**{NET_INCOME: net_income})
+
+
+def net_income_by_country_date(df):
+    """
+    Aggregates the net income per (country, date) group with one vectorized groupby().sum().
+
+    The net income is derived once as a column instead of being computed by a Python
+    function called per group (groupby().apply()).
+
+    Args:
+        df (DataFrame): sales_data rows with the country, date, monthly_revenue, monthly_costs
+            and advertising_costs columns.
+
+    Returns:
+        DataFrame: The country, date and 'Net Income' columns, one row per group.
+    """
+    if NET_INCOME not in df.columns:
+        df = add_net_income(df)
+    return df.groupby(['country', 'date'], sort=False, observed=True)[NET_INCOME].sum().reset_index()
+
+
+def income_orderings(income, period='date'):
+    """
+    Returns the two views of a net income per (country, period) table shown in the KPI window and PDF.
+
+    Both views hold the same groups, so they are two sorts of one aggregated result.
+
+    Args:
+        income (DataFrame): The country, period and 'Net Income' columns, one row per group.
+        period (str): The name of the period column ('date', 'month', 'quarter' or 'year').
+
+    Returns:
+        tuple: (by country then period, by period then country) DataFrames, with the grouping columns
+        in the order of the sort.
+    """
+    by_country_period = income.sort_values(['country', period], kind='stable', ignore_index=True)
+    by_period_country = income.sort_values([period, 'country'], kind='stable', ignore_index=True)
+    return (by_country_period[['country', period, NET_INCOME]],
+            by_period_country[[period, 'country', NET_INCOME]])
+
+
+def income_tables(df):
+    """Computes both net income views from raw sales_data rows with a single aggregation."""
+    return income_orderings(net_income_by_country_date(df))
+
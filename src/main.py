@@ -1,4 +1,6 @@
+import os
 import sys
+from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QApplication
 from controller import MainWindowController
 import logging
@@ -9,6 +11,9 @@ def main():
     app = QApplication(sys.argv)
     main_window = MainWindowController()
     main_window.show()
+    # Après le premier affichage, les modules lourds (pandas, matplotlib, reportlab) sont importés en arrière-plan
+    if os.environ.get("SALES_PREWARM", "1") != "0":
+        QTimer.singleShot(0, main_window.prewarm_imports)
     sys.exit(app.exec())
 
 if __name__ == "__main__":
@@ -0,0 +1,140 @@
+import sqlite3
+from datetime import datetime
+
+from rollups import create_rollups, rebuild_rollups
+
+# Formats accepted for dates written by older versions or imported from files
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%Y/%m/%d", "%d-%m-%Y", "%d.%m.%Y", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S")
+
+
+def normalize_date(value):
+    """
+    Converts a date to the ISO 8601 'YYYY-MM-DD' form stored in sales_data.
+
+    ISO dates sort lexicographically in chronological order, so they can be indexed and
+    queried with ranges (``date BETWEEN ? AND ?``). Values that cannot be parsed are
+    returned unchanged.
+    """
+    if not isinstance(value, str):
+        return value
+    text = value.strip()
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return value
+
+
+def create_sales_table(cursor):
+    """Creates the sales_data table."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sales_data (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            filiale_name TEXT,
+            country TEXT,
+            date TEXT,
+            monthly_revenue REAL,
+            monthly_costs REAL,
+            sales_volume INTEGER,
+            new_clients INTEGER,
+            satisfaction_rate INTEGER,
+            advertising_costs REAL
+        );
+    """)
+
+
+def normalize_dates(cursor):
+    """Rewrites existing dates as 'YYYY-MM-DD' and rejects other date forms from now on."""
+    cursor.connection.create_function("normalize_date", 1, normalize_date, deterministic=True)
+    cursor.execute("UPDATE sales_data SET date = normalize_date(date) WHERE date IS NOT normalize_date(date)")
+    for event in ("INSERT", "UPDATE OF date"):
+        name = "insert" if event == "INSERT" else "update"
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS sales_data_check_date_{name}
+            BEFORE {event} ON sales_data
+            WHEN NEW.date IS NOT NULL AND date(NEW.date) IS NOT NEW.date
+            BEGIN
+                SELECT RAISE(ABORT, 'date must use the YYYY-MM-DD format');
+            END;
+        """)
+
+
+def allow_unchanged_legacy_dates(cursor):
+    """
+    Lets updates keep a legacy date that normalize_dates could not parse, while still rejecting
+    a new date that is not 'YYYY-MM-DD'. Updates write every column back, date included, so such
+    rows could not be edited at all.
+    """
+    cursor.execute("DROP TRIGGER IF EXISTS sales_data_check_date_update")
+    cursor.execute("""
+        CREATE TRIGGER sales_data_check_date_update
+        BEFORE UPDATE OF date ON sales_data
+        WHEN NEW.date IS NOT NULL AND date(NEW.date) IS NOT NEW.date AND NEW.date IS NOT OLD.date
+        BEGIN
+            SELECT RAISE(ABORT, 'date must use the YYYY-MM-DD format');
+        END;
+    """)
+
+
+def add_analytic_indexes(cursor):
+    """Adds the indexes used by country, date and filiale lookups."""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sales_country_date ON sales_data (country, date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sales_date_country ON sales_data (date, country)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sales_filiale ON sales_data (filiale_name)")
+
+
+def add_kpi_rollups(cursor):
+    """Adds the KPI rollup tables maintained by triggers and fills them from the existing rows."""
+    create_rollups(cursor)
+    rebuild_rollups(cursor)
+
+
+# Ordered list of (version, migration). A database at version N receives every migration above N.
+MIGRATIONS = [
+    (1, create_sales_table),
+    (2, normalize_dates),
+    (3, add_analytic_indexes),
+    (4, add_kpi_rollups),
+    (5, allow_unchanged_legacy_dates),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(connection):
+    """Returns the schema version stored in the database header (PRAGMA user_version)."""
+    return connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(connection):
+    """
+    Upgrades the database in place to the latest schema version.
+
+    Each pending migration runs in its own transaction together with the update of
+    PRAGMA user_version, so an interrupted upgrade resumes from the last applied version.
+
+    Args:
+        connection (sqlite3.Connection): The connection to upgrade.
+
+    Returns:
+        int: The schema version after the upgrade.
+    """
+    current = get_schema_version(connection)
+    if current > SCHEMA_VERSION:
+        raise RuntimeError(f"Database schema version {current} is newer than this application ({SCHEMA_VERSION})")
+    cursor = connection.cursor()
+    for version, migration in MIGRATIONS:
+        if version <= current:
+            continue
+        try:
+            connection.execute("BEGIN")
+            migration(cursor)
+            cursor.execute(f"PRAGMA user_version = {version:d}")
+            connection.commit()
+        except sqlite3.Error as e:
+            print(f"Migration {version} ({migration.__name__}) failed: {e}")
+            connection.rollback()
+            raise
+        current = version
+    return current
@@ -0,0 +1,163 @@
+import multiprocessing
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from database import SALES_COLUMNS
+from sales_store import stream_sum_by
+from sketches import sketch_rows
+
+PARTITION_KEYS = ("country", "date")
+
+
+def _read_partition(db_filename, where, params, summarize, *args):
+    """Streams the rows of one partition into summarize(rows, *args) (runs in a worker process)."""
+    # Each worker opens its own read-only connection: nothing is shared with the application process
+    connection = sqlite3.connect(f"{Path(db_filename).as_uri()}?mode=ro", uri=True)
+    try:
+        cursor = connection.execute(f"SELECT id, {', '.join(SALES_COLUMNS)} FROM sales_data WHERE {where}", params)
+        return summarize(cursor, *args)
+    finally:
+        connection.close()
+
+
+class ParallelAggregator:
+    """
+    Runs group-by aggregations of sales_data on several cores.
+
+    The table is split into one partition per worker, either by country (countries are spread so
+    that every partition holds about the same number of rows) or by contiguous date ranges of about
+    the same number of rows; the row counts come from the KPI rollup tables. Each worker process
+    opens its own read-only SQLite connection, streams its partition through stream_sum_by, and the
+    partial results are merged by summing them per group.
+
+    Attributes:
+        db_manager (DatabaseManager): The database to aggregate.
+        workers (int): Number of worker processes (defaults to the number of CPUs).
+        partition_by (str): 'country' or 'date'.
+        chunk_size (int): Number of rows held in memory at a time by each worker.
+    """
+    def __init__(self, db_manager, workers=None, partition_by="country", chunk_size=50000):
+        if partition_by not in PARTITION_KEYS:
+            raise ValueError(f"Unknown partition key: '{partition_by}'")
+        self.db_manager = db_manager
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.partition_by = partition_by
+        self.chunk_size = chunk_size
+        self._executor = None
+
+    def partitions(self):
+        """Returns the (SQL condition, parameters) of every non-empty partition of sales_data."""
+        if self.partition_by == "country":
+            return self._country_partitions()
+        return self._date_partitions()
+
+    def _country_partitions(self):
+        counts = self.db_manager.pool.reader().execute(
+            "SELECT country, row_count FROM kpi_country ORDER BY row_count DESC, country").fetchall()
+        bins = [[0, []] for _ in range(min(self.workers, len(counts)))]
+        for country, row_count in counts:  # Largest countries first, each to the least loaded partition
+            smallest = min(bins, key=lambda item: item[0])
+            smallest[0] += row_count
+            smallest[1].append(country)
+        partitions = []
+        for _, countries in bins:
+            where = f"country IN ({', '.join('?' * len(countries))})"
+            if "" in countries:  # The rollups store missing countries as ''
+                where = f"({where} OR country IS NULL)"
+            partitions.append((where, countries))
+        return partitions
+
+    def _date_partitions(self):
+        counts = self.db_manager.pool.reader().execute(
+            "SELECT date, SUM(row_count) FROM kpi_country_date GROUP BY date ORDER BY date").fetchall()
+        if not counts:
+            return []
+        total, bounds, cumulated = sum(row_count for _, row_count in counts), [], 0
+        for date, row_count in counts[:-1]:
+            cumulated += row_count
+            if cumulated >= total * (len(bounds) + 1) / self.workers:
+                bounds.append(date)  # Last date of a partition
+        # The first range also holds missing dates, the last one has no upper bound
+        partitions, lower = [], None
+        for upper in bounds + [None]:
+            conditions, params = [], []
+            if lower is not None:
+                conditions.append("date > ?")
+                params.append(lower)
+            if upper is not None:
+                conditions.append("date <= ?")
+                params.append(upper)
+            where = " AND ".join(conditions) or "1"
+            partitions.append((f"({where} OR date IS NULL)" if lower is None else where, params))
+            lower = upper
+        return partitions
+
+    def aggregate(self, by, measures=(), net_income=True, filters=None):
+        """
+        Sums measures per group like SalesStore.sum_by, with the partitions aggregated in parallel.
+        Only the rows selected by filters (see DatabaseManager.fetch_page) are read.
+
+        Returns:
+            DataFrame: One row per group, sorted by the group columns.
+        """
+        by = list(by)
+        partials = self._map_partitions(filters, stream_sum_by, by, measures, net_income, self.chunk_size)
+        if not partials:
+            return stream_sum_by([], by, measures, net_income)
+        merged = pd.concat(partials, ignore_index=True)
+        if not by:
+            return pd.DataFrame([merged.sum()]) if len(merged) else merged
+        return merged.groupby(by, as_index=False).sum()
+
+    def sketch(self, precision=12, k=200, filters=None):
+        """
+        Builds one KPISketch per partition in parallel and merges them (see sketches.sketch_rows),
+        over the rows selected by filters.
+
+        The sketches of the partitions use independent random seeds.
+        """
+        sketch = sketch_rows([], self.chunk_size, precision, k)
+        for partial in self._map_partitions(filters, sketch_rows, self.chunk_size, precision, k):
+            sketch.merge(partial)
+        return sketch
+
+    def sketch_partitions(self, partitions, filters=None, precision=12, k=200):
+        """
+        Returns the KPISketch of each of the given (SQL condition, parameters) partitions, restricted
+        to the rows selected by filters, built by the worker processes (see sketches.CountrySketches).
+        """
+        return self._map_partitions(filters, sketch_rows, self.chunk_size, precision, k, partitions=partitions)
+
+    def _map_partitions(self, filters, summarize, *args, partitions=None):
+        """
+        Returns summarize(rows, *args) of the rows of every partition (by default those of
+        partitions()) selected by filters, computed by the worker processes.
+        """
+        conditions, filter_params = self.db_manager._filter_conditions(filters)
+        if partitions is None:
+            partitions = self.partitions() if self.workers > 1 else [("1", [])]
+        partitions = [(" AND ".join([f"({where})"] + conditions), list(params) + filter_params)
+                      for where, params in partitions]
+        if self.workers == 1:
+            return [_read_partition(self.db_manager.db_filename, where, params, summarize, *args)
+                    for where, params in partitions]
+        futures = [self.executor().submit(_read_partition, self.db_manager.db_filename, where, params, summarize, *args)
+                   for where, params in partitions]
+        return [future.result() for future in futures]
+
+    def executor(self):
+        """Returns the pool of worker processes, started on first use and kept for later aggregations."""
+        if self._executor is None:
+            # spawn rather than fork: the application process runs Qt and SQLite threads
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    def close(self):
+        """Stops the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
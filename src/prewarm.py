@@ -0,0 +1,31 @@
+import importlib
+import logging
+import threading
+import time
+
+# Modules loaded on first use (KPI tables, charts, PDF report) rather than at startup, in the order
+# they are usually needed
+DEFERRED_MODULES = ("pandas", "sales_store", "components.chart_renderer", "reportlab.platypus")
+
+
+def prewarm(modules=DEFERRED_MODULES):
+    """
+    Imports modules in a background daemon thread, so that the first KPI, chart or PDF does not wait
+    for them. Meant to be started once the main window is shown.
+
+    Returns:
+        threading.Thread: The started thread.
+    """
+    def run():
+        for name in modules:
+            start = time.perf_counter()
+            try:
+                importlib.import_module(name)
+            except ImportError as e:
+                logging.warning(f"Prewarm of {name} failed: {e}")  # Il sera importé (ou échouera) au premier usage
+            else:
+                logging.debug(f"Prewarmed {name} in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    thread = threading.Thread(target=run, name="prewarm-imports", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,98 @@
+import os
+import sys
+
+# Columns summed in every rollup table (same as DatabaseManager's MEASURE_COLUMNS)
+ROLLUP_MEASURES = (
+    "monthly_revenue", "monthly_costs", "sales_volume", "new_clients", "satisfaction_rate", "advertising_costs",
+)
+
+# Rollup table name -> (key column, expression computing it from a sales_data row).
+# The key expressions use a row prefix ("NEW", "OLD" or "sales_data") substituted when the SQL is built.
+ROLLUPS = {
+    "kpi_totals": (("id", "1"),),
+    "kpi_country": (("country", "IFNULL({row}.country, '')"),),
+    "kpi_country_date": (("country", "IFNULL({row}.country, '')"), ("date", "IFNULL({row}.date, '')")),
+    "kpi_filiale": (("filiale_name", "IFNULL({row}.filiale_name, '')"), ("country", "IFNULL({row}.country, '')")),
+}
+
+
+def _keys(table):
+    return [column for column, _ in ROLLUPS[table]]
+
+
+def _key_values(table, row):
+    return [expression.format(row=row) for _, expression in ROLLUPS[table]]
+
+
+def _add_row_sql(table):
+    """INSERT ... ON CONFLICT statement adding the NEW row to its group."""
+    keys = _keys(table)
+    columns = keys + ["row_count"] + list(ROLLUP_MEASURES)
+    values = _key_values(table, "NEW") + ["1"] + [f"IFNULL(NEW.{m}, 0)" for m in ROLLUP_MEASURES]
+    updates = ["row_count = row_count + 1"] + [f"{m} = {m} + excluded.{m}" for m in ROLLUP_MEASURES]
+    return (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(values)}) "
+            f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {', '.join(updates)};")
+
+
+def _remove_row_sql(table):
+    """UPDATE and DELETE statements removing the OLD row from its group."""
+    where = " AND ".join(f"{key} = {value}" for key, value in zip(_keys(table), _key_values(table, "OLD")))
+    updates = ["row_count = row_count - 1"] + [f"{m} = {m} - IFNULL(OLD.{m}, 0)" for m in ROLLUP_MEASURES]
+    return (f"UPDATE {table} SET {', '.join(updates)} WHERE {where};\n"
+            f"DELETE FROM {table} WHERE {where} AND row_count <= 0;")
+
+
+def create_rollups(cursor):
+    """Creates the rollup tables and the triggers keeping them in sync with sales_data."""
+    for table in ROLLUPS:
+        keys = _keys(table)
+        key_columns = ", ".join(f"{key} {'INTEGER' if key == 'id' else 'TEXT'} NOT NULL" for key in keys)
+        measure_columns = ", ".join(f"{m} REAL NOT NULL DEFAULT 0" for m in ROLLUP_MEASURES)
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                {key_columns},
+                row_count INTEGER NOT NULL DEFAULT 0,
+                {measure_columns},
+                PRIMARY KEY ({', '.join(keys)})
+            )
+        """)
+
+    add_rows = "\n".join(_add_row_sql(table) for table in ROLLUPS)
+    remove_rows = "\n".join(_remove_row_sql(table) for table in ROLLUPS)
+    cursor.execute(f"CREATE TRIGGER IF NOT EXISTS sales_data_rollup_insert AFTER INSERT ON sales_data "
+                   f"BEGIN\n{add_rows}\nEND;")
+    cursor.execute(f"CREATE TRIGGER IF NOT EXISTS sales_data_rollup_delete AFTER DELETE ON sales_data "
+                   f"BEGIN\n{remove_rows}\nEND;")
+    cursor.execute(f"CREATE TRIGGER IF NOT EXISTS sales_data_rollup_update AFTER UPDATE ON sales_data "
+                   f"BEGIN\n{remove_rows}\n{add_rows}\nEND;")
+
+
+def rebuild_rollups(cursor):
+    """Recomputes every rollup table from sales_data (recovery from drift, e.g. after manual edits)."""
+    sums = ", ".join(f"TOTAL({m})" for m in ROLLUP_MEASURES)
+    for table in ROLLUPS:
+        keys = _keys(table)
+        key_values = _key_values(table, "sales_data")
+        group_by = "" if keys == ["id"] else f" GROUP BY {', '.join(key_values)}"
+        cursor.execute(f"DELETE FROM {table}")
+        cursor.execute(f"""
+            INSERT INTO {table} ({', '.join(keys)}, row_count, {', '.join(ROLLUP_MEASURES)})
+            SELECT {', '.join(key_values)}, COUNT(*), {sums}
+            FROM sales_data{group_by}
+        """)
+        cursor.execute(f"DELETE FROM {table} WHERE row_count = 0")  # kpi_totals of an empty table
+
+
+def main():
+    from database import DatabaseManager  # Imported here: database depends on this module through migrations
+
+    db_manager = DatabaseManager(os.path.abspath(sys.argv[1]) if len(sys.argv) > 1 else 'sales.db')
+    try:
+        db_manager.rebuild_rollups()
+        print(f"KPI rollup tables rebuilt in '{db_manager.db_filename}'.")
+    finally:
+        db_manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+import heapq
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+from database import MEASURE_COLUMNS, SALES_COLUMNS
+from kpi_compute import NET_INCOME
+
+# Text columns of sales_data, stored as integer codes into a table of distinct values
+DIMENSIONS = ("filiale_name", "country", "date")
+MISSING_DATE = np.iinfo(np.int32).min  # Ordinal of a missing or unparsable date
+PERIODS = ("month", "quarter", "year")  # Time buckets of the dates, usable as dimensions by sum_by
+DENSE_GROUPS_LIMIT = 1 << 22  # Above this number of possible groups, group keys are sorted instead of counted
+
+
+class SalesStore:
+    """
+    Columnar, typed in-memory copy of the sales_data table.
+
+    Dimensions (filiale, country, date) are dictionary-encoded: each row holds an int32 code into a
+    table of the distinct values, instead of one Python string per row (missing values are encoded
+    as '', like in the rollup tables). Measures are float64 NumPy arrays (missing values are NaN)
+    and dates are also kept as int32 day ordinals (days since 1970-01-01), so time ranges and
+    buckets are integer comparisons. Aggregations combine the codes into one integer key per row
+    and sum the measures with np.bincount, without touching a string.
+
+    Attributes:
+        ids (ndarray): The id of every row (int64).
+        codes (dict): Dimension name -> int32 array of codes, one per row.
+        categories (dict): Dimension name -> object array of the distinct values, indexed by code.
+        measures (dict): Measure name -> float64 array, one value per row.
+        days (ndarray): Day ordinal of the date of every row (int32, MISSING_DATE when unknown).
+    """
+    def __init__(self, ids, codes, categories, measures):
+        self.ids = ids
+        self.codes = codes
+        self.categories = categories
+        self.measures = measures
+        self.days = _day_ordinals(categories["date"])[codes["date"]]
+
+    @classmethod
+    def from_rows(cls, rows, batch_size=5000):
+        """
+        Builds the store from (id, filiale_name, country, date, measures...) rows, such as the ones
+        yielded by DatabaseManager.iter_rows. Rows are encoded batch by batch, so no intermediate
+        DataFrame of Python strings is ever built.
+        """
+        lookups = {name: {} for name in DIMENSIONS}
+        ids, codes = [], {name: [] for name in DIMENSIONS}
+        measures = {name: [] for name in MEASURE_COLUMNS}
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            columns = dict(zip(("id",) + SALES_COLUMNS, zip(*batch)))
+            ids.append(np.array(columns["id"], dtype=np.int64))
+            for name in DIMENSIONS:
+                lookup = lookups[name]
+                codes[name].append(np.array([lookup.setdefault(value or "", len(lookup)) for value in columns[name]],
+                                            dtype=np.int32))
+            for name in MEASURE_COLUMNS:
+                measures[name].append(np.array(columns[name], dtype=np.float64))  # None -> NaN
+
+        def concat(chunks, dtype):
+            return np.concatenate(chunks) if chunks else np.empty(0, dtype)
+
+        return cls(concat(ids, np.int64),
+                   {name: concat(codes[name], np.int32) for name in DIMENSIONS},
+                   {name: np.array(list(lookups[name]), dtype=object) for name in DIMENSIONS},
+                   {name: concat(measures[name], np.float64) for name in MEASURE_COLUMNS})
+
+    @classmethod
+    def from_database(cls, db_manager, batch_size=5000, filters=None):
+        """Streams the sales_data rows of the database into a new store."""
+        return cls.from_rows(db_manager.iter_rows(batch_size=batch_size, filters=filters), batch_size)
+
+    @classmethod
+    def from_frame(cls, df):
+        """Builds the store from a DataFrame with the sales_data columns (a missing id column is numbered)."""
+        codes, categories = {}, {}
+        for name in DIMENSIONS:
+            column_codes, uniques = pd.factorize(df[name].fillna(""))
+            codes[name] = column_codes.astype(np.int32)
+            categories[name] = np.asarray(uniques, dtype=object)
+        ids = df['id'].to_numpy(np.int64) if 'id' in df.columns else np.arange(1, len(df) + 1, dtype=np.int64)
+        return cls(ids, codes, categories,
+                   {name: df[name].to_numpy(np.float64, na_value=np.nan) for name in MEASURE_COLUMNS})
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def nbytes(self):
+        """Memory used by the columns, including the tables of distinct values."""
+        arrays = [self.ids, self.days, *self.codes.values(), *self.measures.values()]
+        strings = sum(len(value) + 49 for values in self.categories.values() for value in values)
+        return sum(array.nbytes for array in arrays) + strings
+
+    def net_income(self):
+        """Returns revenue - costs - advertising costs of every row (missing values count as 0)."""
+        measures = self.measures
+        return (np.nan_to_num(measures['monthly_revenue']) - np.nan_to_num(measures['monthly_costs'])
+                - np.nan_to_num(measures['advertising_costs']))
+
+    def sum_by(self, by, measures=MEASURE_COLUMNS, net_income=False):
+        """
+        Sums measures per group of dimensions, computed on the integer codes.
+
+        Args:
+            by (sequence): Dimension names to group on, e.g. ('country', 'date'). The 'month',
+                'quarter' and 'year' buckets of the dates (see DatabaseManager.PERIOD_SQL) can be used too.
+            measures (sequence): Measure columns to sum (missing values count as 0).
+            net_income (bool): Also sum the net income, in a 'Net Income' column.
+
+        Returns:
+            DataFrame: The dimension columns and one column per sum, one row per group present in
+            the data, in the order of the codes (order of first appearance).
+        """
+        values = {name: np.nan_to_num(self.measures[name]) for name in measures}
+        if net_income:
+            values[NET_INCOME] = self.net_income()
+        codes, labels = zip(*(self.dimension(name) for name in by)) if by else ((), ())
+        return self._sum_groups(by, codes, [len(column_labels) for column_labels in labels], values, labels)
+
+    def dimension(self, name):
+        """Returns the codes of every row and the table of labels of a dimension or time bucket."""
+        return self.period_codes(name) if name in PERIODS else (self.codes[name], self.categories[name])
+
+    def period_codes(self, period):
+        """
+        Returns the codes of the time bucket of every row and the table of bucket labels.
+
+        Buckets are derived from the table of distinct dates, so the per-row work is one lookup.
+        """
+        date_codes, labels = pd.factorize(pd.Series([_period_label(date, period) for date in self.categories["date"]],
+                                                    dtype=object))
+        return date_codes.astype(np.int32)[self.codes["date"]], np.asarray(labels, dtype=object)
+
+    def _sum_groups(self, names, codes, sizes, values, labels):
+        """Sums values per combination of codes and decodes the groups with the labels tables."""
+        key, size = np.zeros(len(self), dtype=np.int64), 1
+        for column_codes, column_size in zip(codes, sizes):
+            key = key * column_size + column_codes
+            size *= column_size
+        if size <= DENSE_GROUPS_LIMIT:
+            groups = np.flatnonzero(np.bincount(key, minlength=size))
+            sums = {name: np.bincount(key, weights=column, minlength=size)[groups] for name, column in values.items()}
+        else:
+            groups, inverse = np.unique(key, return_inverse=True)
+            sums = {name: np.bincount(inverse, weights=column, minlength=len(groups)) for name, column in values.items()}
+
+        result, remaining = {}, groups
+        for name, column_size, column_labels in reversed(list(zip(names, sizes, labels))):
+            result[name] = column_labels[remaining % column_size]
+            remaining = remaining // column_size
+        result = {name: result[name] for name in names}
+        result.update(sums)
+        return pd.DataFrame(result)
+
+    def to_frame(self):
+        """Returns the rows as a DataFrame with categorical dimension columns (no per-row strings)."""
+        frame = {'id': self.ids}
+        for name in SALES_COLUMNS:
+            if name in self.codes:
+                frame[name] = pd.Categorical.from_codes(self.codes[name], self.categories[name])
+            else:
+                frame[name] = self.measures[name]
+        return pd.DataFrame(frame)
+
+
+def stream_sum_by(rows, by, measures=MEASURE_COLUMNS, net_income=False, chunk_size=50000):
+    """
+    Streaming version of SalesStore.sum_by, for tables larger than memory.
+
+    The rows are read chunk_size at a time; each chunk is encoded into a small SalesStore, summed,
+    and its partial sums are merged into the running sums per group. Peak memory is bounded by one
+    chunk plus one row per group, whatever the number of rows. The result has the same groups, in
+    the same order, as SalesStore.from_rows(rows).sum_by(...); sums are added chunk by chunk, so
+    non-integer sums may only differ in the last bits of floating-point rounding.
+
+    Args:
+        rows (iterable): sales_data rows, such as the ones yielded by DatabaseManager.iter_rows.
+        by, measures, net_income: See SalesStore.sum_by.
+        chunk_size (int): Number of rows held in memory at a time.
+    """
+    by = list(by)
+    rows = iter(rows)
+    result = None
+    first_seen = {name: {} for name in by}  # Label -> rank of first appearance, per dimension
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk and result is not None:
+            break
+        store = SalesStore.from_rows(chunk, chunk_size)
+        partial = store.sum_by(by, measures, net_income)
+        for name in by:
+            ranks = first_seen[name]
+            for label in store.dimension(name)[1]:  # Labels are in order of first appearance in the chunk
+                ranks.setdefault(label, len(ranks))
+        if result is None:
+            result = partial
+        elif by:
+            result = pd.concat([result, partial], ignore_index=True).groupby(by, sort=False, as_index=False).sum()
+        else:
+            result = result + partial
+        if not chunk:
+            break
+    if not by:
+        return result
+    # The ranks of first appearance are the codes an in-memory store would give: sorting the groups on
+    # them gives the order of sum_by.
+    order = np.lexsort([result[name].map(first_seen[name]).to_numpy() for name in reversed(by)])
+    return result.iloc[order].reset_index(drop=True)
+
+
+def top_groups(sums, column, n=10, ascending=False, by=()):
+    """
+    Returns the n rows of a sum_by result with the largest (or, with ascending, smallest) values of
+    column, best first. A heap of n rows is kept instead of sorting every group. Ties are ordered by
+    the group columns by, like the ORDER BY of DatabaseManager.fetch_top_kpis, so every engine
+    returns the same groups.
+    """
+    values = sums[column].to_numpy()
+    labels = list(zip(*(sums[name].to_numpy() for name in by))) if by else [()] * len(sums)
+    sign = 1 if ascending else -1
+    rows = heapq.nsmallest(n, range(len(sums)), key=lambda row: (sign * values[row], labels[row]))
+    return sums.iloc[rows].reset_index(drop=True)
+
+
+def _period_label(date, period):
+    """Python equivalent of DatabaseManager's PERIOD_SQL expressions, for one 'YYYY-MM-DD' date."""
+    if period == "month":
+        return date[:7]
+    if period == "year":
+        return date[:4]
+    if period == "quarter":
+        return f"{date[:4]}-Q{(int(date[5:7] or 0) + 2) // 3}" if date else ""
+    raise ValueError(f"Unknown period: '{period}'")
+
+
+def _day_ordinals(dates):
+    """Returns the day ordinal (days since 1970-01-01) of each 'YYYY-MM-DD' date string."""
+    parsed = pd.to_datetime(pd.Series(dates, dtype=object), format="%Y-%m-%d", errors="coerce")
+    days = parsed.to_numpy("datetime64[D]").astype(np.int64)
+    days[parsed.isna().to_numpy()] = MISSING_DATE
+    return days.astype(np.int32)
@@ -0,0 +1,301 @@
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+from database import SALES_COLUMNS, filters_key
+from rollups import ROLLUP_MEASURES
+from sales_store import SalesStore
+
+QUANTILE_MEASURES = ("monthly_revenue", "satisfaction_rate")  # Measures summarized by a quantile sketch
+
+
+class HyperLogLog:
+    """
+    HyperLogLog sketch estimating the number of distinct values of a stream.
+
+    It keeps 2**precision one-byte registers (4 KiB for the default precision of 12), whatever the
+    number of values. Values are hashed with BLAKE2b, so sketches built in different processes can
+    be merged. The relative standard error of the estimate is 1.04 / sqrt(2**precision), 1.6% by default.
+    """
+    def __init__(self, precision=12):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, values):
+        """Adds an iterable of values (they are hashed through their str())."""
+        suffix_bits = 64 - self.precision
+        for value in values:
+            hashed = int.from_bytes(hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest(), "big")
+            register = hashed >> suffix_bits
+            rank = suffix_bits - (hashed & ((1 << suffix_bits) - 1)).bit_length() + 1  # Position of the first 1 bit
+            if rank > self.registers[register]:
+                self.registers[register] = rank
+
+    def merge(self, other):
+        """Adds the values of another sketch of the same precision."""
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self):
+        """Returns the estimated number of distinct values."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int32)))
+        zeros = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)  # Linear counting, more accurate for small cardinalities
+        return estimate
+
+    @property
+    def relative_error(self):
+        """Relative standard error of estimate()."""
+        return 1.04 / math.sqrt(len(self.registers))
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch (Karnin, Lang and Liberty) of a stream of numbers.
+
+    Values are kept in a hierarchy of compactors: when a level is full it is sorted and every other
+    value is promoted to the next level, where it stands for twice as many values. The sketch keeps
+    O(k) values and the rank of a returned quantile is off by at most rank_error (as a fraction of
+    the count) with 99% confidence. Sketches of different partitions can be merged.
+    """
+    def __init__(self, k=200, seed=None):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return int(math.ceil(self.k * (2 / 3) ** depth)) + 1
+
+    def update(self, values):
+        """Adds an array of values (NaNs are ignored)."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        """Adds the values summarized by another sketch."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, values in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], values])
+        self.count += other.count
+        self._compress()
+
+    def _compress(self):
+        while sum(len(values) for values in self.levels) >= sum(map(self._capacity, range(len(self.levels)))):
+            for level, values in enumerate(self.levels):
+                if len(values) >= self._capacity(level):
+                    if level + 1 == len(self.levels):
+                        self.levels.append(np.empty(0))
+                    values = np.sort(values)
+                    kept = len(values) % 2  # With an odd number of values, the largest one stays
+                    promoted = values[self._rng.integers(2):len(values) - kept:2]
+                    self.levels[level] = values[len(values) - kept:]
+                    self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                    break
+
+    def quantile(self, q):
+        """Returns the approximate q-quantile (0 <= q <= 1), or NaN if the sketch is empty."""
+        if not self.count:
+            return math.nan
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level_values), 1 << level)
+                                  for level, level_values in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        index = np.searchsorted(cumulative, q * cumulative[-1], side="left")
+        return float(values[order][min(index, len(values) - 1)])
+
+    @property
+    def rank_error(self):
+        """Normalized rank error of quantile() at 99% confidence (empirical bound of the DataSketches KLL)."""
+        return 2.446 / self.k ** 0.9433
+
+
+class KPISketch:
+    """
+    Mergeable approximate summary of sales_data rows, answering exploratory KPI queries in milliseconds.
+
+    It holds a HyperLogLog of the filiales of every country and a KLL sketch of each
+    QUANTILE_MEASURES column. Sketches built on separate partitions (e.g. by CountrySketches or
+    ParallelAggregator.sketch) are combined with merge().
+    """
+    def __init__(self, precision=12, k=200, seed=None):
+        rng = np.random.default_rng(seed)
+        self.precision = precision
+        self.row_count = 0
+        self.filiales = {}  # country -> HyperLogLog of its filiale names
+        self.quantiles = {name: KLLSketch(k, rng.integers(1 << 32)) for name in QUANTILE_MEASURES}
+
+    def update(self, store):
+        """Adds the rows of a SalesStore (usually one chunk of a stream)."""
+        if not len(store):
+            return
+        self.row_count += len(store)
+        countries, filiales = store.codes["country"], store.codes["filiale_name"]
+        # Only the distinct (country, filiale) pairs of the chunk are hashed
+        pairs = np.unique(countries.astype(np.int64) * len(store.categories["filiale_name"]) + filiales)
+        country_labels = store.categories["country"][pairs // len(store.categories["filiale_name"])]
+        filiale_labels = store.categories["filiale_name"][pairs % len(store.categories["filiale_name"])]
+        for country in np.unique(country_labels):
+            sketch = self.filiales.setdefault(country, HyperLogLog(self.precision))
+            sketch.add(filiale_labels[country_labels == country])
+        for name, sketch in self.quantiles.items():
+            sketch.update(store.measures[name])
+
+    def merge(self, other):
+        """Adds the rows summarized by another sketch (built with the same parameters)."""
+        self.row_count += other.row_count
+        for country, sketch in other.filiales.items():
+            self.filiales.setdefault(country, HyperLogLog(self.precision)).merge(sketch)
+        for name, sketch in self.quantiles.items():
+            sketch.merge(other.quantiles[name])
+
+    def distinct_filiales(self):
+        """
+        Returns the estimated number of distinct filiales per country.
+
+        Returns:
+            DataFrame: The country, distinct_filiales and error columns, sorted by country. The
+            error is the half-width of a 95% confidence interval (two standard errors).
+        """
+        countries = sorted(self.filiales)
+        estimates = [self.filiales[country].estimate() for country in countries]
+        relative_error = 2 * 1.04 / math.sqrt(1 << self.precision)
+        return pd.DataFrame({"country": countries, "distinct_filiales": estimates,
+                             "error": [estimate * relative_error for estimate in estimates]})
+
+    def percentiles(self, measure, quantiles=(0.1, 0.25, 0.5, 0.75, 0.9)):
+        """
+        Returns approximate percentiles of a QUANTILE_MEASURES column.
+
+        Returns:
+            DataFrame: The quantile, value and rank_error columns; the true rank of each value is
+            within rank_error (a fraction of the row count) of its quantile with 99% confidence.
+        """
+        sketch = self.quantiles[measure]
+        return pd.DataFrame({"quantile": list(quantiles), "value": [sketch.quantile(q) for q in quantiles],
+                             "rank_error": sketch.rank_error})
+
+
+def sketch_rows(rows, chunk_size=50000, precision=12, k=200, seed=None):
+    """
+    Builds a KPISketch from sales_data rows (such as DatabaseManager.iter_rows), one chunk at a time.
+
+    The other arguments are passed to KPISketch.
+    """
+    sketch = KPISketch(precision, k, seed)
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return sketch
+        sketch.update(SalesStore.from_rows(chunk, chunk_size))
+
+
+def country_partition(country):
+    """Returns the SQL condition and parameters selecting the sales_data rows of a country of the rollups."""
+    if country == "":  # The rollups store missing countries as ''
+        return "(country IS NULL OR country = '')", []
+    return "country = ?", [country]
+
+
+class CountrySketches:
+    """
+    KPISketches of sales_data kept per country, so that a change of the data only rescans the
+    countries whose rows changed instead of the whole table.
+
+    A country's sketch is reused as long as its rows of the kpi_filiale and kpi_country_date rollups
+    (filiales, dates, row counts and sums) are unchanged; the rollups are read once per data version.
+    An edit leaving every one of those sums unchanged (e.g. +10 on one row and -10 on another row of
+    the same filiale and date) is only picked up by the next change of the country.
+
+    Attributes:
+        db_manager (DatabaseManager): The database to sketch.
+        chunk_size (int): Number of rows held in memory at a time while scanning a country.
+        max_entries (int): Maximum number of (country, filters) sketches kept.
+        scanned (int): Number of country scans done so far.
+    """
+    def __init__(self, db_manager, chunk_size=50000, max_entries=256, precision=12, k=200):
+        self.db_manager = db_manager
+        self.chunk_size = chunk_size
+        self.max_entries = max_entries
+        self.precision = precision
+        self.k = k
+        self.scanned = 0
+        self._sketches = OrderedDict()  # (country, filters key) -> (signature, KPISketch)
+        self._lock = threading.Lock()
+
+    def signatures(self):
+        """Returns {country: signature of its rollup rows} for every country of sales_data."""
+        return self.db_manager.snapshots.get("country_sketch_signatures", self._read_signatures)
+
+    def _read_signatures(self):
+        reader, measures, rows = self.db_manager.pool.reader(), ", ".join(ROLLUP_MEASURES), {}
+        for table, key in (("kpi_filiale", "filiale_name"), ("kpi_country_date", "date")):
+            for row in reader.execute(f"SELECT country, {key}, row_count, {measures} FROM {table} "
+                                      f"ORDER BY country, {key}"):
+                rows.setdefault(row[0], []).append(row[1:])
+        return {country: hash(tuple(country_rows)) for country, country_rows in rows.items()}
+
+    def sketch(self, filters=None, build=None):
+        """
+        Returns a KPISketch of the rows selected by filters, merged from the sketches of their countries.
+
+        Args:
+            filters (dict): Row filters, as accepted by DatabaseManager.fetch_page.
+            build (callable): Called as build(partitions, filters) with the (SQL condition, parameters)
+                of the countries to rescan, returns their KPISketches (e.g. computed by worker
+                processes, see ParallelAggregator.sketch_partitions). By default they are scanned
+                in the calling thread.
+        """
+        filters = dict(filters or {})
+        signatures = self.signatures()
+        if "country" not in filters:
+            countries = sorted(signatures)
+        else:  # The country filter selects sketches, the other filters apply inside each country
+            selected = filters.pop("country")
+            selected = {selected} if isinstance(selected, str) else set(selected)
+            countries = sorted(country for country in signatures if country in selected)
+        key = filters_key(filters)
+        with self._lock:
+            stale = [country for country in countries
+                     if self._sketches.get((country, key), (None,))[0] != signatures[country]]
+        if stale:
+            partitions = [country_partition(country) for country in stale]
+            sketches = (build or self._scan)(partitions, filters)
+            with self._lock:
+                self.scanned += len(stale)
+                for country, sketch in zip(stale, sketches):
+                    self._sketches[(country, key)] = (signatures[country], sketch)
+        merged = KPISketch(self.precision, self.k)
+        with self._lock:
+            for country in countries:
+                entry = self._sketches.get((country, key))
+                if entry is None:  # Dropped by another thread meanwhile: sketched again next time
+                    continue
+                self._sketches.move_to_end((country, key))
+                merged.merge(entry[1])
+            while len(self._sketches) > self.max_entries:
+                self._sketches.popitem(last=False)
+        return merged
+
+    def _scan(self, partitions, filters):
+        conditions, params = self.db_manager._filter_conditions(filters)
+        reader, sketches = self.db_manager.pool.reader(), []
+        for where, partition_params in partitions:
+            cursor = reader.execute(f"SELECT id, {', '.join(SALES_COLUMNS)} FROM sales_data "
+                                    f"WHERE {' AND '.join([where] + conditions)}", partition_params + params)
+            sketches.append(sketch_rows(cursor, self.chunk_size, self.precision, self.k))
+        return sketches
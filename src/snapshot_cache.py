@@ -0,0 +1,57 @@
+import threading
+
+
+class SnapshotCache:
+    """
+    Cache of data loaded from the database, valid as long as the database does not change.
+
+    Every entry belongs to the data version returned by DatabaseManager.data_version(). When a
+    write happens (add, update, delete, import, or a commit from another process) the version
+    changes and the whole cache is dropped on the next access, so repeated views of unchanged data
+    reuse the same snapshot. Cached values are shared between callers and must be treated as read-only.
+
+    Attributes:
+        db_manager (DatabaseManager): The database whose data version keys the cache.
+        max_entries (int): Maximum number of snapshots kept for one data version.
+    """
+    def __init__(self, db_manager, max_entries=64):
+        self.db_manager = db_manager
+        self.max_entries = max_entries
+        self._version = None
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, loader):
+        """
+        Returns the snapshot stored under key for the current data version, loading it if needed.
+
+        Args:
+            key (hashable): Identifies the snapshot, e.g. ('sum_by_country', 'monthly_revenue').
+            loader (callable): Called without arguments to load the snapshot on a cache miss.
+        """
+        version = self.db_manager.data_version()
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            elif key in self._entries:
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        value = loader()  # Loaded outside the lock so that other snapshots can be served meanwhile
+        with self._lock:
+            # Stored under the version read before loading: if a write happened meanwhile, the
+            # version has changed and the entry is dropped on the next access.
+            if version == self._version:
+                if len(self._entries) >= self.max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+                self._entries[key] = value
+        return value
+
+    def invalidate(self):
+        """Drops every snapshot."""
+        with self._lock:
+            self._entries.clear()
+            self._version = None
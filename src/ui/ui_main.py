@@ -18,8 +18,8 @@ from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
 from PySide6.QtWidgets import (QApplication, QDateEdit, QFrame, QGraphicsView,
     QGridLayout, QHBoxLayout, QHeaderView, QLabel,
     QLineEdit, QMainWindow, QMenuBar, QPushButton,
-    QSizePolicy, QSpacerItem, QStatusBar, QTableWidget,
-    QTableWidgetItem, QVBoxLayout, QWidget)
+    QSizePolicy, QSpacerItem, QStatusBar, QTableView,
+    QVBoxLayout, QWidget)
 
 class Ui_MainWindow(object):
     def setupUi(self, MainWindow):
@@ -65,27 +65,7 @@ class Ui_MainWindow(object):
         self.a_title_label.setStyleSheet(u"font: 22pt \"Segoe UI\";\n"
 "background-color: qlineargradient(spread:pad, x1:0.242342, y1:0.699, x2:1, y2:1, stop:0.155251 rgba(0, 0, 0, 255), stop:1 rgba(255, 255, 255, 255));")
         self.a_title_label.setFrameShape(QFrame.Shape.StyledPanel)
-        self.data_tb_wgt = QTableWidget(self.centralwidget)
-        if (self.data_tb_wgt.columnCount() < 9):
-            self.data_tb_wgt.setColumnCount(9)
-        __qtablewidgetitem = QTableWidgetItem()
-        self.data_tb_wgt.setHorizontalHeaderItem(0, __qtablewidgetitem)
-        __qtablewidgetitem1 = QTableWidgetItem()
-        self.data_tb_wgt.setHorizontalHeaderItem(1, __qtablewidgetitem1)
-        __qtablewidgetitem2 = QTableWidgetItem()
-        self.data_tb_wgt.setHorizontalHeaderItem(2, __qtablewidgetitem2)
-        __qtablewidgetitem3 = QTableWidgetItem()
-        self.data_tb_wgt.setHorizontalHeaderItem(3, __qtablewidgetitem3)
-        __qtablewidgetitem4 = QTableWidgetItem()
-        self.data_tb_wgt.setHorizontalHeaderItem(4, __qtablewidgetitem4)
-        __qtablewidgetitem5 = QTableWidgetItem()
-        self.data_tb_wgt.setHorizontalHeaderItem(5, __qtablewidgetitem5)
-        __qtablewidgetitem6 = QTableWidgetItem()
-        self.data_tb_wgt.setHorizontalHeaderItem(6, __qtablewidgetitem6)
-        __qtablewidgetitem7 = QTableWidgetItem()
-        self.data_tb_wgt.setHorizontalHeaderItem(7, __qtablewidgetitem7)
-        __qtablewidgetitem8 = QTableWidgetItem()
-        self.data_tb_wgt.setHorizontalHeaderItem(8, __qtablewidgetitem8)
+        self.data_tb_wgt = QTableView(self.centralwidget)
         self.data_tb_wgt.setObjectName(u"data_tb_wgt")
         self.data_tb_wgt.setGeometry(QRect(20, 470, 1061, 321))
         self.data_tb_wgt.setStyleSheet(u"gridline-color: rgb(85, 0, 127);")
@@ -354,24 +334,6 @@ class Ui_MainWindow(object):
     def retranslateUi(self, MainWindow):
         MainWindow.setWindowTitle(QCoreApplication.translate("MainWindow", u"MainWindow", None))
         self.a_title_label.setText(QCoreApplication.translate("MainWindow", u"Global Sales Dashboard - HAPPY PEOPLE Corp", None))
-        ___qtablewidgetitem = self.data_tb_wgt.horizontalHeaderItem(0)
-        ___qtablewidgetitem.setText(QCoreApplication.translate("MainWindow", u"Nom de la Filiale", None));
-        ___qtablewidgetitem1 = self.data_tb_wgt.horizontalHeaderItem(1)
-        ___qtablewidgetitem1.setText(QCoreApplication.translate("MainWindow", u"Pays", None));
-        ___qtablewidgetitem2 = self.data_tb_wgt.horizontalHeaderItem(2)
-        ___qtablewidgetitem2.setText(QCoreApplication.translate("MainWindow", u"Date", None));
-        ___qtablewidgetitem3 = self.data_tb_wgt.horizontalHeaderItem(3)
-        ___qtablewidgetitem3.setText(QCoreApplication.translate("MainWindow", u"Revenus Mensuels (\u20ac)", None));
-        ___qtablewidgetitem4 = self.data_tb_wgt.horizontalHeaderItem(4)
-        ___qtablewidgetitem4.setText(QCoreApplication.translate("MainWindow", u"Co\u00fbts Mensuels (\u20ac)", None));
-        ___qtablewidgetitem5 = self.data_tb_wgt.horizontalHeaderItem(5)
-        ___qtablewidgetitem5.setText(QCoreApplication.translate("MainWindow", u"Volume des Ventes", None));
-        ___qtablewidgetitem6 = self.data_tb_wgt.horizontalHeaderItem(6)
-        ___qtablewidgetitem6.setText(QCoreApplication.translate("MainWindow", u"Nouveaux Clients", None));
-        ___qtablewidgetitem7 = self.data_tb_wgt.horizontalHeaderItem(7)
-        ___qtablewidgetitem7.setText(QCoreApplication.translate("MainWindow", u"Taux de Satisfaction (%)", None));
-        ___qtablewidgetitem8 = self.data_tb_wgt.horizontalHeaderItem(8)
-        ___qtablewidgetitem8.setText(QCoreApplication.translate("MainWindow", u"D\u00e9penses Publicitaires (\u20ac)", None));
         self.costs_lb.setText(QCoreApplication.translate("MainWindow", u"Co\u00fbts mensuels", None))
         self.fil_name_lb.setText(QCoreApplication.translate("MainWindow", u"Nom de filiale", None))
         self.country_lb.setText(QCoreApplication.translate("MainWindow", u"Pays ", None))
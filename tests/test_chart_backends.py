@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+import unittest
+import pandas as pd
+from PySide6.QtWidgets import QApplication, QGraphicsView
+from components.chart_backends import QtChartsBackend
+
+app = QApplication.instance() or QApplication([])
+
+
+class TestQtChartsBackend(unittest.TestCase):
+    def setUp(self):
+        self.view = QGraphicsView()
+        self.backend = QtChartsBackend()
+
+    def show(self, values, countries=('France', 'Germany')):
+        self.backend.show(self.view, "revenue", pd.Series(values, index=pd.Index(countries, name='country')))
+        return self.backend.charts[self.view]
+
+    def test_chart_is_updated_in_place(self):
+        chart = self.show([1000.0, 2000.0])
+        self.assertIs(self.view.scene(), chart.scene)
+        self.assertIs(self.show([1500.0, 2000.0]), chart)
+        self.assertEqual([chart.bar_set.at(i) for i in range(chart.bar_set.count())], [1500.0, 2000.0])
+        self.show([1.0, 2.0, 3.0], ('France', 'Italy', 'Spain'))
+        self.assertEqual(chart.axis_x.categories(), ['France', 'Italy', 'Spain'])
+        self.assertGreaterEqual(chart.axis_y.max(), 3.0)
+
+    def test_chart_follows_the_view_size(self):
+        chart = self.show([1000.0, 2000.0])
+        self.view.show()
+        self.view.resize(700, 400)
+        app.processEvents()
+        size = self.view.viewport().size()
+        self.assertEqual((chart.chart.size().width(), chart.chart.size().height()), (size.width(), size.height()))
+
+    def test_does_not_import_matplotlib(self):
+        code = ("import sys, pandas as pd\n"
+                "from PySide6.QtWidgets import QApplication, QGraphicsView\n"
+                "from components.chart_backends import QtChartsBackend\n"
+                "app = QApplication([])\n"
+                "QtChartsBackend().show(QGraphicsView(), 'costs', pd.Series([1.0], index=['France']))\n"
+                "print('matplotlib' in sys.modules)\n")
+        src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+        result = subprocess.run([sys.executable, "-c", code], cwd=src, capture_output=True, text=True,
+                                env=dict(os.environ, QT_QPA_PLATFORM="offscreen"), timeout=60)
+        self.assertEqual(result.stdout.strip().splitlines()[-1], "False", result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import threading
+import unittest
+import numpy as np
+import pandas as pd
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QApplication
+from components.chart_renderer import CHART_SIZE, CHARTS, ChartRenderer, ChartSlot
+
+app = QApplication.instance() or QApplication([])
+
+
+class TestChartRenderer(unittest.TestCase):
+    def setUp(self):
+        self.renderer = ChartRenderer(max_entries=2)
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        return pd.Series([1000.0, 2000.0], index=pd.Index(['France', 'Germany'], name='country'))
+
+    def test_unchanged_chart_is_drawn_once(self):
+        image = self.renderer.render("revenue", (1, 0), self.load)
+        self.assertEqual((image.image.width(), image.image.height()), CHART_SIZE)
+        self.assertIs(self.renderer.render("revenue", (1, 0), self.load), image)
+        self.assertEqual(self.loads, 1)
+        # Nouvelle version des données, autres filtres ou autre taille : nouveau rendu
+        self.renderer.render("revenue", (2, 0), self.load)
+        self.renderer.render("revenue", (2, 0), self.load, {"country": ["France"]})
+        self.renderer.render("revenue", (2, 0), self.load, size=(300, 200))
+        self.assertEqual(self.loads, 4)
+
+    def test_least_recently_used_chart_is_evicted(self):
+        self.renderer.render("revenue", 1, self.load)
+        self.renderer.render("costs", 1, self.load)
+        self.renderer.render("revenue", 1, self.load)  # revenue devient le plus récent
+        self.renderer.render("revenue", 2, self.load)  # évince costs
+        self.renderer.render("revenue", 1, self.load)
+        self.assertEqual(self.loads, 3)
+        self.renderer.render("costs", 1, self.load)
+        self.assertEqual(self.loads, 4)
+
+    def test_rendered_in_a_worker_thread_with_true_colors(self):
+        images = []
+        worker = threading.Thread(target=lambda: images.append(self.renderer.render("revenue", 1, self.load)))
+        worker.start()
+        worker.join()
+        image = images[0]
+        # L'image lit les pixels du tableau, sans copie
+        self.assertEqual(np.frombuffer(image.image.constBits(), np.uint8).ctypes.data, image.pixels.ctypes.data)
+        # Les barres de revenus sont bleues (Agg produit du RGBA)
+        y, x = np.argwhere((image.pixels == (0, 0, 255, 255)).all(axis=2))[0]
+        self.assertEqual(image.image.pixelColor(int(x), int(y)), QColor(0, 0, 255))
+        pixmap = image.to_pixmap()
+        self.assertEqual(pixmap.toImage().pixelColor(int(x), int(y)), QColor(0, 0, 255))
+
+    def test_empty_series_has_no_chart(self):
+        self.assertIsNone(self.renderer.render("costs", 1, lambda: pd.Series(dtype=float)))
+
+
+class TestChartSlot(unittest.TestCase):
+    def setUp(self):
+        self.slot = ChartSlot(CHARTS["revenue"])
+        self.index = pd.Index(['France', 'Germany', 'Italy'], name='country')
+
+    def render(self, values, index=None):
+        return bytes(self.slot.update(pd.Series(values, index=self.index if index is None else index)))
+
+    def test_small_edit_only_redraws_the_bars(self):
+        first = self.render([1000.0, 2000.0, 1500.0])
+        edited = self.render([1100.0, 2000.0, 1500.0])  # Même échelle : blitting
+        self.assertEqual((self.slot.full_draws, self.slot.blits), (1, 1))
+        self.assertNotEqual(edited, first)
+        self.assertEqual(self.render([1000.0, 2000.0, 1500.0]), first)
+
+    def test_same_pixels_as_a_new_figure(self):
+        self.render([1000.0, 2000.0, 1500.0])
+        self.render([10.0, 20.0, 15.0])  # Nouvelle échelle : redessin complet
+        index = pd.Index(['Spain', 'France'], name='country')
+        updated = self.render([5.0, 15.0], index)  # Autres pays : barres recréées
+        self.assertEqual(self.slot.full_draws, 3)
+        self.assertEqual(updated, bytes(ChartSlot(CHARTS["revenue"]).update(pd.Series([5.0, 15.0], index=index))))
+
+
+if __name__ == '__main__':
+    unittest.main()
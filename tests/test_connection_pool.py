@@ -0,0 +1,116 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from connection_pool import ConnectionPool
+
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.pool = ConnectionPool(os.path.join(self.tmp_dir.name, 'pool.db'))
+        with self.pool.transaction() as cursor:
+            cursor.execute("CREATE TABLE t (value INTEGER)")
+
+    def tearDown(self):
+        self.pool.close()
+        self.tmp_dir.cleanup()
+
+    def test_wal_mode_enabled(self):
+        self.assertEqual(self.pool.writer.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+    def test_each_thread_gets_its_own_reader(self):
+        readers, done = [], threading.Event()
+
+        def read():
+            readers.append(self.pool.reader())
+            done.wait(5)  # Garde sa connexion pendant la comparaison
+        thread = threading.Thread(target=read)
+        thread.start()
+        while not readers:
+            time.sleep(0.01)
+        self.assertIs(self.pool.reader(), self.pool.reader())
+        self.assertIsNot(self.pool.reader(), readers[0])
+        done.set()
+        thread.join()
+
+    def test_reader_is_released_when_its_thread_ends(self):
+        def read():
+            self.pool.reader().execute("SELECT COUNT(*) FROM t").fetchone()
+        for _ in range(20):
+            thread = threading.Thread(target=read)
+            thread.start()
+            thread.join()
+        # Chaque thread a rendu sa connexion, réutilisée par le suivant
+        self.assertEqual(self.pool.reader_count(), 1)
+
+    def test_readers_are_read_only(self):
+        with self.assertRaises(sqlite3.OperationalError):
+            self.pool.reader().execute("INSERT INTO t VALUES (1)")
+
+    def test_transaction_rolls_back_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with self.pool.transaction() as cursor:
+                cursor.execute("INSERT INTO t VALUES (1)")
+                raise RuntimeError("boom")
+        self.assertEqual(self.pool.reader().execute("SELECT COUNT(*) FROM t").fetchone()[0], 0)
+
+    def test_reads_do_not_block_on_pending_write(self):
+        # Une transaction d'écriture ouverte ne bloque pas les lecteurs en mode WAL
+        with self.pool.transaction() as cursor:
+            cursor.execute("INSERT INTO t VALUES (1)")
+            counts = []
+            thread = threading.Thread(
+                target=lambda: counts.append(self.pool.reader().execute("SELECT COUNT(*) FROM t").fetchone()[0]))
+            thread.start()
+            thread.join(timeout=5)
+            self.assertEqual(counts, [0])
+        self.assertEqual(self.pool.reader().execute("SELECT COUNT(*) FROM t").fetchone()[0], 1)
+
+    def test_data_version_does_not_wait_for_pending_write(self):
+        before = self.pool.data_version()
+        started, release = threading.Event(), threading.Event()
+
+        def write():
+            with self.pool.transaction() as cursor:
+                cursor.execute("INSERT INTO t VALUES (1)")
+                started.set()
+                release.wait(5)
+        thread = threading.Thread(target=write)
+        thread.start()
+        started.wait(5)
+        start = time.perf_counter()
+        self.assertEqual(self.pool.data_version(), before)
+        self.assertLess(time.perf_counter() - start, 1)
+        release.set()
+        thread.join()
+        self.assertNotEqual(self.pool.data_version(), before)
+
+    def test_data_version_is_the_same_in_every_thread(self):
+        before = self.pool.data_version()  # Les connexions ouvertes avant et après l'écriture doivent s'accorder
+        with self.pool.transaction() as cursor:
+            cursor.execute("INSERT INTO t VALUES (1)")
+        versions = []
+        thread = threading.Thread(target=lambda: versions.append(self.pool.data_version()))
+        thread.start()
+        thread.join()
+        self.assertEqual(self.pool.data_version(), versions[0])
+        self.assertNotEqual(before, versions[0])
+
+    def test_concurrent_writers_are_serialized(self):
+        def write():
+            for _ in range(50):
+                with self.pool.transaction() as cursor:
+                    cursor.execute("INSERT INTO t VALUES (1)")
+        threads = [threading.Thread(target=write) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.pool.reader().execute("SELECT COUNT(*) FROM t").fetchone()[0], 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
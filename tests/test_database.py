@@ -0,0 +1,278 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from database import DatabaseManager
+
+
+def make_entry(filiale_name="Paris", country="France", date="2024-01-30", revenue=1000.0, costs=400.0,
+               advertising_costs=100.0):
+    return {
+        "filiale_name": filiale_name,
+        "country": country,
+        "date": date,
+        "monthly_revenue": revenue,
+        "monthly_costs": costs,
+        "sales_volume": 10,
+        "new_clients": 5,
+        "satisfaction_rate": 90,
+        "advertising_costs": advertising_costs
+    }
+
+
+class DatabaseTestCase(unittest.TestCase):
+    def setUp(self):
+        # Chaque test utilise une base temporaire et une nouvelle instance du singleton
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        DatabaseManager._instance = None
+        self.db = DatabaseManager(os.path.join(self.tmp_dir.name, 'test.db'))
+
+    def tearDown(self):
+        self.db.close()
+        DatabaseManager._instance = None
+        self.tmp_dir.cleanup()
+
+
+class TestDatabaseManager(DatabaseTestCase):
+    def test_add_entries_inserts_all_rows_in_batches(self):
+        entries = [make_entry(filiale_name=f"Filiale{i}") for i in range(25)]
+        self.assertEqual(self.db.add_entries(entries, batch_size=10), 25)
+        self.assertEqual(len(self.db.fetch_all()), 25)
+
+    def test_add_entries_accepts_sequences_and_generators(self):
+        entries = (tuple(make_entry().values()) for _ in range(3))
+        self.assertEqual(self.db.add_entries(entries), 3)
+
+    def test_update_entries_is_atomic(self):
+        self.db.add_entries([make_entry("Paris"), make_entry("Lyon")])
+        paris_id, lyon_id = [row[0] for row in self.db.fetch_all()]
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.db.update_entries([dict(make_entry("Nice"), id=paris_id),
+                                    dict(make_entry("Metz", date="invalid"), id=lyon_id)])
+        self.assertEqual([row[1] for row in self.db.fetch_all()], ["Paris", "Lyon"])
+        self.assertEqual(self.db.update_entries([dict(make_entry("Nice"), id=lyon_id)]), 1)
+        self.assertEqual([row[1] for row in self.db.fetch_all()], ["Paris", "Nice"])
+
+    def test_delete_entries_in_one_statement(self):
+        self.db.add_entries([make_entry(f"Filiale{i}") for i in range(5000)])
+        ids = [row[0] for row in self.db.fetch_all()]
+        self.assertEqual(self.db.delete_entries(ids[:4000]), 4000)
+        self.assertEqual([row[0] for row in self.db.fetch_all()], ids[4000:])
+        self.assertEqual(self.db.fetch_totals()["row_count"], 1000)
+        self.assertEqual(self.db.delete_entries([]), 0)
+
+    def test_delete_where(self):
+        self.db.add_entries([make_entry("Paris", "France", "2024-01-30"), make_entry("Lyon", "France", "2024-03-31"),
+                             make_entry("Berlin", "Germany", "2024-02-28")])
+        deleted = self.db.delete_where({"country": "France", "date_from": "2024-02-01", "date_to": "31/03/2024"})
+        self.assertEqual(len(deleted), 1)
+        self.assertEqual([row[1] for row in self.db.fetch_all()], ["Paris", "Berlin"])
+        with self.assertRaises(ValueError):
+            self.db.delete_where({})
+
+    def test_add_entries_rejects_malformed_rows(self):
+        with self.assertRaises(ValueError):
+            self.db.add_entries([("Paris", "France")])
+
+
+class TestPagination(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        countries = ["France", "Germany", "Spain"]
+        self.db.add_entries([make_entry(f"Filiale{i}", countries[i % 3]) for i in range(23)])
+
+    def test_fetch_page_follows_keyset(self):
+        first = self.db.fetch_page(limit=10)
+        second = self.db.fetch_page(after_id=first[-1][0], limit=10)
+        self.assertEqual([row[0] for row in first + second], list(range(1, 21)))
+
+    def test_iter_rows_streams_every_row_in_order(self):
+        self.assertEqual(list(self.db.iter_rows(batch_size=5)), self.db.fetch_all())
+
+    def test_iter_rows_ordered_by_column_with_filters(self):
+        rows = list(self.db.iter_rows(batch_size=4, order_by="country", filters={"country": ["France", "Spain"]}))
+        self.assertEqual(len(rows), 15)
+        self.assertEqual([(row[2], row[0]) for row in rows], sorted((row[2], row[0]) for row in rows))
+        self.assertEqual({row[2] for row in rows}, {"France", "Spain"})
+
+    def test_iter_rows_ordered_by_column_with_null_values(self):
+        self.db.add_entries([make_entry(f"Inconnue{i}", None) for i in range(5)])
+        rows = list(self.db.iter_rows(batch_size=3, order_by="country"))
+        self.assertEqual(len(rows), 28)
+        self.assertEqual([row[0] for row in rows[:5]], list(range(24, 29)))
+        self.assertEqual([(row[2], row[0]) for row in rows[5:]], sorted((row[2], row[0]) for row in rows[5:]))
+
+    def test_fetch_page_rejects_unknown_columns(self):
+        with self.assertRaises(ValueError):
+            self.db.fetch_page(order_by="1; DROP TABLE sales_data")
+        with self.assertRaises(ValueError):
+            self.db.fetch_page(filters={"nope": 1})
+        with self.assertRaises(ValueError):
+            self.db.fetch_page(after_id=3, order_by="country")
+
+
+class TestAggregations(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.db.add_entries([
+            make_entry("Paris", "France", "2024-01-30", 1000.0, 400.0, 100.0),
+            make_entry("Lyon", "France", "2024-01-30", 500.0, 100.0, 50.0),
+            make_entry("Berlin", "Germany", "2024-01-30", 2000.0, 900.0, 0.0),
+            make_entry("Paris", "France", "2024-02-28", 800.0, 300.0, 20.0),
+        ])
+
+    def test_fetch_totals(self):
+        totals = self.db.fetch_totals()
+        self.assertEqual(totals["row_count"], 4)
+        self.assertAlmostEqual(totals["monthly_revenue"], 4300.0)
+        self.assertAlmostEqual(totals["monthly_costs"], 1700.0)
+        self.assertAlmostEqual(totals["net_income"], 4300.0 - 1700.0 - 170.0)
+
+    def test_fetch_totals_on_empty_table(self):
+        self.db.connection.execute("DELETE FROM sales_data")
+        self.db.connection.commit()
+        self.assertIsNone(self.db.fetch_totals())
+
+    def test_fetch_sum_by_country(self):
+        self.assertEqual(self.db.fetch_sum_by_country("monthly_revenue"), [("France", 2300.0), ("Germany", 2000.0)])
+        with self.assertRaises(ValueError):
+            self.db.fetch_sum_by_country("country; DROP TABLE sales_data")
+
+    def test_fetch_net_income_by_country_date(self):
+        self.assertEqual(self.db.fetch_net_income_by_country_date("country"), [
+            ("France", "2024-01-30", 850.0), ("France", "2024-02-28", 480.0), ("Germany", "2024-01-30", 1100.0)])
+        self.assertEqual(self.db.fetch_net_income_by_country_date("date"), [
+            ("2024-01-30", "France", 850.0), ("2024-01-30", "Germany", 1100.0), ("2024-02-28", "France", 480.0)])
+
+    def test_fetch_net_income_by_period(self):
+        self.db.add_entries([make_entry("Paris", "France", "2024-01-05", 100.0, 0.0, 0.0),
+                             make_entry("Paris", "France", "2025-04-30", 10.0, 0.0, 0.0)])
+        self.assertEqual(self.db.fetch_net_income_by_period("month"), [
+            ("France", "2024-01", 950.0), ("France", "2024-02", 480.0), ("France", "2025-04", 10.0),
+            ("Germany", "2024-01", 1100.0)])
+        self.assertEqual(self.db.fetch_net_income_by_period("quarter", "date"), [
+            ("2024-Q1", "France", 1430.0), ("2024-Q1", "Germany", 1100.0), ("2025-Q2", "France", 10.0)])
+        self.assertEqual(self.db.fetch_net_income_by_period("year"), [
+            ("France", "2024", 1430.0), ("France", "2025", 10.0), ("Germany", "2024", 1100.0)])
+        with self.assertRaises(ValueError):
+            self.db.fetch_net_income_by_period("week")
+
+    def test_fetch_kpis_by_country(self):
+        rows = {row[0]: row[1:] for row in self.db.fetch_kpis(("country",))}
+        revenue, costs, net_income, margin, roas, cost_per_client, satisfaction = rows["France"]
+        self.assertEqual((revenue, costs, net_income), (2300.0, 800.0, 1330.0))
+        self.assertAlmostEqual(margin, 100 * 1500.0 / 2300.0)
+        self.assertAlmostEqual(roas, 2300.0 / 170.0)
+        self.assertAlmostEqual(cost_per_client, 170.0 / 15)
+        self.assertAlmostEqual(satisfaction, 90.0)
+        self.assertIsNone(rows["Germany"][4])  # ROAS sans coûts publicitaires
+
+    def test_fetch_kpis_by_filiale_and_period(self):
+        self.db.add_entry(**dict(make_entry("Paris", "France", "2024-02-10", 200.0, 100.0, 10.0),
+                                 sales_volume=30, satisfaction_rate=50))
+        rows = self.db.fetch_kpis(("filiale_name", "country"), "month", ["revenue", "weighted_satisfaction"])
+        self.assertEqual([row[:4] for row in rows], [
+            ("Berlin", "Germany", "2024-01", 2000.0), ("Lyon", "France", "2024-01", 500.0),
+            ("Paris", "France", "2024-01", 1000.0), ("Paris", "France", "2024-02", 1000.0)])
+        self.assertAlmostEqual(rows[-1][4], (90 * 10 + 50 * 30) / 40)  # Pondérée par le volume de ventes
+
+    def test_fetch_kpis_rejects_unknown_names(self):
+        with self.assertRaises(ValueError):
+            self.db.fetch_kpis(metrics=["revenue; DROP TABLE sales_data"])
+        with self.assertRaises(ValueError):
+            self.db.fetch_kpis(("date",))
+
+    def test_fetch_rolling_net_income(self):
+        self.db.add_entry(**make_entry("Paris", "France", "2024-04-30", 10.0, 0.0, 0.0))
+        # Fenêtre de 3 mois calendaires : avril ne reprend que février (mars est vide) et pas janvier
+        self.assertEqual(self.db.fetch_net_income_by_period("month", rolling_months=3), [
+            ("France", "2024-01", 850.0), ("France", "2024-02", 1330.0), ("France", "2024-04", 490.0),
+            ("Germany", "2024-01", 1100.0)])
+        with self.assertRaises(ValueError):
+            self.db.fetch_net_income_by_period("year", rolling_months=3)
+
+    def test_filtered_totals_from_rollup_and_table(self):
+        # Pays et dates : lus dans le rollup kpi_country_date
+        totals = self.db.fetch_totals({"country": ["France"], "date_from": "2024-02-01"})
+        self.assertEqual((totals["row_count"], totals["net_income"]), (1, 480.0))
+        # Filiales et seuils : requête sur sales_data
+        totals = self.db.fetch_totals({"filiale_name": ["Paris", "Lyon"], "min_monthly_revenue": 900})
+        self.assertEqual((totals["row_count"], totals["monthly_revenue"]), (1, 1000.0))
+        self.assertIsNone(self.db.fetch_totals({"country": "Spain"}))
+        with self.assertRaises(ValueError):
+            self.db.fetch_totals({"min_country": 1})
+
+    def test_rollup_and_table_paths_agree(self):
+        # Une ligne sans date : les bornes de dates l'excluent dans les deux chemins
+        self.db.add_entries([make_entry("Nice", "France", None, 5000.0, 0.0, 0.0)])
+        for filters in ({"date_to": "2024-02-01"}, {"country": ["France"], "date_from": "2024-01-01"}, {"country": "France"}):
+            table_filters = dict(filters, min_monthly_revenue=-1e18)  # Toujours vrai, mais lu dans sales_data
+            rollup_totals, table_totals = self.db.fetch_totals(filters), self.db.fetch_totals(table_filters)
+            self.assertEqual(rollup_totals, table_totals)
+            self.assertIsInstance(rollup_totals["row_count"], int)
+            self.assertEqual(self.db.fetch_sum_by_country("monthly_revenue", filters),
+                             self.db.fetch_sum_by_country("monthly_revenue", table_filters))
+            self.assertEqual(self.db.fetch_net_income_by_period("month", filters=filters),
+                             self.db.fetch_net_income_by_period("month", filters=table_filters))
+            self.assertEqual(self.db.fetch_top_kpis("revenue", 5, ("country",), filters=filters),
+                             self.db.fetch_top_kpis("revenue", 5, ("country",), filters=table_filters))
+        self.assertEqual(self.db.fetch_totals({"date_to": "2024-02-01"})["monthly_revenue"], 3500.0)
+
+    def test_filtered_aggregates(self):
+        filters = {"max_monthly_costs": 400}
+        self.assertEqual(self.db.fetch_sum_by_country("monthly_revenue", filters), [("France", 2300.0)])
+        self.assertEqual(self.db.fetch_net_income_by_period("month", filters={"filiale_name": "Paris"}), [
+            ("France", "2024-01", 500.0), ("France", "2024-02", 480.0)])
+
+    def test_fetch_top_kpis(self):
+        self.assertEqual(self.db.fetch_top_kpis("net_income", 2), [("Berlin", "Germany", 1100.0),
+                                                                   ("Paris", "France", 980.0)])
+        self.assertEqual(self.db.fetch_top_kpis("revenue", 1, ("country",), ascending=True), [("Germany", 2000.0)])
+        # Marge (non additive) : calculée sur sales_data, avec un filtre de dates
+        rows = self.db.fetch_top_kpis("gross_margin_pct", 5, ("filiale_name",), filters={"date_to": "2024-01-31"})
+        self.assertEqual([row[0] for row in rows], ["Lyon", "Paris", "Berlin"])
+        with self.assertRaises(ValueError):
+            self.db.fetch_top_kpis("net_income; DROP TABLE sales_data")
+
+    def test_filters_use_indexes(self):
+        conditions, params = self.db._filter_conditions({"filiale_name": ["Paris"], "date_from": "2024-01-01"})
+        plan = self.db.connection.execute(
+            f"EXPLAIN QUERY PLAN SELECT * FROM sales_data WHERE {' AND '.join(conditions)}", params).fetchall()
+        self.assertTrue(any("USING INDEX" in row[-1] for row in plan), plan)
+
+
+class TestRollups(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.db.add_entries([
+            make_entry("Paris", "France", "2024-01-30", 1000.0, 400.0, 100.0),
+            make_entry("Berlin", "Germany", "2024-01-30", 2000.0, 900.0, 0.0),
+        ])
+
+    def rollup_rows(self, table):
+        return self.db.connection.execute(f"SELECT * FROM {table} ORDER BY 1, 2").fetchall()
+
+    def test_rollups_follow_updates_and_deletes(self):
+        paris_id, berlin_id = [row[0] for row in self.db.fetch_all()]
+        entry = make_entry("Berlin", "Austria", "2024-03-31", 300.0, 100.0, 10.0)
+        self.db.update_entry(berlin_id, **entry)
+        self.assertEqual(self.db.fetch_sum_by_country("monthly_revenue"), [("Austria", 300.0), ("France", 1000.0)])
+        self.db.delete_entry(paris_id)
+        self.assertEqual(self.db.fetch_sum_by_country("monthly_revenue"), [("Austria", 300.0)])
+        self.assertEqual(self.db.fetch_net_income_by_country_date(), [("Austria", "2024-03-31", 190.0)])
+        self.assertEqual(self.db.fetch_sum_by_filiale("monthly_costs"), [("Berlin", "Austria", 100.0)])
+        self.db.delete_entry(berlin_id)
+        self.assertIsNone(self.db.fetch_totals())
+
+    def test_rebuild_recovers_from_drift(self):
+        expected = {table: self.rollup_rows(table) for table in ("kpi_totals", "kpi_country", "kpi_filiale")}
+        self.db.connection.execute("UPDATE kpi_country SET monthly_revenue = 0")
+        self.db.connection.execute("DELETE FROM kpi_filiale")
+        self.db.connection.commit()
+        self.db.rebuild_rollups()
+        for table, rows in expected.items():
+            self.assertEqual(self.rollup_rows(table), rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
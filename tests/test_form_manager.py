@@ -4,7 +4,7 @@ from PySide6.QtCore import QDate
 from PySide6.QtWidgets import QLineEdit, QDateEdit, QApplication
 from src.components.form_manager import FormManager
 
-app = QApplication([])
+app = QApplication.instance() or QApplication([])
 class TestFormManager(unittest.TestCase):
     def setUp(self):
         # Initialise les objets nécessaires avant chaque test
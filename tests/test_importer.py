@@ -0,0 +1,40 @@
+import csv
+import os
+import unittest
+from database import SALES_COLUMNS
+from importer import SalesImporter
+from test_database import DatabaseTestCase, make_entry
+
+
+class TestSalesImporter(DatabaseTestCase):
+    def write_csv(self, rows):
+        path = os.path.join(self.tmp_dir.name, 'import.csv')
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.DictWriter(file, fieldnames=SALES_COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
+
+    def test_import_csv_in_chunks(self):
+        path = self.write_csv([make_entry(filiale_name=f"Filiale{i}") for i in range(12)])
+        report = SalesImporter(self.db, chunk_size=5).import_file(path)
+        self.assertEqual(report["rows"], 12)
+        self.assertIn("rows_per_sec", report)
+        row = self.db.fetch_all()[0]
+        self.assertIsInstance(row[4], float)  # monthly_revenue converti en nombre
+        self.assertIsInstance(row[6], int)  # sales_volume converti en entier
+
+    def test_import_csv_with_invalid_value(self):
+        entry = make_entry()
+        entry["sales_volume"] = "abc"
+        path = self.write_csv([entry])
+        with self.assertRaises(ValueError):
+            SalesImporter(self.db).import_file(path)
+
+    def test_unsupported_extension(self):
+        with self.assertRaises(ValueError):
+            SalesImporter(self.db).import_file("data.xlsx")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+import numpy as np
+import pandas as pd
+from kpi_compute import NET_INCOME, income_orderings, income_tables, net_income_by_country_date
+
+
+class TestKPICompute(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'country': ['France', 'Germany', 'France', 'France'],
+            'date': ['2024-02-28', '2024-01-30', '2024-01-30', '2024-01-30'],
+            'monthly_revenue': [800.0, 2000.0, 1000.0, 500.0],
+            'monthly_costs': [300.0, 900.0, 400.0, np.nan],
+            'advertising_costs': [20.0, 0.0, 100.0, 50.0],
+        })
+
+    def test_net_income_by_country_date(self):
+        income = net_income_by_country_date(self.df).set_index(['country', 'date'])[NET_INCOME]
+        self.assertAlmostEqual(income[('France', '2024-01-30')], 950.0)  # Les coûts manquants comptent pour 0
+        self.assertAlmostEqual(income[('France', '2024-02-28')], 480.0)
+        self.assertEqual(len(income), 3)
+
+    def test_income_tables_orderings(self):
+        by_country_date, by_date_country = income_tables(self.df)
+        self.assertEqual(by_country_date.columns.tolist(), ['country', 'date', NET_INCOME])
+        self.assertEqual(by_country_date[['country', 'date']].values.tolist(),
+                         [['France', '2024-01-30'], ['France', '2024-02-28'], ['Germany', '2024-01-30']])
+        self.assertEqual(by_date_country.columns.tolist(), ['date', 'country', NET_INCOME])
+        self.assertEqual(by_date_country[['date', 'country']].values.tolist(),
+                         [['2024-01-30', 'France'], ['2024-01-30', 'Germany'], ['2024-02-28', 'France']])
+
+    def test_income_orderings_by_period(self):
+        income = pd.DataFrame({'country': ['Germany', 'France', 'France'], 'quarter': ['2024-Q1', '2024-Q2', '2024-Q1'],
+                               NET_INCOME: [1.0, 2.0, 3.0]})
+        by_country_quarter, by_quarter_country = income_orderings(income, 'quarter')
+        self.assertEqual(by_country_quarter.columns.tolist(), ['country', 'quarter', NET_INCOME])
+        self.assertEqual(by_country_quarter[NET_INCOME].tolist(), [3.0, 2.0, 1.0])
+        self.assertEqual(by_quarter_country[NET_INCOME].tolist(), [3.0, 1.0, 2.0])
+
+    def test_income_orderings_of_empty_table(self):
+        empty = pd.DataFrame(columns=['country', 'date', NET_INCOME])
+        by_country_date, by_date_country = income_orderings(empty)
+        self.assertTrue(by_country_date.empty and by_date_country.empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import pandas as pd
+from PySide6.QtWidgets import QApplication
+from components.kpi_window import KPIManager, RANKING_CHOICES, TOP_N
+from test_database import DatabaseTestCase, make_entry
+
+app = QApplication.instance() or QApplication([])
+
+
+class TestKPIManager(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        countries = ["France", "Germany", "Italy", "Spain"]
+        self.db.add_entries([make_entry(f"F{i % 17}", countries[i % 4], f"2024-0{1 + i % 6}-15", float(i * 37 % 1000),
+                                        float(i % 13), float(i % 7)) for i in range(200)])
+        # Égalités en tête des classements : départagées par groupe comme en SQL, quel que soit le moteur
+        self.db.add_entries([make_entry(name, country, "2024-03-15", 50000.0, 0.0, 0.0)
+                             for name, country in (("TieB", "Spain"), ("TieA", "Spain"), ("TieC", "Italy"))])
+        self.kpi_manager = KPIManager(self.db)
+
+    def tearDown(self):
+        self.kpi_manager.query_executor.shutdown()
+        self.kpi_manager.shutdown_workers()
+        super().tearDown()
+
+    def assert_rankings_match_sql(self, filters=None):
+        for _, group_by, metric, ascending in RANKING_CHOICES:
+            self.kpi_manager.set_engine("sql")
+            expected = self.kpi_manager.top_kpis(metric, TOP_N, group_by, ascending, filters)
+            self.kpi_manager.set_engine(self.engine)
+            actual = self.kpi_manager.top_kpis(metric, TOP_N, group_by, ascending, filters)
+            pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+    def test_store_engine_ranks_like_sql(self):
+        self.engine = "store"
+        self.assert_rankings_match_sql()
+        self.assert_rankings_match_sql({"country": ["France", "Spain"], "min_monthly_revenue": 200})
+
+    def test_streaming_engine_ranks_like_sql(self):
+        self.engine = "streaming"
+        self.kpi_manager.chunk_size = 30
+        self.assert_rankings_match_sql()
+        self.assert_rankings_match_sql({"country": ["France", "Spain"], "min_monthly_revenue": 200})
+
+    def test_parallel_engine_ranks_like_sql(self):
+        self.engine = "parallel"
+        for partition_by in ("country", "date"):
+            self.kpi_manager.set_engine("parallel", workers=2, partition_by=partition_by)
+            self.assert_rankings_match_sql({"country": ["France", "Spain"], "min_monthly_revenue": 200})
+        self.assert_rankings_match_sql()
+
+    def test_approximate_kpis_are_shown_with_their_error(self):
+        data = self.kpi_manager.load_display_data(filters={"country": ["France", "Spain"]}, approximate=True)
+        row_count, distinct, percentiles = data[-1]
+        self.assertEqual(row_count, 102)
+        self.assertEqual(distinct["country"].tolist(), ["France", "Spain"])
+        self.assertEqual(set(percentiles["measure"]), {"monthly_revenue", "satisfaction_rate"})
+        self.assertTrue((distinct["error"] > 0).all() and (percentiles["rank_error"] > 0).all())
+        self.kpi_manager.show_display_data(data)
+        self.assertFalse(self.kpi_manager.distinct_table.isHidden())
+        self.assertIsNone(data[2])  # Le catalogue exact n'est pas calculé en mode approximatif
+        self.assertTrue(self.kpi_manager.kpi_catalog_table.isHidden())
+        self.assertEqual(self.kpi_manager.distinct_table.rowCount(), 2)
+        self.kpi_manager.show_display_data(self.kpi_manager.load_display_data())
+        self.assertTrue(self.kpi_manager.distinct_table.isHidden())
+        self.assertFalse(self.kpi_manager.kpi_catalog_table.isHidden())
+
+    def test_approximate_kpis_only_rescan_changed_countries(self):
+        for engine in ("sql", "parallel"):
+            self.kpi_manager.set_engine(engine, workers=2)
+            sketches = self.kpi_manager.country_sketches
+            scanned = sketches.scanned if sketches else 0
+            self.assertEqual(self.kpi_manager.approximate_kpis().row_count, 203)
+            self.assertEqual(self.kpi_manager.country_sketches.scanned - scanned, 4 if engine == "sql" else 0)
+            row = self.db.fetch_page(filters={"country": "France"}, limit=1)[0]  # (id, filiale, pays, date, revenu, ...)
+            self.db.update_entry(*row[:4], row[4] + 1, *row[5:])
+            self.assertEqual(self.kpi_manager.approximate_kpis().row_count, 203)
+            self.assertEqual(self.kpi_manager.country_sketches.scanned - scanned, 5 if engine == "sql" else 1)
+
+    def test_unknown_engine_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.kpi_manager.set_engine("nope")
+        with self.assertRaises(ValueError):
+            self.kpi_manager.set_engine("parallel", partition_by="filiale_name")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import sqlite3
+import unittest
+from database import DatabaseManager
+from migrations import SCHEMA_VERSION, get_schema_version, normalize_date
+from test_database import DatabaseTestCase, make_entry
+
+
+class TestMigrations(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.db.close()
+        DatabaseManager._instance = None
+        # Base créée par une ancienne version de l'application (user_version = 0, dates libres)
+        self.legacy_path = os.path.join(self.tmp_dir.name, 'legacy.db')
+        connection = sqlite3.connect(self.legacy_path)
+        connection.execute("""
+            CREATE TABLE sales_data (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, filiale_name TEXT, country TEXT, date TEXT,
+                monthly_revenue REAL, monthly_costs REAL, sales_volume INTEGER, new_clients INTEGER,
+                satisfaction_rate INTEGER, advertising_costs REAL)
+        """)
+        connection.executemany(
+            "INSERT INTO sales_data (filiale_name, country, date) VALUES (?, ?, ?)",
+            [("Paris", "France", "30/01/2024"), ("Lyon", "France", "2024-02-01"), ("Nice", "France", "janvier")])
+        connection.commit()
+        connection.close()
+        self.db = DatabaseManager(self.legacy_path)
+
+    def test_legacy_database_is_upgraded_in_place(self):
+        self.assertEqual(get_schema_version(self.db.connection), SCHEMA_VERSION)
+        dates = [row[3] for row in self.db.fetch_all()]
+        self.assertEqual(dates, ["2024-01-30", "2024-02-01", "janvier"])
+        indexes = {row[0] for row in self.db.connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'sales_data'")}
+        self.assertTrue({"idx_sales_country_date", "idx_sales_date_country", "idx_sales_filiale"} <= indexes)
+
+    def test_country_lookup_uses_index(self):
+        plan = self.db.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM sales_data WHERE country = ? AND date >= ?",
+            ("France", "2024-01-01")).fetchall()
+        self.assertIn("idx_sales_country_date", " ".join(str(step) for step in plan))
+
+    def test_reopening_keeps_version(self):
+        self.db.close()
+        DatabaseManager._instance = None
+        self.db = DatabaseManager(self.legacy_path)
+        self.assertEqual(get_schema_version(self.db.connection), SCHEMA_VERSION)
+        self.assertEqual(len(self.db.fetch_all()), 3)
+
+    def test_new_dates_are_normalized_and_invalid_dates_rejected(self):
+        self.db.add_entries([make_entry(date="15.03.2024")])
+        self.assertEqual(self.db.fetch_all()[-1][3], "2024-03-15")
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.db.add_entries([make_entry(date="mars 2024")])
+
+    def test_rows_with_unparsed_legacy_dates_stay_editable(self):
+        nice_id = self.db.fetch_all()[-1][0]
+        self.db.update_entries([dict(make_entry("Nice", date="janvier"), id=nice_id)])
+        self.assertEqual(self.db.fetch_all()[-1][1:4], ("Nice", "France", "janvier"))
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.db.update_entries([dict(make_entry("Nice", date="février"), id=nice_id)])
+        self.db.update_entries([dict(make_entry("Nice", date="01/01/2024"), id=nice_id)])
+        self.assertEqual(self.db.fetch_all()[-1][3], "2024-01-01")
+
+    def test_normalize_date(self):
+        self.assertEqual(normalize_date("2024/01/05"), "2024-01-05")
+        self.assertEqual(normalize_date("not a date"), "not a date")
+
+
+if __name__ == '__main__':
+    unittest.main()
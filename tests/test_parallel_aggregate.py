@@ -0,0 +1,76 @@
+import pandas as pd
+from parallel_aggregate import ParallelAggregator
+from sales_store import SalesStore
+from test_database import DatabaseTestCase, make_entry
+
+
+class TestParallelAggregator(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        countries = ["France", "Germany", "Italy", "Spain", None]
+        dates = ["2023-12-31", "2024-01-30", "2024-02-28", "2024-03-31", "2025-06-30"]
+        self.db.add_entries([make_entry(f"F{i % 9}", countries[i % 5], dates[(i * 7) % 5], float(i), float(i % 13),
+                                        float(i % 3)) for i in range(300)])
+        self.aggregators = []
+
+    def tearDown(self):
+        for aggregator in self.aggregators:
+            aggregator.close()
+        super().tearDown()
+
+    def aggregator(self, **kwargs):
+        aggregator = ParallelAggregator(self.db, **kwargs)
+        self.aggregators.append(aggregator)
+        return aggregator
+
+    def expected(self, by):
+        return SalesStore.from_database(self.db).sum_by(by, net_income=True).sort_values(by, ignore_index=True)
+
+    def test_country_partitions_cover_every_row_once(self):
+        partitions = self.aggregator(workers=3).partitions()
+        self.assertEqual(len(partitions), 3)
+        counts = [self.db.pool.reader().execute(f"SELECT COUNT(*) FROM sales_data WHERE {where}", params).fetchone()[0]
+                  for where, params in partitions]
+        self.assertEqual(sum(counts), 300)
+
+    def test_date_partitions_cover_every_row_once(self):
+        partitions = self.aggregator(workers=3, partition_by="date").partitions()
+        counts = [self.db.pool.reader().execute(f"SELECT COUNT(*) FROM sales_data WHERE {where}", params).fetchone()[0]
+                  for where, params in partitions]
+        self.assertEqual(sum(counts), 300)
+        self.assertTrue(all(counts))
+
+    def test_parallel_results_match_in_memory(self):
+        for partition_by in ("country", "date"):
+            aggregator = self.aggregator(workers=2, partition_by=partition_by)
+            for by in (["country", "month"], ["filiale_name"]):
+                actual = aggregator.aggregate(by, ("monthly_revenue", "monthly_costs"))
+                pd.testing.assert_frame_equal(actual, self.expected(by)[actual.columns.tolist()])
+
+    def test_filters_apply_to_every_partition(self):
+        filters = {"country": ["France", "Spain"], "date_from": "2024-01-01"}
+        expected = SalesStore.from_database(self.db, filters=filters).sum_by(["country"], net_income=True)
+        expected = expected.sort_values("country", ignore_index=True)
+        for workers in (1, 2):
+            actual = self.aggregator(workers=workers, partition_by="date").aggregate(["country"], filters=filters)
+            pd.testing.assert_frame_equal(actual, expected[actual.columns.tolist()])
+
+    def test_single_worker_runs_in_process(self):
+        aggregator = self.aggregator(workers=1)
+        pd.testing.assert_frame_equal(aggregator.aggregate(["country"]),
+                                      self.expected(["country"])[["country", "Net Income"]])
+        self.assertIsNone(aggregator._executor)
+
+    def test_sketch_merges_partitions(self):
+        sketch = self.aggregator(workers=2, partition_by="date").sketch()
+        self.assertEqual(sketch.row_count, 300)
+        distinct = sketch.distinct_filiales().set_index("country")["distinct_filiales"]
+        self.assertEqual(sorted(distinct.index), ["", "France", "Germany", "Italy", "Spain"])
+        self.assertAlmostEqual(distinct["France"], 9, delta=0.1)
+        partitions = [("country = ?", ["France"]), ("country IS NULL", [])]
+        sketches = self.aggregator(workers=2).sketch_partitions(partitions, {"min_monthly_revenue": 150})
+        self.assertEqual([sketch.row_count for sketch in sketches], [30, 30])
+
+    def test_unknown_partition_key(self):
+        with self.assertRaises(ValueError):
+            ParallelAggregator(self.db, partition_by="filiale_name")
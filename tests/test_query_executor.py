@@ -0,0 +1,81 @@
+import threading
+import time
+import unittest
+from PySide6.QtCore import QCoreApplication
+from PySide6.QtWidgets import QApplication
+from components.query_executor import QueryExecutor
+
+app = QApplication.instance() or QApplication([])
+
+
+def wait_until(condition, timeout=5.0):
+    # Traite les événements Qt jusqu'à ce que la condition soit vraie
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.005)
+    return condition()
+
+
+class TestQueryExecutor(unittest.TestCase):
+    def setUp(self):
+        self.executor = QueryExecutor(max_threads=2)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_result_delivered_on_gui_thread(self):
+        results = []
+        worker_threads = []
+
+        def query():
+            worker_threads.append(threading.current_thread())
+            return 42
+
+        self.executor.submit("view", query, on_result=lambda result: results.append((result, threading.current_thread())))
+        self.assertTrue(wait_until(lambda: results))
+        self.assertEqual(results[0][0], 42)
+        self.assertIs(results[0][1], threading.main_thread())
+        self.assertIsNot(worker_threads[0], threading.main_thread())
+
+    def test_stale_request_is_dropped(self):
+        results = []
+        release = threading.Event()
+
+        def slow_query():
+            release.wait(5)
+            return "stale"
+
+        self.executor.submit("view", slow_query, on_result=results.append)
+        self.executor.submit("view", lambda: "fresh", on_result=results.append)
+        release.set()
+        self.assertTrue(wait_until(lambda: results))
+        self.executor.thread_pool.waitForDone(5000)
+        QCoreApplication.processEvents()
+        self.assertEqual(results, ["fresh"])
+
+    def test_errors_and_loading_state(self):
+        states, errors = [], []
+        self.executor.loading_changed.connect(lambda key, loading: states.append(loading))
+
+        def failing_query():
+            raise ValueError("boom")
+
+        self.executor.submit("view", failing_query, on_error=errors.append)
+        self.assertTrue(wait_until(lambda: errors))
+        self.assertIsInstance(errors[0], ValueError)
+        self.assertEqual(states, [True, False])
+
+    def test_cancel(self):
+        results = []
+        release = threading.Event()
+        self.executor.submit("view", lambda: release.wait(5) and "done", on_result=results.append)
+        self.executor.cancel("view")
+        release.set()
+        self.executor.thread_pool.waitForDone(5000)
+        QCoreApplication.processEvents()
+        self.assertEqual(results, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
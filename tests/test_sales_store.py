@@ -0,0 +1,119 @@
+import unittest
+import numpy as np
+import pandas as pd
+from kpi_compute import NET_INCOME, net_income_by_country_date
+from sales_store import MISSING_DATE, SalesStore, stream_sum_by, top_groups
+from test_database import DatabaseTestCase, make_entry
+
+ROWS = [
+    (1, 'Paris', 'France', '2024-01-30', 1000.0, 400.0, 10, 5, 90, 100.0),
+    (2, 'Berlin', 'Germany', '2024-01-30', 2000.0, 900.0, 20, 2, 80, 0.0),
+    (3, 'Lyon', 'France', '2024-02-28', 800.0, 300.0, 5, 1, 70, 20.0),
+    (4, 'Paris', 'France', '2024-01-30', 500.0, None, 1, 1, 60, 50.0),
+    (5, None, 'France', 'not a date', 1.0, 1.0, 1, 1, 1, 1.0),
+]
+
+
+class TestSalesStore(unittest.TestCase):
+    def setUp(self):
+        self.store = SalesStore.from_rows(ROWS, batch_size=2)
+
+    def test_dimensions_are_encoded(self):
+        self.assertEqual(self.store.codes['country'].dtype, np.int32)
+        self.assertEqual(self.store.categories['country'].tolist(), ['France', 'Germany'])
+        self.assertEqual(self.store.codes['country'].tolist(), [0, 1, 0, 0, 0])
+        self.assertEqual(self.store.categories['filiale_name'].tolist(), ['Paris', 'Berlin', 'Lyon', ''])
+        self.assertTrue(np.isnan(self.store.measures['monthly_costs'][3]))
+
+    def test_dates_are_day_ordinals(self):
+        days = self.store.days
+        self.assertEqual(days.dtype, np.int32)
+        self.assertEqual(days[0], (np.datetime64('2024-01-30') - np.datetime64('1970-01-01')).astype(int))
+        self.assertEqual(days[2] - days[0], 29)
+        self.assertEqual(days[4], MISSING_DATE)
+
+    def test_sum_by_matches_pandas(self):
+        df = self.store.to_frame()
+        expected = net_income_by_country_date(df).astype({'country': object, 'date': object})
+        actual = self.store.sum_by(['country', 'date'], ['monthly_revenue'], net_income=True)
+        merged = expected.merge(actual, on=['country', 'date'])
+        self.assertEqual(len(merged), len(expected))
+        self.assertEqual(len(actual), 4)
+        np.testing.assert_allclose(merged[NET_INCOME + '_x'], merged[NET_INCOME + '_y'])
+        france = actual[(actual['country'] == 'France') & (actual['date'] == '2024-01-30')].iloc[0]
+        self.assertEqual(france['monthly_revenue'], 1500.0)
+        self.assertEqual(france[NET_INCOME], 950.0)  # Les coûts manquants comptent pour 0
+
+    def test_to_frame_uses_categories(self):
+        df = self.store.to_frame()
+        self.assertIsInstance(df['country'].dtype, pd.CategoricalDtype)
+        self.assertEqual(df['filiale_name'].tolist(), ['Paris', 'Berlin', 'Lyon', 'Paris', ''])
+        self.assertEqual(df['id'].tolist(), [1, 2, 3, 4, 5])
+
+    def test_from_frame_matches_from_rows(self):
+        columns = ['id', 'filiale_name', 'country', 'date', 'monthly_revenue', 'monthly_costs', 'sales_volume',
+                   'new_clients', 'satisfaction_rate', 'advertising_costs']
+        store = SalesStore.from_frame(pd.DataFrame(ROWS, columns=columns))
+        pd.testing.assert_frame_equal(store.sum_by(['filiale_name']), self.store.sum_by(['filiale_name']))
+
+    def test_empty_store(self):
+        store = SalesStore.from_rows([])
+        self.assertEqual(len(store), 0)
+        self.assertTrue(store.sum_by(['country']).empty)
+
+
+class TestSalesStoreFromDatabase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.db.add_entries([make_entry(), make_entry(country="Germany", revenue=2000.0),
+                             make_entry(date="2024-03-05", revenue=300.0), make_entry(date="2025-11-30")])
+
+    def test_from_database(self):
+        store = SalesStore.from_database(self.db, batch_size=1)
+        totals = store.sum_by(['country'], ['monthly_revenue']).set_index('country')['monthly_revenue']
+        self.assertEqual(totals.to_dict(), {'France': 2300.0, 'Germany': 2000.0})
+
+    def test_periods_match_database(self):
+        store = SalesStore.from_database(self.db)
+        for period in ('month', 'quarter', 'year'):
+            income = store.sum_by(['country', period], [], net_income=True).sort_values(['country', period])
+            self.assertEqual([tuple(row) for row in income.itertuples(index=False)],
+                             self.db.fetch_net_income_by_period(period), period)
+
+
+
+class TestStreamSumBy(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        countries, dates = ['France', 'Germany', None, 'Italy'], ['2024-01-30', '2024-02-28', '2025-03-31']
+        self.rows = [(i, f"F{i % 7}", countries[rng.integers(4)], dates[rng.integers(3)], float(rng.integers(1000)),
+                      None if i % 11 == 0 else float(rng.integers(500)), 1, 2, 3, float(rng.integers(50)))
+                     for i in range(1, 1001)]
+
+    def test_same_groups_as_in_memory(self):
+        for by in (['country'], ['country', 'date'], ['filiale_name', 'quarter'], []):
+            expected = SalesStore.from_rows(self.rows).sum_by(by, net_income=True)
+            for chunk_size in (7, 64, 5000):
+                # Valeurs entières : les sommes sont exactes quel que soit l'ordre des additions
+                pd.testing.assert_frame_equal(stream_sum_by(self.rows, by, net_income=True, chunk_size=chunk_size),
+                                              expected, check_exact=True)
+
+    def test_empty_input(self):
+        self.assertTrue(stream_sum_by([], ['country']).empty)
+
+    def test_top_groups_match_sorted_sums(self):
+        sums = SalesStore.from_rows(self.rows).sum_by(['filiale_name'], net_income=True)
+        for column, ascending in ((NET_INCOME, False), ('monthly_costs', True)):
+            expected = sums.sort_values([column, 'filiale_name'], ascending=[ascending, True]).head(3)
+            top = top_groups(sums, column, 3, ascending, ['filiale_name'])
+            self.assertEqual(top['filiale_name'].tolist(), expected['filiale_name'].tolist())
+            self.assertEqual(top[column].tolist(), expected[column].tolist())
+
+    def test_top_groups_break_ties_by_group(self):
+        # Même ordre que ORDER BY value, groupes : indépendant de l'ordre des groupes en entrée
+        sums = pd.DataFrame({"country": ["Spain", "France", "Italy", "Germany"], "value": [5.0, 5.0, 1.0, 5.0]})
+        self.assertEqual(top_groups(sums, "value", 2, by=["country"])["country"].tolist(), ["France", "Germany"])
+        self.assertEqual(top_groups(sums, "value", 2, True, ["country"])["country"].tolist(), ["Italy", "France"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication
+from components.sales_table_model import SalesTableModel
+from test_database import DatabaseTestCase, make_entry
+
+app = QApplication.instance() or QApplication([])
+
+HEADERS = ['ID', 'Filiale Name', 'Country', 'Date', 'Revenue €', 'Costs €', 'Volume', 'Clients',
+           'Satisfaction %', 'Ad Costs']
+
+
+class TestSalesTableModel(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.db.add_entries([make_entry(f"Filiale{i}") for i in range(25)])
+        self.model = SalesTableModel(self.db, HEADERS, page_size=10, max_cached_pages=2)
+
+    def fetch_all(self):
+        while self.model.canFetchMore():
+            self.model.fetchMore()
+
+    def test_rows_are_fetched_page_by_page(self):
+        self.assertEqual(self.model.rowCount(), 0)
+        self.model.fetchMore()
+        self.assertEqual(self.model.rowCount(), 10)
+        self.fetch_all()
+        self.assertEqual(self.model.rowCount(), 25)
+        self.assertFalse(self.model.canFetchMore())
+
+    def test_cache_is_bounded_and_evicted_rows_are_reloaded(self):
+        self.fetch_all()
+        texts = [self.model.data(self.model.index(row, 1)) for row in range(25)]
+        self.assertEqual(texts, [f"Filiale{i}" for i in range(25)])
+        self.assertLessEqual(len(self.model._pages), 2)
+
+    def test_edits_survive_eviction(self):
+        self.fetch_all()
+        self.assertTrue(self.model.setData(self.model.index(0, 2), "Spain", Qt.EditRole))
+        for row in range(25):  # Parcourt toutes les lignes pour évincer la première page du cache
+            self.model.data(self.model.index(row, 1))
+        self.assertEqual(self.model.data(self.model.index(0, 2)), "Spain")
+        self.assertEqual(self.model.original_text(0, 2), "France")
+
+    def test_edited_rows_tracks_only_changed_rows(self):
+        self.fetch_all()
+        self.model.setData(self.model.index(12, 1), "Lyon", Qt.EditRole)
+        self.model.setData(self.model.index(3, 2), "Spain", Qt.EditRole)
+        self.model.setData(self.model.index(20, 1), "Filiale20", Qt.EditRole)  # Valeur inchangée
+        self.assertEqual(self.model.edited_rows(), [3, 12])
+        self.model.refresh_row(3)
+        self.assertEqual(self.model.edited_rows(), [12])
+
+    def test_id_column_is_read_only(self):
+        self.model.fetchMore()
+        self.assertFalse(self.model.flags(self.model.index(0, 0)) & Qt.ItemIsEditable)
+        self.assertFalse(self.model.setData(self.model.index(0, 0), "99", Qt.EditRole))
+
+    def test_remove_row_keeps_following_rows_aligned(self):
+        self.fetch_all()
+        self.db.delete_entry(self.model.row_id(3))
+        self.model.remove_row(3)
+        self.assertEqual(self.model.rowCount(), 24)
+        self.assertEqual(self.model.data(self.model.index(3, 1)), "Filiale4")
+        self.assertEqual(self.model.data(self.model.index(23, 1)), "Filiale24")
+
+    def test_remove_ids_incrementally_and_by_reset(self):
+        self.fetch_all()
+        ids = [self.model.row_id(row) for row in range(25)]
+        removed = ids[2:5] + ids[11:12]
+        self.db.delete_entries(removed)
+        self.model.remove_ids(removed)
+        self.assertEqual([self.model.row_id(row) for row in range(self.model.rowCount())],
+                         [row_id for row_id in ids if row_id not in removed])
+        self.model.MAX_INCREMENTAL_RANGES = 1  # Force la réinitialisation de la vue
+        scattered = ids[0:25:3]
+        self.db.delete_entries(scattered)
+        self.model.remove_ids(scattered)
+        expected = [row_id for row_id in ids if row_id not in removed and row_id not in scattered]
+        self.assertEqual([self.model.row_id(row) for row in range(self.model.rowCount())], expected)
+        self.assertEqual(self.model.data(self.model.index(0, 1)), f"Filiale{expected[0] - 1}")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import numpy as np
+from sales_store import SalesStore
+from sketches import HyperLogLog, KLLSketch, KPISketch, sketch_rows
+
+
+class TestHyperLogLog(unittest.TestCase):
+    def test_estimate_within_error(self):
+        sketch = HyperLogLog()
+        sketch.add(f"filiale-{i}" for i in range(20000))
+        sketch.add(f"filiale-{i}" for i in range(5000))  # Les doublons ne comptent pas
+        self.assertLess(abs(sketch.estimate() - 20000) / 20000, 4 * sketch.relative_error)
+
+    def test_merge_equals_union(self):
+        left, right, union = HyperLogLog(), HyperLogLog(), HyperLogLog()
+        left.add(range(0, 600))
+        right.add(range(400, 1000))
+        union.add(range(1000))
+        left.merge(right)
+        self.assertEqual(left.estimate(), union.estimate())
+
+    def test_small_cardinalities_are_nearly_exact(self):
+        sketch = HyperLogLog()
+        sketch.add(["Paris", "Lyon", "Paris", "Marseille"])
+        self.assertAlmostEqual(sketch.estimate(), 3, delta=0.01)
+
+
+class TestKLLSketch(unittest.TestCase):
+    def test_quantiles_within_rank_error(self):
+        values = np.random.default_rng(1).permutation(100000).astype(float)
+        sketch = KLLSketch(seed=1)
+        for chunk in np.array_split(values, 7):
+            sketch.update(chunk)
+        self.assertLess(sum(len(level) for level in sketch.levels), 2000)
+        for q in (0.01, 0.25, 0.5, 0.9, 0.99):
+            self.assertLess(abs(sketch.quantile(q) / len(values) - q), sketch.rank_error)
+
+    def test_merge(self):
+        left, right = KLLSketch(seed=2), KLLSketch(seed=3)
+        left.update(np.arange(0, 50000, dtype=float))
+        right.update(np.arange(50000, 100000, dtype=float))
+        right.update([np.nan])
+        left.merge(right)
+        self.assertEqual(left.count, 100000)
+        self.assertLess(abs(left.quantile(0.5) / 100000 - 0.5), left.rank_error)
+
+    def test_empty(self):
+        self.assertTrue(np.isnan(KLLSketch().quantile(0.5)))
+
+
+class TestKPISketch(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.rows = [(i, f"F{i % 40}", f"C{i % 4}", "2024-01-31", float(rng.integers(10000)), 1.0, 1, 1,
+                      int(rng.integers(101)), 1.0) for i in range(1, 20001)]
+
+    def test_partitions_merge_into_whole(self):
+        whole = sketch_rows(self.rows, chunk_size=3000, seed=0)
+        merged = sketch_rows(self.rows[:7000], seed=1)
+        merged.merge(sketch_rows(self.rows[7000:], seed=2))
+        self.assertEqual(merged.row_count, whole.row_count)
+        distinct = merged.distinct_filiales()
+        self.assertEqual(distinct["country"].tolist(), ["C0", "C1", "C2", "C3"])
+        np.testing.assert_allclose(distinct["distinct_filiales"], 10, atol=0.1)  # 10 filiales par pays
+        self.assertTrue((distinct["error"] > 0).all())
+
+    def test_percentiles(self):
+        sketch = KPISketch(seed=0)
+        sketch.update(SalesStore.from_rows(self.rows))
+        revenue = np.sort([row[4] for row in self.rows])
+        percentiles = sketch.percentiles("monthly_revenue", (0.5, 0.9))
+        for q, value in zip(percentiles["quantile"], percentiles["value"]):
+            rank = np.searchsorted(revenue, value) / len(revenue)
+            self.assertLess(abs(rank - q), percentiles["rank_error"].iloc[0] + 1e-3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import sqlite3
+from test_database import DatabaseTestCase, make_entry
+
+
+class TestSnapshotCache(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = self.db.snapshots
+        self.loads = 0
+
+    def load_totals(self):
+        self.loads += 1
+        return self.db.fetch_totals()
+
+    def test_unchanged_data_is_loaded_once(self):
+        self.db.add_entry(**make_entry())
+        first = self.cache.get("totals", self.load_totals)
+        self.assertIs(self.cache.get("totals", self.load_totals), first)
+        self.assertEqual(self.loads, 1)
+
+    def test_add_update_and_delete_invalidate(self):
+        self.db.add_entry(**make_entry())
+        self.assertEqual(self.cache.get("totals", self.load_totals)['monthly_revenue'], 1000.0)
+
+        self.db.add_entry(**make_entry(revenue=500.0))
+        self.assertEqual(self.cache.get("totals", self.load_totals)['monthly_revenue'], 1500.0)
+
+        row_id = self.db.fetch_all()[0][0]
+        self.db.update_entry(row_id, **make_entry(revenue=200.0))
+        self.assertEqual(self.cache.get("totals", self.load_totals)['monthly_revenue'], 700.0)
+
+        self.db.delete_entry(row_id)
+        self.assertEqual(self.cache.get("totals", self.load_totals)['monthly_revenue'], 500.0)
+        self.assertEqual(self.loads, 4)
+
+    def test_commit_from_another_connection_invalidates(self):
+        self.db.add_entry(**make_entry())
+        self.cache.get("totals", self.load_totals)
+        other = sqlite3.connect(self.db.db_filename)
+        try:
+            with other:
+                other.execute("UPDATE sales_data SET monthly_revenue = 300")
+        finally:
+            other.close()
+        self.assertEqual(self.cache.get("totals", self.load_totals)['monthly_revenue'], 300.0)
+        self.assertEqual(self.loads, 2)
+
+    def test_keys_are_cached_separately(self):
+        self.cache.get("a", lambda: 1)
+        self.assertEqual(self.cache.get("b", lambda: 2), 2)
+        self.assertEqual(self.cache.get("a", lambda: 3), 1)
@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+import unittest
+from prewarm import prewarm
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+
+class TestStartup(unittest.TestCase):
+    def test_startup_path_does_not_import_heavy_modules(self):
+        # pandas, matplotlib et reportlab ne doivent être chargés qu'au premier indicateur, graphique ou PDF
+        code = "import sys, main\nprint(sorted({name.split('.')[0] for name in sys.modules}))\n"
+        result = subprocess.run([sys.executable, "-c", code], cwd=SRC, capture_output=True, text=True,
+                                env=dict(os.environ, QT_QPA_PLATFORM="offscreen"), timeout=60)
+        loaded = result.stdout.strip().splitlines()[-1]
+        for name in ("pandas", "numpy", "matplotlib", "reportlab"):
+            self.assertNotIn(f"'{name}'", loaded, result.stderr)
+
+    def test_prewarm_imports_in_background(self):
+        sys.modules.pop("this_module_does_not_exist", None)
+        with self.assertLogs(level="WARNING"):
+            prewarm(("this_module_does_not_exist", "sketches")).join(timeout=60)
+        self.assertIn("sketches", sys.modules)
+
+
+if __name__ == '__main__':
+    unittest.main()